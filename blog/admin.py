@@ -11,6 +11,8 @@ admin.site.register(Post, MarkdownxModelAdmin)
 class CategoryAdmin(admin.ModelAdmin):
     # 'name' 필드를 바탕으로 자동으로 'slug' 필드를 생성하도록 설정
     prepopulated_fields = {'slug': ('name', )}
+    # 목록에 게시물 수(카운터 컬럼)를 함께 표시
+    list_display = ('name', 'slug', 'post_count')
 
 # Category 모델을 관리자에 등록
 admin.site.register(Category, CategoryAdmin)
@@ -19,6 +21,9 @@ admin.site.register(Category, CategoryAdmin)
 class TagAdmin(admin.ModelAdmin):
     # 'name' 필드를 바탕으로 자동으로 'slug' 필드를 생성하도록 설정
     prepopulated_fields = {'slug': ('name', )}
+    # 목록에 게시물 수(카운터 컬럼)를 함께 표시하고 많이 쓰인 태그부터 정렬
+    list_display = ('name', 'slug', 'post_count')
+    ordering = ('-post_count', 'name')
 
 # Tag 모델을 관리자에 등록
 admin.site.register(Tag, TagAdmin)
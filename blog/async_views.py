@@ -0,0 +1,92 @@
+"""
+읽기 경로(목록, 상세, 태그, 카테고리)의 비동기 뷰
+
+- ASGI(uvicorn 워커)로 배포할 때 views.py의 동기 뷰 대신 사용 (blog/async_urls.py)
+- DB 조회는 비동기 ORM(aget, async for)으로 하고, 템플릿 렌더링은 스레드에서 실행 (arender)
+  템플릿의 context processor(사이드바)와 navbar의 request.user는 동기 ORM을 쓰기 때문
+- 조건부 GET(304), 페이지 캐시 태그, 커서 페이지 나누기, 아바타 조회는 동기 뷰와 같음
+- 느린 클라이언트를 기다리거나 DB 응답을 기다리는 동안 워커가 다른 요청을 처리할 수 있음
+"""
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render
+from do_it_django_prj.conditional import conditional_page
+from do_it_django_prj.page_cache import add_cache_tags
+from .avatars import prime_avatar_urls
+from .forms import CommentForm
+from .models import Category, Post, Tag
+from .pagination import alegacy_page_redirect, apaginate_by_cursor
+from .views import (
+    POSTS_PER_PAGE, category_page_validators, post_detail_validators, post_list_page_validators, tag_page_validators,
+)
+
+# 템플릿 렌더링을 스레드에서 실행하는 render
+arender = sync_to_async(render)
+
+
+async def render_post_list(request, post_list, **context):
+    """
+    게시물 목록(post_list)의 한 페이지를 post_list.html로 렌더링 (?page=N이면 커서 URL로 리디렉션)
+    """
+    response = await alegacy_page_redirect(request, post_list, POSTS_PER_PAGE)
+    if response is not None:
+        return response
+    page = await apaginate_by_cursor(request, post_list, POSTS_PER_PAGE)
+    add_cache_tags(request, 'blog.post-list', 'blog.sidebar')
+
+    return await arender(
+        request,
+        "blog/post_list.html",
+        {
+            "post_list": page.object_list,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            **context,
+        }
+    )
+
+
+# 게시물 목록 (views.PostList와 같은 페이지)
+@conditional_page(post_list_page_validators)
+async def post_list(request):
+    return await render_post_list(request, Post.objects.for_list())
+
+
+# 특정 태그의 게시물 목록 (views.tag_page와 같은 페이지)
+@conditional_page(tag_page_validators)
+async def tag_page(request, slug):
+    tag = await Tag.objects.aget(slug=slug)
+    return await render_post_list(request, tag.post_set.for_list(), tag=tag)
+
+
+# 특정 카테고리의 게시물 목록 (views.category_page와 같은 페이지)
+@conditional_page(category_page_validators)
+async def category_page(request, slug):
+    if slug == 'no_category':
+        category = '미분류'
+        post_list = Post.objects.for_list().filter(category=None)
+    else:
+        category = await Category.objects.aget(slug=slug)
+        post_list = Post.objects.for_list().filter(category=category)
+    return await render_post_list(request, post_list, category=category)
+
+
+# 게시물 상세 (views.PostDetail과 같은 페이지)
+@conditional_page(post_detail_validators)
+async def post_detail(request, pk):
+    post = await aget_object_or_404(Post.objects.for_detail(), pk=pk)
+
+    # 댓글 작성자들의 아바타 URL을 한 번에 조회
+    comment_authors = [comment.author for comment in post.comment_set.all()]
+    await sync_to_async(prime_avatar_urls)(comment_authors)
+    add_cache_tags(request, f'blog.post:{post.pk}', 'blog.sidebar')
+    add_cache_tags(request, *(f'blog.author:{author.pk}' for author in comment_authors))
+
+    return await arender(
+        request,
+        "blog/post_detail.html",
+        {
+            "object": post,
+            "post": post,
+            "comment_form": CommentForm,
+        }
+    )
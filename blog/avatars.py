@@ -0,0 +1,68 @@
+"""
+사용자 아바타 URL 조회
+
+- 한 페이지에 나오는 여러 작성자의 소셜 계정을 한 번의 쿼리로 불러옴 (prime_avatar_urls)
+- 구한 URL은 user 객체에 저장해 같은 요청 안에서는 다시 조회하지 않음
+- 소셜 계정 아바타 URL은 캐시에 저장해 요청 사이에도 재사용하고, SocialAccount가 바뀌면 캐시를 삭제 (blog/signals.py)
+"""
+from django.core.cache import cache
+from allauth.socialaccount.models import SocialAccount
+from do_it_django_prj.metrics import count_cache
+
+# 소셜 계정 아바타 URL 캐시 키와 유지 시간(초)
+AVATAR_CACHE_KEY = 'blog:avatar:{}'
+AVATAR_CACHE_TIMEOUT = 60 * 60 * 24
+
+# 소셜 계정이 없을 때 이메일로 만드는 기본 아바타 URL
+DEFAULT_AVATAR_URL = 'https://doitdjango.com/avatar/id/2569/88f1d2892a7cfe94/svg/{}'
+
+
+def prime_avatar_urls(users):
+    """
+    여러 사용자의 아바타 URL을 한 번에 구해서 각 user 객체의 _avatar_url에 저장
+    캐시에 없는 사용자의 소셜 계정만 한 번의 쿼리로 조회
+    """
+    users = [user for user in users if user is not None and not hasattr(user, '_avatar_url')]
+    if not users:
+        return
+
+    keys = {user.pk: AVATAR_CACHE_KEY.format(user.pk) for user in users}
+    cached = cache.get_many(keys.values())
+    social_urls = {user_id: cached[key] for user_id, key in keys.items() if key in cached}
+
+    missing = set(keys) - set(social_urls)
+    count_cache('avatar', hits=len(social_urls), misses=len(missing))
+    if missing:
+        # 사용자마다 가장 먼저 연결된(pk가 가장 작은) 소셜 계정을 사용 (socialaccount_set.first()와 같음)
+        # provider 객체를 만들 때마다 SocialApp을 조회하므로 provider(google 등)마다 한 번만 만들고,
+        # 같은 provider의 계정은 그 객체의 wrap_account로 감싸 아바타 URL을 구함 (account.get_avatar_url()과 같음)
+        providers = {}
+        for account in SocialAccount.objects.filter(user_id__in=missing).order_by('pk'):
+            if account.user_id not in social_urls:
+                if account.provider not in providers:
+                    providers[account.provider] = account.get_provider()
+                provider_account = providers[account.provider].wrap_account(account)
+                social_urls[account.user_id] = provider_account.get_avatar_url() or ''
+
+        # 소셜 계정이 없는 사용자도 ''로 캐시해서 다시 조회하지 않음
+        for user_id in missing:
+            social_urls.setdefault(user_id, '')
+        cache.set_many({keys[user_id]: social_urls[user_id] for user_id in missing}, AVATAR_CACHE_TIMEOUT)
+
+    for user in users:
+        user._avatar_url = social_urls[user.pk] or DEFAULT_AVATAR_URL.format(user.email)
+
+
+def avatar_url_for(user):
+    """
+    사용자 한 명의 아바타 URL을 반환 (이미 구한 값이 있으면 그대로 사용)
+    """
+    prime_avatar_urls([user])
+    return user._avatar_url
+
+
+def invalidate_avatar_url(user_id):
+    """
+    사용자의 아바타 URL 캐시를 삭제 (SocialAccount 변경 시 시그널에서 호출)
+    """
+    cache.delete(AVATAR_CACHE_KEY.format(user_id))
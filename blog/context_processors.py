@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from do_it_django_prj.metrics import count_cache
+from .counters import uncategorized_post_count
+from .models import Category
+
+# 사이드바 카테고리 위젯 데이터를 저장하는 캐시 키와 유지 시간(초)
+CATEGORY_SIDEBAR_CACHE_KEY = 'blog:category_sidebar'
+CATEGORY_SIDEBAR_CACHE_TIMEOUT = 60 * 60
+
+
+def get_category_sidebar():
+    """
+    사이드바에 표시할 카테고리 목록(게시물 수 포함)과 미분류 게시물 수를 반환
+    캐시에 없을 때만 DB를 조회하며, 게시물 수는 집계하지 않고 카운터 컬럼 값을 사용 (blog/counters.py)
+    """
+    sidebar = cache.get(CATEGORY_SIDEBAR_CACHE_KEY)
+    count_cache('category_sidebar', hits=sidebar is not None, misses=sidebar is None)
+
+    if sidebar is None:
+        sidebar = {
+            'categories': list(Category.objects.order_by('pk')),
+            'no_category_post_count': uncategorized_post_count(),
+        }
+        cache.set(CATEGORY_SIDEBAR_CACHE_KEY, sidebar, CATEGORY_SIDEBAR_CACHE_TIMEOUT)
+
+    return sidebar
+
+
+def invalidate_category_sidebar():
+    """
+    사이드바 카테고리 캐시를 삭제 (Post, Category 변경 시 시그널에서 호출)
+    """
+    cache.delete(CATEGORY_SIDEBAR_CACHE_KEY)
+
+
+# 모든 템플릿에 사이드바용 categories, no_category_post_count를 전달하는 context processor
+# 실제로 템플릿에서 사용할 때만 캐시를 조회하도록 지연 평가(lazy)로 전달
+def categories(request):
+    sidebar = SimpleLazyObject(get_category_sidebar)
+
+    return {
+        'categories': SimpleLazyObject(lambda: sidebar['categories']),
+        'no_category_post_count': SimpleLazyObject(lambda: sidebar['no_category_post_count']),
+    }
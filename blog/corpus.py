@@ -0,0 +1,421 @@
+"""
+게시물 코퍼스 JSONL 내보내기/가져오기 (export_corpus, import_corpus 명령)
+
+- 한 줄에 레코드 하나: {"model": "blog.post", "pk": 1, "fields": {...}}
+- 참조되는 레코드가 먼저 나오도록 EXPORT_MODELS 순서로 씀 (카테고리/태그/언론사 -> 게시물/뉴스 -> 댓글)
+- 작성자는 username, 카테고리/태그/언론사는 slug로 참조하므로 대상 DB의 pk가 달라도 됨
+  (없는 사용자는 비밀번호 없이 새로 만듦), 게시물/뉴스/댓글은 URL이 유지되도록 pk를 그대로 사용
+- 가져오기는 모델별로 batch_size개씩 bulk_create로 넣고 태그 연결(through 테이블)도 한 번에 넣음
+  이미 있는 pk/slug는 건너뛰므로(ignore_conflicts) 중단된 가져오기를 다시 실행해도 중복되지 않음
+- bulk_create는 save()와 시그널을 거치지 않으므로 Markdown 렌더링, 검색 색인, 파생 이미지, 페이지 캐시 무효화,
+  카운터(댓글 수, 태그/카테고리별 게시물 수) 재계산, 관련 게시물 계산, DB 시퀀스 재설정을 CorpusImporter가 직접 처리
+"""
+import gzip
+import io
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from do_it_django_prj.page_cache import invalidate_cache_tags
+from news.models import NewsPost, Press
+from .context_processors import invalidate_category_sidebar
+from .counters import reconcile_counters
+from .models import Category, Comment, MARKDOWN_RENDER_VERSION, Post, Tag
+from .tasks import schedule_head_image_variants, schedule_index_posts, schedule_rebuild_related_posts
+
+# 내보내는 모델과 순서
+EXPORT_MODELS = ('blog.category', 'blog.tag', 'news.press', 'blog.post', 'news.newspost', 'blog.comment')
+
+
+def open_corpus(path, mode):
+    """
+    JSONL 파일을 텍스트 모드로 열어 (텍스트 파일, 원본 바이너리 파일)을 반환
+    경로가 .gz로 끝나면 gzip으로 압축/해제, '-'이면 표준 입출력 사용
+    원본 바이너리 파일의 tell()은 진행률 계산에 사용
+    """
+    if path == '-':
+        stream = sys.stdin if mode == 'r' else sys.stdout
+        return stream, None
+
+    raw = open(path, mode + 'b')
+    binary = gzip.GzipFile(fileobj=raw, mode=mode + 'b') if path.endswith('.gz') else raw
+    return io.TextIOWrapper(binary, encoding='utf-8', newline='\n'), raw
+
+
+def dump_record(record):
+    # datetime은 마이크로초까지 그대로 보존 (DjangoJSONEncoder는 밀리초로 자름)
+    return json.dumps(record, ensure_ascii=False, default=lambda value: value.isoformat()) + '\n'
+
+
+def _slug_fields(obj):
+    return {'name': obj.name, 'slug': obj.slug}
+
+
+def _press_fields(press):
+    # ETag/Last-Modified는 원본 DB에서 받은 상태이므로 내보내지 않음 (가져온 DB에서는 처음부터 다시 받음)
+    return {**_slug_fields(press), 'feed_url': press.feed_url}
+
+
+def _username(user):
+    return user.username if user is not None else None
+
+
+def _slug(obj):
+    return obj.slug if obj is not None else None
+
+
+def _post_fields(post):
+    return {
+        'title': post.title,
+        'hook_text': post.hook_text,
+        'content': post.content,
+        'content_html': post.content_html,
+        'content_html_version': post.content_html_version,
+        'excerpt': post.excerpt,
+        'head_image': post.head_image.name,
+        'head_image_variants': post.head_image_variants,
+        'file_upload': post.file_upload.name,
+        'download_count': post.download_count,
+        'created_at': post.created_at,
+        'updated_at': post.updated_at,
+        'author': _username(post.author),
+        'category': _slug(post.category),
+        'tags': [tag.slug for tag in post.tags.all()],
+    }
+
+
+def _news_post_fields(post):
+    return {
+        'title': post.title,
+        'hook_text': post.hook_text,
+        'content': post.content,
+        'head_image': post.head_image.name,
+        'head_image_variants': post.head_image_variants,
+        'file_upload': post.file_upload.name,
+        'download_count': post.download_count,
+        'created_at': post.created_at,
+        'updated_at': post.updated_at,
+        'author': _username(post.author),
+        'category': _slug(post.category),
+        'source_url': post.source_url,
+        'content_hash': post.content_hash,
+    }
+
+
+def _comment_fields(comment):
+    return {
+        'post': comment.post_id,
+        'author': _username(comment.author),
+        'content': comment.content,
+        'created_at': comment.created_at,
+        'modified_at': comment.modified_at,
+    }
+
+
+# 모델별 (내보낼 QuerySet, 레코드 fields를 만드는 함수)
+EXPORTERS = {
+    'blog.category': (lambda: Category.objects.all(), _slug_fields),
+    'blog.tag': (lambda: Tag.objects.all(), _slug_fields),
+    'news.press': (lambda: Press.objects.all(), _press_fields),
+    'blog.post': (lambda: Post.objects.select_related('author', 'category').prefetch_related('tags'), _post_fields),
+    'news.newspost': (lambda: NewsPost.objects.select_related('author', 'category'), _news_post_fields),
+    'blog.comment': (lambda: Comment.objects.select_related('author'), _comment_fields),
+}
+
+
+def export_records(labels, chunk_size):
+    """
+    모델별로 pk 순서대로 레코드(dict)를 하나씩 만들어 반환하는 제너레이터 (chunk_size개씩 DB에서 읽음)
+    """
+    for label in EXPORT_MODELS:
+        if label not in labels:
+            continue
+        get_queryset, get_fields = EXPORTERS[label]
+        for obj in get_queryset().order_by('pk').iterator(chunk_size=chunk_size):
+            yield {'model': label, 'pk': obj.pk, 'fields': get_fields(obj)}
+
+
+@contextmanager
+def keep_timestamps(model):
+    """
+    bulk_create가 auto_now/auto_now_add 필드를 현재 시각으로 덮어쓰지 않도록 잠시 끔
+    """
+    fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _datetime(value):
+    # 레코드에 시각이 없으면 가져온 시각을 사용
+    return parse_datetime(value) if value else timezone.now()
+
+
+# JSONL 레코드를 batch_size개씩 모아 DB에 넣는 클래스
+# add()로 레코드를 넣고 마지막에 finish()를 호출
+class CorpusImporter:
+    def __init__(self, batch_size=1000, media_map=None, index=True):
+        self.batch_size = batch_size
+        self.media_map = media_map or []
+        self.index = index
+        self.label = None
+        self.batch = []
+        self.batch_line = self.committed_line = 0
+        # 모델별 넣은 레코드 수, 건너뛴 레코드 수 (pk가 이미 있는 게시물, 게시물이나 작성자가 없는 댓글)
+        self.counts = dict.fromkeys(EXPORT_MODELS, 0)
+        self.skipped = dict.fromkeys(EXPORT_MODELS, 0)
+        # slug/username -> 대상 DB pk (필요할 때 DB에서 조회해서 채움)
+        self.pk_maps = {Category: {}, Tag: {}, Press: {}, User: {}}
+
+    def add(self, record, line=0):
+        """
+        레코드를 추가 (같은 모델의 레코드가 batch_size개 모이거나 모델이 바뀌면 DB에 반영)
+        line은 입력 파일의 줄 번호로, DB에 반영된 마지막 줄이 committed_line에 기록됨 (재개 위치)
+        """
+        label = record['model']
+        if label not in EXPORTERS:
+            raise ValueError(f'알 수 없는 모델입니다: {label}')
+
+        if label != self.label:
+            self.flush()
+            self.label = label
+        self.batch.append(record)
+        self.batch_line = line
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        skipped = self.skipped[self.label]
+        with transaction.atomic():
+            getattr(self, 'import_' + self.label.split('.')[1])(self.batch)
+        self.counts[self.label] += len(self.batch) - (self.skipped[self.label] - skipped)
+        self.committed_line = self.batch_line
+        self.batch = []
+
+    def finish(self):
+        """
+        남은 레코드를 넣고, 시그널 대신 카운터 재계산, 페이지/사이드바 캐시 무효화와 DB 시퀀스 재설정을 처리
+        index이면 관련 게시물 전체 재계산 작업도 추가 (게시물마다 갱신하지 않고 한 번에 계산)
+        """
+        self.flush()
+        self.reset_sequences()
+        reconcile_counters()
+        if self.index:
+            schedule_rebuild_related_posts()
+        invalidate_category_sidebar()
+        invalidate_cache_tags('blog.post-list', 'blog.sidebar', 'news.post-list', 'news.sidebar')
+
+    def map_media(self, name):
+        # 미디어 경로의 앞부분을 바꿈 (예: --media-map uploads/=blog/files/)
+        for old, new in self.media_map:
+            if name.startswith(old):
+                return new + name[len(old):]
+        return name
+
+    def map_variants(self, variants):
+        if not variants:
+            return {}
+        return {
+            'source': self.map_media(variants.get('source', '')),
+            'items': [{**item, 'name': self.map_media(item['name'])} for item in variants.get('items', [])],
+        }
+
+    def resolve(self, model, keys):
+        """
+        slug(사용자는 username)들을 대상 DB의 pk로 바꾸는 dict를 반환
+        """
+        pk_map = self.pk_maps[model]
+        missing = {key for key in keys if key and key not in pk_map}
+        if missing:
+            if model is User:
+                rows = User.objects.filter(username__in=missing).values_list('username', 'pk')
+            else:
+                rows = model.objects.filter(slug__in=missing).values_list('slug', 'pk')
+            pk_map.update(rows)
+        return pk_map
+
+    def resolve_users(self, usernames):
+        # 없는 사용자는 로그인할 수 없는 계정으로 만듦 (소셜 로그인이나 비밀번호 재설정으로 연결 가능)
+        users = self.resolve(User, usernames)
+        missing = {username for username in usernames if username and username not in users}
+        if missing:
+            User.objects.bulk_create(
+                [User(username=username, password=make_password(None)) for username in sorted(missing)],
+                ignore_conflicts=True,
+            )
+            users = self.resolve(User, missing)
+        return users
+
+    def import_taxonomy(self, model, batch, fields=()):
+        # 이름이나 slug가 이미 있으면 기존 것을 사용 (slug로 참조하므로 pk는 새로 정함)
+        # fields: 이름/slug 외에 함께 가져올 필드 (레코드에 없으면 모델의 기본값)
+        names = [record['fields']['name'] for record in batch]
+        slugs = [record['fields']['slug'] for record in batch]
+        existing = set()
+        for name, slug in model.objects.filter(Q(name__in=names) | Q(slug__in=slugs)).values_list('name', 'slug'):
+            existing.update([('name', name), ('slug', slug)])
+
+        model.objects.bulk_create([
+            model(
+                name=record['fields']['name'],
+                slug=record['fields']['slug'],
+                **{field: record['fields'][field] for field in fields if field in record['fields']},
+            )
+            for record in batch
+            if ('name', record['fields']['name']) not in existing and ('slug', record['fields']['slug']) not in existing
+        ], ignore_conflicts=True)
+
+    def import_category(self, batch):
+        self.import_taxonomy(Category, batch)
+
+    def import_tag(self, batch):
+        self.import_taxonomy(Tag, batch)
+
+    def import_press(self, batch):
+        self.import_taxonomy(Press, batch, fields=('feed_url',))
+
+    def build_post(self, model, record, users, categories):
+        fields = record['fields']
+        return model(
+            pk=record['pk'],
+            title=fields['title'],
+            hook_text=fields.get('hook_text', ''),
+            content=fields['content'],
+            head_image=self.map_media(fields.get('head_image', '')),
+            head_image_variants=self.map_variants(fields.get('head_image_variants')),
+            file_upload=self.map_media(fields.get('file_upload', '')),
+            download_count=fields.get('download_count', 0),
+            created_at=_datetime(fields.get('created_at')),
+            updated_at=_datetime(fields.get('updated_at')),
+            author_id=users.get(fields.get('author')),
+            category_id=categories.get(fields.get('category')),
+        )
+
+    def new_records(self, model, batch):
+        """
+        pk가 대상 DB에 아직 없는 레코드만 반환하고 나머지는 건너뛴 수에 더함
+        (pk가 같은 기존 게시물은 다른 글일 수 있으므로 태그 연결, 색인, 캐시 무효화도 하지 않음)
+        """
+        existing = set(model.objects.filter(pk__in=[record['pk'] for record in batch]).values_list('pk', flat=True))
+        self.skipped[model._meta.label_lower] += len(existing)
+        return [record for record in batch if record['pk'] not in existing]
+
+    def import_post(self, batch):
+        batch = self.new_records(Post, batch)
+        if not batch:
+            return
+        users = self.resolve_users({record['fields'].get('author') for record in batch})
+        categories = self.resolve(Category, {record['fields'].get('category') for record in batch})
+        tags = self.resolve(Tag, {slug for record in batch for slug in record['fields'].get('tags', [])})
+
+        posts = []
+        for record in batch:
+            post = self.build_post(Post, record, users, categories)
+            fields = record['fields']
+            # 같은 렌더러 버전으로 만든 HTML이면 그대로 쓰고, 아니면 다시 렌더링
+            if fields.get('content_html_version') == MARKDOWN_RENDER_VERSION:
+                post.content_html = fields['content_html']
+                post.content_html_version = MARKDOWN_RENDER_VERSION
+                post.excerpt = fields.get('excerpt', '')
+            else:
+                post.render_content()
+            posts.append(post)
+
+        with keep_timestamps(Post):
+            Post.objects.bulk_create(posts, ignore_conflicts=True)
+
+        PostTag = Post.tags.through
+        PostTag.objects.bulk_create([
+            PostTag(post_id=record['pk'], tag_id=tags[slug])
+            for record in batch
+            for slug in record['fields'].get('tags', [])
+            if slug in tags
+        ], ignore_conflicts=True)
+
+        self.after_posts(posts, 'blog.post:{}')
+        if self.index:
+            transaction.on_commit(lambda: schedule_index_posts([post.pk for post in posts]))
+
+    def import_newspost(self, batch):
+        batch = self.new_records(NewsPost, batch)
+        if not batch:
+            return
+        users = self.resolve_users({record['fields'].get('author') for record in batch})
+        presses = self.resolve(Press, {record['fields'].get('category') for record in batch})
+        posts = []
+        for record in batch:
+            post = self.build_post(NewsPost, record, users, presses)
+            # 피드에서 가져온 기사의 중복 확인 값 (없으면 ingest_feeds가 같은 기사를 다시 넣음)
+            post.source_url = record['fields'].get('source_url', '')
+            post.content_hash = record['fields'].get('content_hash', '')
+            posts.append(post)
+
+        with keep_timestamps(NewsPost):
+            NewsPost.objects.bulk_create(posts, ignore_conflicts=True)
+        self.after_posts(posts, 'news.post:{}')
+
+    def after_posts(self, posts, detail_tag):
+        # save() 시그널 대신: 상세 페이지 캐시 무효화, 파생 이미지가 없는 head_image는 작업으로 생성
+        invalidate_cache_tags(*(detail_tag.format(post.pk) for post in posts))
+        stale = [post for post in posts if post.head_image_variants_stale()]
+        transaction.on_commit(lambda: [schedule_head_image_variants(post) for post in stale])
+
+    def import_comment(self, batch):
+        users = self.resolve_users({record['fields'].get('author') for record in batch})
+        post_ids = set(Post.objects.filter(pk__in={record['fields']['post'] for record in batch}).values_list('pk', flat=True))
+
+        comments = []
+        for record in batch:
+            fields = record['fields']
+            # 게시물이나 작성자가 없는 댓글은 넣을 수 없음
+            if fields['post'] not in post_ids or fields.get('author') not in users:
+                self.skipped['blog.comment'] += 1
+                continue
+            comments.append(Comment(
+                pk=record['pk'],
+                post_id=fields['post'],
+                author_id=users[fields['author']],
+                content=fields['content'],
+                created_at=_datetime(fields.get('created_at')),
+                modified_at=_datetime(fields.get('modified_at')),
+            ))
+
+        with keep_timestamps(Comment):
+            Comment.objects.bulk_create(comments, ignore_conflicts=True)
+        invalidate_cache_tags(*{f'blog.post:{comment.post_id}' for comment in comments})
+
+    def reset_sequences(self):
+        # pk를 직접 넣었으므로 PostgreSQL 등의 시퀀스를 가장 큰 pk 다음으로 맞춤 (SQLite는 필요 없음)
+        statements = connection.ops.sequence_reset_sql(no_style(), [Category, Tag, Press, Post, NewsPost, Comment, User])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+def progress_line(line, processed, raw, total, counts, started_at):
+    """
+    진행 상황 한 줄 (예: 12,000줄 (35%) · 게시물 10,000 · 뉴스 0 · 댓글 2,000 · 4,200줄/초)
+    processed는 이번 실행에서 읽은 줄 수 (재개한 경우 건너뛴 줄 제외)
+    """
+    elapsed = max((datetime.now() - started_at).total_seconds(), 0.001)
+    percent = f' ({raw.tell() * 100 // total}%)' if raw is not None and total else ''
+    return (
+        f'{line:,}줄{percent} · 게시물 {counts["blog.post"]:,} · 뉴스 {counts["news.newspost"]:,} · '
+        f'댓글 {counts["blog.comment"]:,} · {processed / elapsed:,.0f}줄/초'
+    )
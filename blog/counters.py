@@ -0,0 +1,94 @@
+"""
+비정규화 카운터 (댓글 수, 태그별/카테고리별 게시물 수, 미분류 게시물 수)
+
+- 목록/사이드바/상세 페이지에서 매번 COUNT 쿼리를 실행하지 않도록 카운터 컬럼에 저장해 둠
+  Post.comment_count, Tag.post_count, Category.post_count, 미분류 게시물 수는 Counter 행(UNCATEGORIZED_POSTS)
+- 값은 시그널에서 F() 식으로 DB 안에서 증감하므로 동시에 바뀌어도 잃어버리는 변경이 없음 (blog/signals.py)
+- bulk_create/queryset.update처럼 시그널을 거치지 않는 변경이나 장애로 어긋난 값은
+  reconcile_counters()(reconcile_counters 명령)가 실제 개수로 다시 계산
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from .models import Category, Comment, Counter, Post, Tag
+
+# 미분류 게시물 수를 저장하는 Counter 행 이름
+UNCATEGORIZED_POSTS = 'blog.uncategorized_posts'
+# 어긋난 행을 고칠 때 한 번의 UPDATE에 넣을 pk 수
+RECONCILE_BATCH_SIZE = 500
+
+
+def adjust_count(queryset, field, delta):
+    """
+    queryset에 해당하는 행들의 카운터 필드에 delta를 더함 (DB에서 계산, 0 아래로는 내려가지 않음)
+    """
+    if delta:
+        queryset.update(**{field: Greatest(F(field) + delta, 0)})
+
+
+def adjust_counter(name, delta):
+    """
+    Counter 행의 값에 delta를 더함 (행이 없으면 만듦)
+    """
+    if delta and not Counter.objects.filter(name=name).update(value=F('value') + delta):
+        Counter.objects.get_or_create(name=name, defaults={'value': max(delta, 0)})
+
+
+def adjust_category_count(category_id, delta):
+    """
+    카테고리의 게시물 수에 delta를 더함 (category_id가 None이면 미분류 게시물 수)
+    """
+    if category_id is None:
+        adjust_counter(UNCATEGORIZED_POSTS, delta)
+    else:
+        adjust_count(Category.objects.filter(pk=category_id), 'post_count', delta)
+
+
+def uncategorized_post_count():
+    """
+    미분류 게시물 수를 반환
+    """
+    return Counter.objects.filter(name=UNCATEGORIZED_POSTS).values_list('value', flat=True).first() or 0
+
+
+def _count(queryset, field):
+    # 바깥 행의 pk를 field로 참조하는 행 수 (상관 서브쿼리, 없으면 0)
+    rows = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(count=Count('*')).values('count')
+    return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+
+# 다시 계산할 카운터: (이름, 모델, 카운터 필드, 실제 개수를 구하는 식을 만드는 함수)
+ROW_COUNTERS = [
+    ('Post.comment_count', Post, 'comment_count', lambda: _count(Comment.objects.all(), 'post')),
+    ('Tag.post_count', Tag, 'post_count', lambda: _count(Post.tags.through.objects.all(), 'tag')),
+    ('Category.post_count', Category, 'post_count', lambda: _count(Post.objects.all(), 'category')),
+]
+
+
+def reconcile_counters(fix=True):
+    """
+    모든 카운터를 실제 개수와 비교해서 {카운터 이름: [(pk, 저장된 값, 실제 값), ...]} 형태로 어긋난 행을 반환
+    카운터마다 한 번의 집계 쿼리로 비교하고, fix=True이면 어긋난 행만 UPDATE로 고침
+    (고칠 때도 실제 개수를 서브쿼리로 다시 계산하므로 비교한 뒤에 바뀐 값을 덮어쓰지 않음)
+    미분류 게시물 수는 pk 대신 Counter 이름을 사용하고, 비교할 때 센 값으로 저장
+    """
+    drift = {}
+    for name, model, field, actual in ROW_COUNTERS:
+        rows = list(
+            model.objects.annotate(actual=actual())
+            .exclude(**{field: F('actual')})
+            .order_by('pk')
+            .values_list('pk', field, 'actual')
+        )
+        drift[name] = rows
+        if fix:
+            pks = [pk for pk, _, _ in rows]
+            for start in range(0, len(pks), RECONCILE_BATCH_SIZE):
+                model.objects.filter(pk__in=pks[start:start + RECONCILE_BATCH_SIZE]).update(**{field: actual()})
+
+    stored = uncategorized_post_count()
+    actual = Post.objects.filter(category=None).count()
+    drift[UNCATEGORIZED_POSTS] = [] if stored == actual else [(UNCATEGORIZED_POSTS, stored, actual)]
+    if fix and stored != actual:
+        Counter.objects.update_or_create(name=UNCATEGORIZED_POSTS, defaults={'value': actual})
+
+    return drift
@@ -0,0 +1,172 @@
+"""
+첨부 파일(file_upload) 다운로드
+
+- 다운로드는 /blog/<pk>/download, /news/<pk>/download 뷰를 거쳐서 게시물을 확인하고 다운로드 수를 센 뒤 파일을 보냄
+- 운영 환경(DOWNLOAD_ACCEL_REDIRECT = True)에서는 X-Accel-Redirect 헤더만 보내고 파일 전송은 nginx가 처리
+  (nginx의 internal location인 DOWNLOAD_ACCEL_PREFIX에서 Range, ETag/Last-Modified, sendfile을 처리하므로 워커가 파일을 읽지 않음)
+- 개발 환경에서는 Django가 FileResponse로 직접 보내고 Range 요청(이어받기)은 206 Partial Content로 응답
+- 이어받기 같은 부분 요청(0바이트부터가 아닌 Range)과 304 응답은 다운로드 수에 포함하지 않음
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models import F
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+# 첨부 파일 응답의 브라우저 캐시 시간(초), private이므로 nginx 등 공유 캐시에는 저장되지 않음
+DOWNLOAD_MAX_AGE = 60 * 60
+
+# 개발용 응답에서 한 번에 읽을 크기
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Range 헤더 값을 (시작, 끝) 바이트 위치로 바꿔 반환 (끝 포함)
+    - Range가 없거나 지원하지 않는 형식(여러 구간 등)이면 None (전체 파일로 응답)
+    - 만족할 수 없는 범위(파일 크기를 넘는 시작 위치 등)이면 False (416으로 응답)
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-500: 마지막 500바이트
+        length = int(end)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def is_new_download(request, response):
+    """
+    다운로드 수에 포함할 응답인지 여부 (파일 전체 또는 0바이트부터 보내는 응답)
+    """
+    if response.status_code == 206:
+        return response['Content-Range'].startswith('bytes 0-')
+    if response.status_code != 200:
+        return False
+    if response.has_header('X-Accel-Redirect'):
+        # 실제 응답은 nginx가 만들므로 요청의 Range로 판단
+        byte_range = request.headers.get('Range', '').replace(' ', '')
+        return not byte_range or byte_range.startswith('bytes=0-')
+    return True
+
+
+# Range 요청에서 지정된 구간만 읽도록 파일을 감싸는 클래스
+# seek/tell이 없으므로 FileResponse가 Content-Length를 파일 전체 크기로 바꾸지 않음
+class RangedFile:
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        self.file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def get_file_validators(field_file):
+    """
+    개발용 응답의 (ETag, Last-Modified 타임스탬프, 크기)
+    nginx처럼 수정 시각과 크기로 강한(strong) ETag를 만듦 (Range 요청의 If-Range 비교에 사용)
+    """
+    storage = field_file.storage
+    size = storage.size(field_file.name)
+    modified = int(storage.get_modified_time(field_file.name).timestamp())
+    return f'"{modified:x}-{size:x}"', modified, size
+
+
+def accel_redirect_response(field_file, content_type, filename):
+    """
+    nginx가 파일을 보내도록 X-Accel-Redirect 헤더만 담은 응답
+    """
+    response = HttpResponse(content_type=content_type)
+    response['X-Accel-Redirect'] = settings.DOWNLOAD_ACCEL_PREFIX + quote(field_file.name)
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+def file_response(request, field_file, content_type, filename):
+    """
+    Django가 직접 파일을 보내는 응답 (개발용), 조건부 GET(304)과 Range(206/416)를 처리
+    """
+    etag, modified, size = get_file_validators(field_file)
+
+    response = get_conditional_response(request, etag=etag, last_modified=modified)
+    if response is None:
+        byte_range = parse_range(request.headers.get('Range'), size)
+        # If-Range가 현재 파일과 다르면 (파일이 바뀜) 전체 파일로 응답
+        if_range = request.headers.get('If-Range')
+        if byte_range and if_range and if_range != etag and parse_http_date_safe(if_range) != modified:
+            byte_range = None
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        else:
+            file = field_file.storage.open(field_file.name, 'rb')
+            if byte_range is None:
+                response = FileResponse(file, content_type=content_type)
+            else:
+                start, end = byte_range
+                response = FileResponse(RangedFile(file, start, end - start + 1), content_type=content_type, status=206)
+                response['Content-Length'] = end - start + 1
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response.block_size = DOWNLOAD_CHUNK_SIZE
+            response['Content-Disposition'] = content_disposition_header(True, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(modified)
+    return response
+
+
+def serve_download(request, post):
+    """
+    게시물(Post, NewsPost)의 첨부 파일 다운로드 응답을 반환하고 다운로드 수를 1 늘림
+    """
+    field_file = post.file_upload
+    if not field_file:
+        raise Http404('첨부 파일이 없습니다.')
+    if not settings.DOWNLOAD_ACCEL_REDIRECT and not field_file.storage.exists(field_file.name):
+        raise Http404('첨부 파일을 찾을 수 없습니다.')
+
+    filename = os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if settings.DOWNLOAD_ACCEL_REDIRECT:
+        response = accel_redirect_response(field_file, content_type, filename)
+    else:
+        response = file_response(request, field_file, content_type, filename)
+
+    if is_new_download(request, response):
+        # 저장 시그널(페이지 캐시 무효화)과 updated_at 갱신 없이 DB에서 바로 1 증가
+        type(post).objects.filter(pk=post.pk).update(download_count=F('download_count') + 1)
+
+    patch_cache_control(response, private=True, max_age=DOWNLOAD_MAX_AGE)
+    return response
@@ -0,0 +1,164 @@
+"""
+head_image 반응형 이미지(파생 이미지) 생성
+
+- 업로드된 원본 이미지에서 정해진 너비(IMAGE_WIDTHS)의 WebP, JPEG 이미지를 만들어 원본 옆에 저장
+  예: blog/images/2024/11/20/photo.png -> blog/images/2024/11/20/photo__w400.webp, photo__w400.jpg, ...
+- EXIF 회전 정보는 픽셀에 적용한 뒤 EXIF(촬영 위치 등)는 저장하지 않음, JPEG는 progressive로 저장
+- 만든 파일 목록은 모델의 head_image_variants(JSON)에 저장하고, 템플릿은 srcset으로 브라우저가 알맞은 크기를 고르게 함
+- Post와 NewsPost가 HeadImageVariantsMixin으로 같은 기능을 사용
+- 이미지가 바뀌면 저장 후 백그라운드 작업(blog.tasks.build_head_image_variants)으로 만들고,
+  만들어지기 전까지는 원본 이미지를 보여줌
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# 파생 이미지 너비 (목록 카드: 400/800, 상세 페이지: 800/1200)
+IMAGE_WIDTHS = (400, 800, 1200)
+
+# 파생 이미지 형식 (확장자, Pillow 형식, MIME 타입, 저장 옵션)
+# <picture>에서 앞에 있는 형식을 먼저 사용하므로 WebP를 먼저 둠
+IMAGE_FORMATS = (
+    ('webp', 'WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+# 파생 이미지를 만드는 모델과, 이미지가 바뀌면 무효화할 페이지 캐시 태그 (상세 페이지, 목록 페이지)
+IMAGE_MODELS = {
+    'blog.Post': ('blog.post:{}', 'blog.post-list'),
+    'news.NewsPost': ('news.post:{}', 'news.post-list'),
+}
+
+# <img src>에 사용할 기본 이미지 (srcset을 지원하지 않는 브라우저용)
+FALLBACK_EXT = 'jpg'
+FALLBACK_WIDTH = 800
+
+
+def generate_image_variants(field_file):
+    """
+    원본 이미지 파일에서 파생 이미지들을 만들어 저장하고 head_image_variants에 저장할 dict를 반환
+    원본보다 큰 너비로는 늘리지 않음 (원본이 가장 작은 너비보다 작으면 원본 너비로 하나만 만듦)
+    """
+    storage = field_file.storage
+    with storage.open(field_file.name, 'rb') as f:
+        image = Image.open(f)
+        image.load()
+
+    # EXIF의 회전 정보를 픽셀에 적용 (저장할 때 EXIF는 넘기지 않으므로 메타데이터는 제거됨)
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        # JPEG는 투명도를 지원하지 않으므로 흰 배경에 합성
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    widths = [width for width in IMAGE_WIDTHS if width < image.width] or [image.width]
+    if image.width <= IMAGE_WIDTHS[-1] and image.width not in widths:
+        widths.append(image.width)
+
+    stem = os.path.splitext(field_file.name)[0]
+    items = []
+    for width in widths:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        for ext, pillow_format, mime_type, options in IMAGE_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, pillow_format, **options)
+            name = storage.save(f'{stem}__w{width}.{ext}', ContentFile(buffer.getvalue()))
+            items.append({'name': name, 'width': width, 'height': height, 'ext': ext, 'type': mime_type})
+
+    return {'source': field_file.name, 'items': items}
+
+
+def delete_image_variants(variants):
+    """
+    head_image_variants에 기록된 파생 이미지 파일을 삭제
+    """
+    for item in (variants or {}).get('items', []):
+        default_storage.delete(item['name'])
+
+
+# head_image와 head_image_variants 필드가 있는 모델에 반응형 이미지 기능을 추가하는 Mixin
+class HeadImageVariantsMixin:
+    def head_image_needs_variants(self):
+        """
+        현재 head_image에 맞는 파생 이미지가 없으면 True
+        """
+        return bool(self.head_image) and (self.head_image_variants or {}).get('source') != self.head_image.name
+
+    def head_image_variants_stale(self):
+        """
+        파생 이미지를 새로 만들거나, head_image가 지워져서 파생 이미지를 지워야 하면 True
+        """
+        return self.head_image_needs_variants() or (not self.head_image and bool(self.head_image_variants))
+
+    def refresh_head_image_variants(self):
+        """
+        head_image가 바뀌었으면 파생 이미지를 다시 만들고 예전 파생 이미지는 삭제
+        head_image_variants가 바뀌었으면 True를 반환 (DB 저장은 호출한 쪽에서 처리)
+        """
+        if not self.head_image_needs_variants():
+            if not self.head_image and self.head_image_variants:
+                delete_image_variants(self.head_image_variants)
+                self.head_image_variants = {}
+                return True
+            return False
+
+        old_variants = self.head_image_variants
+        self.head_image_variants = generate_image_variants(self.head_image)
+        delete_image_variants(old_variants)
+        return True
+
+    def _head_image_items(self, ext):
+        return [item for item in (self.head_image_variants or {}).get('items', []) if item['ext'] == ext]
+
+    def head_image_srcset(self, ext=FALLBACK_EXT):
+        """
+        srcset 속성 값 (예: '/media/.../photo__w400.jpg 400w, /media/.../photo__w800.jpg 800w')
+        """
+        storage = self.head_image.storage
+        return ', '.join(f"{storage.url(item['name'])} {item['width']}w" for item in self._head_image_items(ext))
+
+    @property
+    def head_image_sources(self):
+        """
+        <picture>의 <source>에 사용할 형식별 srcset 목록 (파생 이미지가 없으면 빈 목록)
+        """
+        sources = []
+        for ext, _, mime_type, _ in IMAGE_FORMATS:
+            srcset = self.head_image_srcset(ext)
+            if srcset:
+                sources.append({'type': mime_type, 'srcset': srcset})
+        return sources
+
+    def _head_image_fallback(self):
+        # FALLBACK_WIDTH 이하 중 가장 큰 JPEG (없으면 가장 작은 JPEG)
+        items = self._head_image_items(FALLBACK_EXT)
+        fitting = [item for item in items if item['width'] <= FALLBACK_WIDTH] or items[:1]
+        return fitting[-1] if fitting else None
+
+    @property
+    def head_image_src(self):
+        """
+        <img src>에 사용할 URL (파생 이미지가 없으면 원본)
+        """
+        item = self._head_image_fallback()
+        if item is None:
+            return self.head_image.url
+        return self.head_image.storage.url(item['name'])
+
+    @property
+    def head_image_size(self):
+        """
+        head_image_src 이미지의 (너비, 높이), 모르면 None (레이아웃 이동을 줄이기 위해 width/height 속성에 사용)
+        """
+        item = self._head_image_fallback()
+        if item is None:
+            return None
+        return item['width'], item['height']
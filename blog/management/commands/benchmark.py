@@ -0,0 +1,204 @@
+import json
+import statistics
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from blog.seed import SEED_USER_PREFIX
+from do_it_django_prj.benchmark import (
+    benchmark_meta, build_url, compare_results, discover_routes, run_client, run_live, run_startup, sample_values,
+)
+
+# startup 모드에서 첫 요청을 보낼 경로 (--route로 바꿀 수 있음)
+STARTUP_ROUTE = 'blog/'
+
+
+# blog, news, single_pages의 모든 URL 패턴을 요청해서 p50/p95 응답 시간, 쿼리 수, 응답 크기를 측정하는 명령
+# (do_it_django_prj/benchmark.py) seed_data로 데이터를 만든 뒤 실행하고, 결과 JSON을 커밋 사이에 비교
+# 예: python manage.py benchmark --output before.json
+#     python manage.py benchmark --mode live --output after.json --compare before.json
+#     python manage.py benchmark --mode live --server both --concurrency 8 --slow-clients 2  (WSGI와 ASGI 비교)
+#     python manage.py benchmark --mode startup --workers 4  (preload + 워밍업 전후의 첫 요청 시간과 워커 메모리)
+class Command(BaseCommand):
+    help = 'URL 패턴별 응답 시간(p50/p95), 쿼리 수, 응답 크기를 측정해서 JSON으로 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            choices=['client', 'live', 'both', 'startup'],
+            default='client',
+            help='client: Django 테스트 클라이언트, live: gunicorn 프로세스, '
+                 'startup: gunicorn 워커의 첫 요청 시간과 메모리 (기본값: client)',
+        )
+        parser.add_argument('--requests', type=int, default=30, help='경로마다 측정할 요청 수 (기본값: 30)')
+        parser.add_argument('--warmup', type=int, default=3, help='측정 전에 보낼 요청 수 (기본값: 3)')
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='요청마다 URL을 바꿔서 페이지 캐시를 거치지 않고 측정합니다.',
+        )
+        parser.add_argument('--gzip', action='store_true', help='Accept-Encoding: gzip으로 요청합니다.')
+        parser.add_argument('--workers', type=int, default=2, help='live 모드의 gunicorn 워커 수 (기본값: 2)')
+        parser.add_argument(
+            '--server',
+            choices=['wsgi', 'asgi', 'both'],
+            default='wsgi',
+            help='live 모드의 서버 wsgi: 동기 워커, asgi: uvicorn 워커와 비동기 뷰 (기본값: wsgi)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='live 모드에서 동시에 요청하는 연결 수, 연결마다 --requests번씩 요청 (기본값: 1)',
+        )
+        parser.add_argument(
+            '--slow-clients',
+            type=int,
+            default=0,
+            help='live 모드에서 측정하는 동안 요청 헤더를 천천히 보내는 연결 수 (기본값: 0)',
+        )
+        parser.add_argument(
+            '--route',
+            action='append',
+            help="측정할 경로 (예: 'blog/<int:pk>', 기본값: 전체)",
+        )
+        parser.add_argument(
+            '--username',
+            default=f'{SEED_USER_PREFIX}0',
+            help=f'로그인이 필요한 페이지를 측정할 사용자 (기본값: {SEED_USER_PREFIX}0)',
+        )
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+        parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=20,
+            help='이 비율(%%)보다 느려지거나 커지면 회귀로 표시합니다. (기본값: 20)',
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='회귀가 있으면 오류로 종료합니다.',
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            self.stderr.write(self.style.WARNING(f"{options['username']} 사용자가 없어 로그인이 필요한 페이지는 비로그인으로 측정합니다."))
+
+        samples = sample_values(user)
+        targets = []
+        for route in options['route'] or discover_routes():
+            url = build_url(route, samples)
+            if url is None:
+                self.stderr.write(self.style.WARNING(f'{route or "/"}: 경로 인자를 채울 데이터가 없어 건너뜁니다.'))
+            else:
+                targets.append((route, url))
+
+        servers = ['wsgi', 'asgi'] if options['server'] == 'both' else [options['server']]
+        if options['mode'] == 'startup':
+            self.handle_startup(targets, servers, options)
+            return
+
+        params = (user, options['requests'], options['warmup'], options['cold'], options['gzip'])
+        results = []
+        if options['mode'] in ('client', 'both'):
+            results += run_client(targets, *params)
+        if options['mode'] in ('live', 'both'):
+            try:
+                for server in servers:
+                    results += run_live(
+                        targets, *params,
+                        workers=options['workers'],
+                        server=server,
+                        concurrency=options['concurrency'],
+                        slow=options['slow_clients'],
+                    )
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        report = {
+            'meta': benchmark_meta({
+                key: options[key] for key in (
+                    'mode', 'requests', 'warmup', 'cold', 'gzip', 'workers', 'server', 'concurrency', 'slow_clients',
+                    'username',
+                )
+            }),
+            'results': results,
+        }
+        self.print_results(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과를 {options['output']}에 저장했습니다."))
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+            regressions = self.print_comparison(compare_results(baseline, report, options['threshold']), baseline)
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'회귀 {regressions}건')
+
+    def handle_startup(self, targets, servers, options):
+        if not targets:
+            raise CommandError('측정할 경로가 없습니다.')
+        url = dict(targets).get(STARTUP_ROUTE, targets[0][1])
+        try:
+            results = [result for server in servers for result in run_startup(url, options['workers'], server)]
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{'server':6} {'profile':8} {'status':>8} {'first ms':>9} {'max ms':>9} "
+            f"{'RSS MB':>8} {'PSS MB':>8} {'master MB':>10}"
+        )
+        for result in results:
+            status = ','.join(str(code) for code in result['status'])
+            timings = result['first_request_ms']
+            pss = [value for value in result['pss_mb'] if value is not None]
+            self.stdout.write(
+                f"{result['server']:6} {result['profile']:8} {status:>8} {statistics.median(timings):9.2f} "
+                f"{max(timings):9.2f} {statistics.mean(result['rss_mb']):8.1f} "
+                f"{statistics.mean(pss) if pss else float('nan'):8.1f} {result['master_rss_mb']:10.1f}"
+            )
+        self.stdout.write(f'({url} 첫 요청, 워커 평균 메모리)')
+
+        if options['output']:
+            report = {
+                'meta': benchmark_meta({key: options[key] for key in ('mode', 'workers', 'server')}),
+                'startup': results,
+            }
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과를 {options['output']}에 저장했습니다."))
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'mode':9} {'route':40} {'status':>8} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'bytes':>9} {'rps':>8}"
+        )
+        for result in results:
+            status = ','.join(str(code) for code in result['status'])
+            queries = '-' if result['queries'] is None else f"{result['queries']:g}"
+            rps = '-' if result.get('rps') is None else f"{result['rps']:g}"
+            route = ('*' if result['authenticated'] else '') + ('/' + result['route'])
+            self.stdout.write(
+                f"{result['mode']:9} {route:40} {status:>8} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} "
+                f"{queries:>8} {result['bytes']:9,} {rps:>8}"
+            )
+        self.stdout.write('(* 로그인해서 측정)')
+
+    def print_comparison(self, rows, baseline):
+        self.stdout.write(f"\n{baseline['meta'].get('commit')}와 비교:")
+        regressions = 0
+        for route, mode, field, old, new, regressed in rows:
+            if old == new:
+                continue
+            change = f' ({(new - old) / old * 100:+.1f}%)' if old else ''
+            line = f'{mode:9} /{route:39} {field:8} {old:g} -> {new:g}{change}'
+            if regressed:
+                regressions += 1
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+        self.stdout.write(f'회귀 {regressions}건')
+        return regressions
@@ -0,0 +1,77 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from blog.images import IMAGE_MODELS, delete_image_variants
+from do_it_django_prj.page_cache import invalidate_cache_tags
+
+
+# 이미 업로드된 head_image의 반응형 파생 이미지(WebP/JPEG)를 일괄 생성하는 명령
+# 예: python manage.py build_image_variants
+#     python manage.py build_image_variants --all --model blog.Post
+class Command(BaseCommand):
+    help = 'head_image의 너비별 WebP/JPEG 파생 이미지를 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='이미 파생 이미지가 있어도 모두 다시 만듭니다.',
+        )
+        parser.add_argument(
+            '--model',
+            choices=list(IMAGE_MODELS),
+            action='append',
+            help='대상 모델 (기본값: 전체)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='한 번에 DB에 반영할 게시물 수 (기본값: 100)',
+        )
+
+    def handle(self, *args, **options):
+        for label in options['model'] or IMAGE_MODELS:
+            model = apps.get_model(label)
+            built, failed = self.build(model, IMAGE_MODELS[label], options['all'], options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{label}: {built}개 게시물의 파생 이미지를 만들었습니다.'))
+            if failed:
+                self.stdout.write(self.style.WARNING(f'{label}: {failed}개 이미지는 열 수 없어 건너뛰었습니다.'))
+
+    def build(self, model, cache_tags, rebuild, batch_size):
+        post_list = model.objects.exclude(head_image='').only('pk', 'head_image', 'head_image_variants').order_by('pk')
+        batch = []
+        built = failed = 0
+
+        for post in post_list.iterator(chunk_size=batch_size):
+            if rebuild:
+                delete_image_variants(post.head_image_variants)
+                post.head_image_variants = {}
+            try:
+                if not post.refresh_head_image_variants():
+                    continue
+            except (OSError, ValueError) as e:
+                failed += 1
+                self.stderr.write(f'{post.pk}: {post.head_image.name} ({e})')
+                continue
+
+            batch.append(post)
+            if len(batch) >= batch_size:
+                built += self.flush(model, cache_tags, batch)
+
+        built += self.flush(model, cache_tags, batch)
+        return built, failed
+
+    def flush(self, model, cache_tags, batch):
+        # 시그널(색인, 관련 게시물 계산)을 건드리지 않도록 save() 대신 bulk_update를 쓰고 페이지 캐시는 직접 무효화
+        # updated_at도 갱신해서 updated_at을 키로 쓰는 조각 캐시(목록 카드, 상세 이미지)가 새 이미지로 다시 렌더링되게 함
+        count = len(batch)
+        if count:
+            now = timezone.now()
+            for post in batch:
+                post.updated_at = now
+            model.objects.bulk_update(batch, ['head_image_variants', 'updated_at'])
+            detail_tag, list_tag = cache_tags
+            invalidate_cache_tags(list_tag, *(detail_tag.format(post.pk) for post in batch))
+            batch.clear()
+        return count
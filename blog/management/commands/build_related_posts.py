@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+from blog.models import RelatedPost
+from blog.related import rebuild_related_posts
+from do_it_django_prj.page_cache import invalidate_cache_tags
+
+
+# 모든 게시물의 관련 게시물을 다시 계산하는 명령 (처음 설치할 때, 게시물이 많이 바뀌어 IDF가 달라졌을 때)
+# 예: python manage.py build_related_posts
+class Command(BaseCommand):
+    help = '모든 게시물의 관련 게시물(RelatedPost)을 태그/본문 유사도로 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        changed = rebuild_related_posts()
+        invalidate_cache_tags(*(f'blog.post:{pk}' for pk in changed))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(changed)}개 게시물의 관련 글이 바뀌었습니다. '
+            f'(전체 {RelatedPost.objects.count()}개 연결, {time.perf_counter() - started:.1f}초)'
+        ))
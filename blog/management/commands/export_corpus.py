@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from blog.corpus import EXPORT_MODELS, dump_record, export_records, open_corpus
+
+
+# 게시물, 뉴스, 카테고리, 태그, 언론사, 댓글을 JSONL로 내보내는 명령 (blog/corpus.py)
+# 모델별로 --batch-size개씩 읽어서 바로 쓰므로 게시물이 많아도 메모리 사용량이 일정함
+# 예: python manage.py export_corpus corpus.jsonl.gz
+#     python manage.py export_corpus - --model blog.post > posts.jsonl
+class Command(BaseCommand):
+    help = '게시물 코퍼스를 JSONL 파일로 내보냅니다. (.gz로 끝나면 gzip 압축)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="내보낼 파일 경로 ('-'이면 표준 출력)")
+        parser.add_argument(
+            '--model',
+            choices=EXPORT_MODELS,
+            action='append',
+            help='내보낼 모델 (기본값: 전체)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='한 번에 DB에서 읽을 레코드 수 (기본값: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        labels = options['model'] or EXPORT_MODELS
+        output, raw = open_corpus(options['path'], 'w')
+        counts = dict.fromkeys(labels, 0)
+
+        try:
+            for record in export_records(labels, options['batch_size']):
+                output.write(dump_record(record))
+                counts[record['model']] += 1
+        finally:
+            if raw is not None:
+                output.close()
+
+        # 표준 출력으로 내보낸 경우 결과 요약은 표준 에러에 씀
+        summary = ', '.join(f'{label} {count:,}개' for label, count in counts.items())
+        (self.stderr if raw is None else self.stdout).write(self.style.SUCCESS(f'내보냈습니다: {summary}'))
@@ -0,0 +1,120 @@
+import os
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models
+from blog.storage import BLOB_NAME, CAS_DIR, TMP_DIR, ContentAddressedStorage, blob_dir_name, upload_storage
+
+
+# 내용 주소 저장소(blog/storage.py)에서 어떤 게시물도 참조하지 않는 첨부 파일을 삭제하는 명령
+# 업로드 직후(아직 DB에 저장되기 전) 파일을 지우지 않도록 --min-age 시간 안에 쓰인 파일은 남김
+# 예: python manage.py gc_uploads --dry-run
+#     python manage.py gc_uploads --min-age 1
+class Command(BaseCommand):
+    help = '어떤 게시물도 참조하지 않는 첨부 파일(blob)을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=float,
+            default=24,
+            help='이 시간(시간 단위) 안에 업로드된 파일은 남깁니다. (기본값: 24)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='삭제하지 않고 삭제할 파일만 보여줍니다.',
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        cutoff = time.time() - options['min_age'] * 60 * 60
+        referenced = self.referenced_names()
+
+        root = upload_storage.path(CAS_DIR)
+        if not os.path.isdir(root):
+            self.stdout.write('저장된 첨부 파일이 없습니다.')
+            return
+
+        self.clean_tmp(cutoff)
+        kept = removed_links = removed_blobs = freed = 0
+        for prefix in sorted(os.listdir(root)):
+            prefix_dir = os.path.join(root, prefix)
+            if upload_storage.path(TMP_DIR) == prefix_dir or not os.path.isdir(prefix_dir):
+                continue
+
+            for digest in sorted(os.listdir(prefix_dir)):
+                links, blob_size = self.collect(digest, referenced, cutoff)
+                removed_links += links
+                if blob_size is None:
+                    kept += 1
+                else:
+                    removed_blobs += 1
+                    freed += blob_size
+
+            if not self.dry_run and not os.listdir(prefix_dir):
+                os.rmdir(prefix_dir)
+
+        action = '삭제할' if self.dry_run else '삭제한'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} blob {removed_blobs}개 ({freed:,}바이트), 파일명 링크 {removed_links}개, '
+            f'남은 blob {kept}개 (참조 {len(referenced)}개)'
+        ))
+
+    def referenced_names(self):
+        # 내용 주소 저장소를 쓰는 모든 FileField가 참조하는 이름
+        names = set()
+        for model in apps.get_models():
+            for field in model._meta.fields:
+                if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                    post_list = model._default_manager.filter(**{f'{field.name}__startswith': f'{CAS_DIR}/'})
+                    names.update(post_list.values_list(field.name, flat=True).iterator())
+        return names
+
+    def collect(self, digest, referenced, cutoff):
+        """
+        blob 하나의 참조되지 않는 파일명 링크를 지우고 (지운 링크 수, 지운 blob 크기 또는 None)을 반환
+        """
+        blob_dir = blob_dir_name(digest)
+        kept = False
+        removed = 0
+
+        for filename in os.listdir(upload_storage.path(blob_dir)):
+            if filename == BLOB_NAME:
+                continue
+            name = f'{blob_dir}/{filename}'
+            if name in referenced or os.path.getmtime(upload_storage.path(name)) >= cutoff:
+                kept = True
+            else:
+                removed += 1
+                self.remove(name)
+
+        blob = f'{blob_dir}/{BLOB_NAME}'
+        blob_path = upload_storage.path(blob)
+        if not os.path.exists(blob_path):
+            return removed, None
+        if kept or blob in referenced or os.path.getmtime(blob_path) >= cutoff:
+            return removed, None
+
+        size = os.path.getsize(blob_path)
+        self.remove(blob)
+        if not self.dry_run:
+            os.rmdir(upload_storage.path(blob_dir))
+        return removed, size
+
+    def clean_tmp(self, cutoff):
+        # 업로드 도중 실패해서 남은 임시 파일
+        tmp_dir = upload_storage.path(TMP_DIR)
+        if not os.path.isdir(tmp_dir):
+            return
+        for filename in os.listdir(tmp_dir):
+            path = os.path.join(tmp_dir, filename)
+            if os.path.getmtime(path) < cutoff:
+                self.remove(f'{TMP_DIR}/{filename}')
+
+    def remove(self, name):
+        if self.dry_run:
+            self.stdout.write(f'  {name}')
+        else:
+            os.remove(upload_storage.path(name))
@@ -0,0 +1,116 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from blog.corpus import CorpusImporter, open_corpus, progress_line
+
+
+# export_corpus로 만든 JSONL 파일을 가져오는 명령 (blog/corpus.py)
+# 한 줄씩 읽어서 모델별로 --batch-size개씩 bulk_create로 넣으므로 메모리 사용량이 일정함
+# DB에 반영된 마지막 줄 번호를 <파일>.checkpoint에 기록하고, --resume으로 중단된 곳부터 이어서 가져옴
+# 예: python manage.py import_corpus corpus.jsonl.gz
+#     python manage.py import_corpus corpus.jsonl.gz --resume --media-map uploads/=blog/files/
+class Command(BaseCommand):
+    help = 'export_corpus로 내보낸 JSONL 파일을 가져옵니다.'
+
+    # 진행 상황을 출력하는 간격(초)
+    progress_interval = 2
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="가져올 파일 경로 ('-'이면 표준 입력)")
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='한 번에 DB에 넣을 레코드 수 (기본값: 1000)',
+        )
+        parser.add_argument(
+            '--media-map',
+            action='append',
+            default=[],
+            metavar='OLD=NEW',
+            help='head_image, file_upload 경로의 앞부분 OLD를 NEW로 바꿉니다. (여러 번 지정 가능)',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='체크포인트 파일에 기록된 줄 다음부터 가져옵니다.',
+        )
+        parser.add_argument(
+            '--skip-index',
+            action='store_true',
+            help='검색 색인 작업을 추가하지 않습니다. (가져온 뒤 rebuild_search_index로 한 번에 색인)',
+        )
+
+    def handle(self, *args, **options):
+        media_map = []
+        for mapping in options['media_map']:
+            old, sep, new = mapping.partition('=')
+            if not sep:
+                raise CommandError(f'--media-map은 OLD=NEW 형식이어야 합니다: {mapping}')
+            media_map.append((old, new))
+
+        path = options['path']
+        checkpoint_path = None if path == '-' else f'{path}.checkpoint'
+        start_line = self.read_checkpoint(checkpoint_path) if options['resume'] else 0
+        if start_line:
+            self.stdout.write(f'{start_line:,}번째 줄 다음부터 가져옵니다.')
+
+        importer = CorpusImporter(options['batch_size'], media_map, index=not options['skip_index'])
+        corpus, raw = open_corpus(path, 'r')
+        total = os.path.getsize(path) if raw is not None else 0
+        started_at = datetime.now()
+        reported_at = time.monotonic()
+        committed_line = line = start_line
+
+        try:
+            for line, text in enumerate(corpus, 1):
+                if line <= start_line or not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except ValueError as e:
+                    raise CommandError(f'{line}번째 줄을 읽을 수 없습니다: {e}')
+                importer.add(record, line)
+
+                if importer.committed_line != committed_line:
+                    committed_line = importer.committed_line
+                    self.write_checkpoint(checkpoint_path, committed_line)
+                    if time.monotonic() - reported_at >= self.progress_interval:
+                        reported_at = time.monotonic()
+                        self.stdout.write(progress_line(line, line - start_line, raw, total, importer.counts, started_at))
+
+            importer.finish()
+            self.stdout.write(progress_line(line, line - start_line, raw, total, importer.counts, started_at))
+        finally:
+            if raw is not None:
+                corpus.close()
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        skipped = importer.skipped
+        if skipped['blog.post'] or skipped['news.newspost']:
+            self.stdout.write(self.style.WARNING(
+                f'pk가 이미 있는 게시물 {skipped["blog.post"]:,}개, 뉴스 {skipped["news.newspost"]:,}개를 건너뛰었습니다.'
+            ))
+        if skipped['blog.comment']:
+            self.stdout.write(self.style.WARNING(f'게시물이나 작성자가 없는 댓글 {skipped["blog.comment"]:,}개를 건너뛰었습니다.'))
+        self.stdout.write(self.style.SUCCESS('가져오기를 마쳤습니다.'))
+
+    def read_checkpoint(self, checkpoint_path):
+        if checkpoint_path is None:
+            raise CommandError('표준 입력으로 가져올 때는 --resume을 사용할 수 없습니다.')
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as f:
+            return json.load(f)['line']
+
+    def write_checkpoint(self, checkpoint_path, line):
+        # 쓰는 도중 중단돼도 예전 체크포인트가 남도록 임시 파일에 쓴 뒤 교체
+        if checkpoint_path is None:
+            return
+        with open(f'{checkpoint_path}.tmp', 'w') as f:
+            json.dump({'line': line}, f)
+        os.replace(f'{checkpoint_path}.tmp', checkpoint_path)
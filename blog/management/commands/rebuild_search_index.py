@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from blog.models import Post
+from blog.search import index_post
+
+
+# 모든 게시물의 검색 색인을 다시 만드는 명령
+# 예: python manage.py rebuild_search_index
+class Command(BaseCommand):
+    help = '모든 게시물의 검색 색인(SearchDocument, SearchToken)을 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='한 번에 불러올 게시물 수 (기본값: 500)',
+        )
+
+    def handle(self, *args, **options):
+        post_list = Post.objects.prefetch_related('tags').order_by('pk')
+        indexed = 0
+
+        for post in post_list.iterator(chunk_size=options['batch_size']):
+            index_post(post)
+            indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'{indexed}개 게시물을 색인했습니다.'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from blog.context_processors import invalidate_category_sidebar
+from blog.counters import reconcile_counters
+from do_it_django_prj.page_cache import invalidate_cache_tags
+
+
+# 카운터 컬럼(댓글 수, 태그/카테고리별 게시물 수, 미분류 게시물 수)을 실제 개수로 다시 계산하는 명령
+# 예: python manage.py reconcile_counters
+#     python manage.py reconcile_counters --dry-run -v 2
+class Command(BaseCommand):
+    help = '카운터 컬럼을 실제 개수와 비교해서 어긋난 값(drift)을 출력하고 고칩니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='어긋난 값을 출력만 하고 고치지 않습니다.',
+        )
+
+    def handle(self, *args, **options):
+        fix = not options['dry_run']
+        drift = reconcile_counters(fix=fix)
+
+        total = 0
+        for name, rows in drift.items():
+            total += len(rows)
+            diff = sum(actual - stored for _, stored, actual in rows)
+            self.stdout.write(f'{name}: 어긋난 행 {len(rows)}개 (합계 차이 {diff:+d})')
+            if options['verbosity'] >= 2:
+                for pk, stored, actual in rows:
+                    self.stdout.write(f'  {pk}: {stored} -> {actual}')
+
+        if not total:
+            self.stdout.write(self.style.SUCCESS('모든 카운터가 실제 개수와 같습니다.'))
+        elif fix:
+            # 사이드바에 카테고리별 게시물 수가 표시되므로 캐시를 무효화
+            invalidate_category_sidebar()
+            invalidate_cache_tags('blog.sidebar')
+            self.stdout.write(self.style.SUCCESS(f'어긋난 값 {total}개를 고쳤습니다.'))
+        else:
+            self.stdout.write(self.style.WARNING(f'어긋난 값 {total}개 (--dry-run이므로 고치지 않음)'))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from blog.models import Post, MARKDOWN_RENDER_VERSION
+from blog.signals import invalidate_post_pages
+
+
+# 저장된 content_html과 excerpt를 현재 마크다운 렌더러로 일괄 재렌더링하는 명령
+# 예: python manage.py rerender_markdown
+#     python manage.py rerender_markdown --all --batch-size 200
+class Command(BaseCommand):
+    help = '렌더러 버전이 오래된 게시물의 content_html과 excerpt를 다시 렌더링합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='버전과 상관없이 모든 게시물을 다시 렌더링합니다.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='한 번에 DB에 반영할 게시물 수 (기본값: 500)',
+        )
+
+    def handle(self, *args, **options):
+        post_list = Post.objects.only('pk', 'content', 'content_html_version').order_by('pk')
+        if not options['all']:
+            post_list = post_list.exclude(content_html_version=MARKDOWN_RENDER_VERSION)
+
+        batch_size = options['batch_size']
+        batch = []
+        rendered = 0
+
+        for post in post_list.iterator(chunk_size=batch_size):
+            post.render_content()
+            batch.append(post)
+
+            if len(batch) >= batch_size:
+                rendered += self.flush(batch)
+
+        rendered += self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{rendered}개 게시물을 렌더러 버전 {MARKDOWN_RENDER_VERSION}(으)로 다시 렌더링했습니다.'
+        ))
+
+    def flush(self, batch):
+        # updated_at은 건드리지 않도록 save() 대신 bulk_update 사용
+        count = len(batch)
+        if count:
+            Post.objects.bulk_update(batch, ['content_html', 'content_html_version', 'excerpt'])
+            # bulk_update는 시그널을 보내지 않으므로 캐시된 페이지를 직접 무효화
+            invalidate_post_pages([post.pk for post in batch])
+            batch.clear()
+        return count
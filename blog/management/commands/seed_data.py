@@ -0,0 +1,63 @@
+import random
+
+from django.core.management.base import BaseCommand
+from blog.corpus import CorpusImporter
+from blog.seed import create_seed_files, create_seed_users, seed_records
+
+
+# 성능 측정용 가짜 데이터를 만드는 명령 (blog/seed.py)
+# 같은 --seed이면 같은 데이터를 만들므로 커밋 사이의 benchmark 결과를 비교할 수 있음
+# 예: python manage.py seed_data --posts 10000 --comments 5
+#     python manage.py benchmark --output before.json
+class Command(BaseCommand):
+    help = '게시물, 뉴스, 태그, 카테고리, 댓글, 사용자, 소셜 계정 가짜 데이터를 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000, help='게시물 수 (기본값: 1000)')
+        parser.add_argument('--news', type=int, default=200, help='뉴스 수 (기본값: 200)')
+        parser.add_argument('--comments', type=int, default=3, help='게시물당 평균 댓글 수 (기본값: 3)')
+        parser.add_argument('--tags', type=int, default=100, help='태그 수 (기본값: 100)')
+        parser.add_argument('--categories', type=int, default=10, help='카테고리 수 (기본값: 10)')
+        parser.add_argument('--presses', type=int, default=5, help='언론사 수 (기본값: 5)')
+        parser.add_argument('--users', type=int, default=50, help='사용자 수 (기본값: 50)')
+        parser.add_argument('--files', type=int, default=5, help='게시물에 나눠 붙일 첨부 파일 수 (기본값: 5)')
+        parser.add_argument(
+            '--social-ratio',
+            type=float,
+            default=0.5,
+            help='소셜 계정을 연결할 사용자 비율 (기본값: 0.5)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='난수 seed (기본값: 42)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 DB에 넣을 레코드 수 (기본값: 1000)')
+        parser.add_argument(
+            '--skip-index',
+            action='store_true',
+            help='검색 색인 작업을 추가하지 않습니다. (나중에 rebuild_search_index로 한 번에 색인)',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        usernames = create_seed_users(rng, max(options['users'], 1), options['social_ratio'])
+        files = create_seed_files(rng, options['files'])
+
+        importer = CorpusImporter(options['batch_size'], index=not options['skip_index'])
+        records = seed_records(
+            rng,
+            posts=options['posts'],
+            news=options['news'],
+            comments=options['comments'],
+            tags=options['tags'],
+            categories=options['categories'],
+            presses=options['presses'],
+            usernames=usernames,
+            files=files,
+        )
+        for record in records:
+            importer.add(record)
+        importer.finish()
+
+        counts = importer.counts
+        self.stdout.write(self.style.SUCCESS(
+            f'사용자 {len(usernames):,}명, 게시물 {counts["blog.post"]:,}개, 뉴스 {counts["news.newspost"]:,}개, '
+            f'댓글 {counts["blog.comment"]:,}개를 만들었습니다.'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:29
+
+from django.db import migrations, models
+from markdownx.utils import markdown
+
+
+def render_existing_posts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    for post in Post.objects.only("pk", "content").iterator():
+        post.content_html = markdown(post.content)
+        post.content_html_version = 1
+        post.save(update_fields=["content_html", "content_html_version"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_comment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="content_html_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing_posts, migrations.RunPython.noop),
+    ]
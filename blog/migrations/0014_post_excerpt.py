@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:30
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    for post in Post.objects.only("pk", "content_html").iterator():
+        post.excerpt = Truncator(post.content_html).words(50, html=True)
+        post.save(update_fields=["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_post_content_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSTGRES_INDEX_NAME = "blog_searchdoc_fts_idx"
+
+
+def postgres_search_index():
+    # blog.search.postgres_search_vector()와 같은 식이어야 검색 쿼리에서 인덱스가 사용됨
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(
+        SearchVector("title_tokens", weight="A", config="simple")
+        + SearchVector("body_tokens", weight="D", config="simple"),
+        name=POSTGRES_INDEX_NAME,
+    )
+
+
+def add_postgres_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        SearchDocument = apps.get_model("blog", "SearchDocument")
+        schema_editor.add_index(SearchDocument, postgres_search_index())
+
+
+def remove_postgres_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        SearchDocument = apps.get_model("blog", "SearchDocument")
+        schema_editor.remove_index(SearchDocument, postgres_search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0014_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to="blog.post",
+                    ),
+                ),
+                ("title_tokens", models.TextField(blank=True)),
+                ("body_tokens", models.TextField(blank=True)),
+                ("body_text", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=20)),
+                ("weight", models.PositiveIntegerField(default=0)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="blog.post"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("token", "post"),
+                        name="blog_searchtoken_token_post_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(add_postgres_index, remove_postgres_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0015_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="head_image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0016_post_head_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="download_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:59
+
+import blog.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0017_post_download_count"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="file_upload",
+            field=models.FileField(
+                blank=True,
+                max_length=255,
+                storage=blog.storage.ContentAddressedStorage(),
+                upload_to="blog/files/%Y/%m/%d/",
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:51
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, field):
+    rows = queryset.filter(**{field: OuterRef("pk")}).order_by().values(field).annotate(count=Count("*")).values("count")
+    return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    Category = apps.get_model("blog", "Category")
+    Tag = apps.get_model("blog", "Tag")
+    Counter = apps.get_model("blog", "Counter")
+    Post.objects.update(comment_count=_count(Comment.objects.all(), "post"))
+    Tag.objects.update(post_count=_count(Post.tags.through.objects.all(), "tag"))
+    Category.objects.update(post_count=_count(Post.objects.all(), "category"))
+    Counter.objects.create(name="blog.uncategorized_posts", value=Post.objects.filter(category=None).count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0019_alter_comment_post_alter_post_category_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("value", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
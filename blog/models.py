@@ -2,15 +2,55 @@ from django.db import models
 from django.contrib.auth.models import User
 from markdownx.models import MarkdownxField
 from markdownx.utils import markdown
+from django.utils.text import Truncator
+from .avatars import avatar_url_for
+from .images import HeadImageVariantsMixin
+from .storage import upload_storage
 
 import os
 
+# 마크다운 렌더러나 확장 기능을 바꾸면 이 값을 올린 뒤 `python manage.py rerender_markdown`으로 일괄 재렌더링
+MARKDOWN_RENDER_VERSION = 1
+# 목록 페이지에 보여줄 요약(excerpt)의 최대 단어 수
+EXCERPT_WORDS = 50
+
+
+# 시그널에서 F()로 갱신하는 카운터 필드가 있는 모델에 쓰는 Mixin (blog/counters.py)
+# 이미 저장된 인스턴스를 save()하면 카운터 필드는 빼고 저장해서, 불러온 뒤 다른 요청이 바꾼 값을 예전 값으로 덮어쓰지 않음
+class CounterFieldsMixin:
+    # 카운터 필드 이름 목록
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+# Counter 모델: 특정 행에 붙일 수 없는 사이트 전체 카운터 (예: 미분류 게시물 수, blog/counters.py)
+class Counter(models.Model):
+    # 카운터 이름 (중복 불가)
+    name = models.CharField(max_length=50, unique=True)
+    # 현재 값 (F()로 증감)
+    value = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}={self.value}'
+
 # Tag 모델: 블로그 글에 사용할 태그를 정의하는 모델
-class Tag(models.Model):
+class Tag(CounterFieldsMixin, models.Model):
     # 태그의 이름 (중복 불가)
     name = models.CharField(max_length=20, unique=True)
     # 태그의 고유 슬러그 (중복 불가, URL에 사용됨)
     slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)    
+    # 이 태그가 달린 게시물 수 (태그 연결이 바뀔 때 시그널에서 F()로 갱신, blog/signals.py)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('post_count',)
 
     def __str__(self):
         return self.name
@@ -23,11 +63,15 @@ class Tag(models.Model):
         return f'/blog/tag/{self.slug}'
 
 # Category 모델: 블로그 글에 사용할 카테고리를 정의하는 모델
-class Category(models.Model):
+class Category(CounterFieldsMixin, models.Model):
     # 카테고리 이름 (중복 불가)
     name = models.CharField(max_length=20, unique=True)
     # 카테고리의 고유 슬러그 (중복 불가, URL에 사용됨)
     slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)
+    # 이 카테고리의 게시물 수 (게시물 생성/삭제/카테고리 변경 시 시그널에서 F()로 갱신, blog/signals.py)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('post_count',)
 
     def __str__(self):
         return self.name
@@ -43,8 +87,37 @@ class Category(models.Model):
         # 카테고리 모델의 복수형을 'Categories'로 설정
         verbose_name_plural = 'Categories'
 
+# Post 전용 QuerySet: 목록/상세 페이지에서 공통으로 쓰는 조회 방식을 모아둔 클래스
+class PostQuerySet(models.QuerySet):
+    def with_relations(self):
+        """
+        작성자, 카테고리, 태그를 미리 함께 불러온 QuerySet을 반환 (게시물마다 추가 쿼리가 나가는 N+1 방지)
+        템플릿에서는 prefetch 캐시를 쓰도록 post.tags.all을 사용해야 함 (.exists, .iterator는 캐시를 무시)
+        """
+        return self.select_related('author', 'category').prefetch_related('tags')
+
+    def for_list(self):
+        """
+        목록 페이지용 QuerySet을 반환
+        목록 카드는 excerpt만 사용하므로 본문(content, content_html)은 불러오지 않음
+        """
+        return self.with_relations().defer('content', 'content_html')
+
+    def for_detail(self):
+        """
+        상세 페이지용 QuerySet을 반환
+        댓글과 댓글 작성자, 관련 게시물(제목만, (post, rank) 인덱스로 한 번에)까지 함께 불러옴
+        """
+        return self.with_relations().prefetch_related(
+            models.Prefetch('comment_set', queryset=Comment.objects.select_related('author').order_by('created_at', 'pk')),
+            models.Prefetch(
+                'related_links',
+                queryset=RelatedPost.objects.select_related('related').only('post', 'related__title', 'rank', 'score').order_by('rank'),
+            ),
+        )
+
 # Post 모델: 블로그 글을 정의하는 모델
-class Post(models.Model):
+class Post(HeadImageVariantsMixin, CounterFieldsMixin, models.Model):
     # 제목 (최대 30자)
     title = models.CharField(max_length=30)
     # 부제목 (최대 100자, 선택사항)
@@ -52,10 +125,22 @@ class Post(models.Model):
 
     # 콘텐츠는 Markdown 형식으로 작성
     content = MarkdownxField()
+    # content를 미리 HTML로 변환해 둔 값 (content가 바뀔 때만 다시 렌더링)
+    content_html = models.TextField(blank=True, editable=False)
+    # content_html을 만든 렌더러 버전 (MARKDOWN_RENDER_VERSION과 다르면 재렌더링 대상)
+    content_html_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    # 목록 페이지용 요약 (content_html 앞부분을 태그가 닫힌 HTML로 잘라 저장)
+    excerpt = models.TextField(blank=True, editable=False)
     # 이미지 업로드 필드 (폴더 구조: /blog/images/YYYY/MM/DD/)
     head_image = models.ImageField(upload_to='blog/images/%Y/%m/%d/', blank=True)
-    # 파일 업로드 필드 (폴더 구조: /blog/files/YYYY/MM/DD/)
-    file_upload = models.FileField(upload_to='blog/files/%Y/%m/%d/', blank=True)
+    # head_image에서 만든 너비별 WebP/JPEG 파생 이미지 목록 (blog/images.py)
+    head_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # 파일 업로드 필드 (같은 내용은 한 번만 저장: /cas/ab/<해시>/<파일명>, blog/storage.py)
+    file_upload = models.FileField(upload_to='blog/files/%Y/%m/%d/', storage=upload_storage, max_length=255, blank=True)
+    # 첨부 파일 다운로드 수 (blog/downloads.py에서 F()로 증가)
+    download_count = models.PositiveIntegerField(default=0, editable=False)
+    # 댓글 수 (댓글 생성/삭제 시 시그널에서 F()로 갱신, blog/signals.py)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     # 생성일시 (자동 생성)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -65,17 +150,82 @@ class Post(models.Model):
     # 작성자 (User 모델과의 외래키 관계, 삭제 시 NULL로 설정)
     author = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
     # 카테고리 (Category 모델과의 외래키 관계, 선택사항, 삭제 시 NULL로 설정)
-    category = models.ForeignKey(Category, blank=True, null=True, on_delete=models.SET_NULL)
+    # 외래키 인덱스 대신 (category, -id) 복합 인덱스를 사용 (Meta.indexes)
+    category = models.ForeignKey(Category, blank=True, null=True, on_delete=models.SET_NULL, db_index=False)
     # 태그 (Tag 모델과의 다대다 관계, 선택사항)
     tags = models.ManyToManyField(Tag, blank=True)
 
+    objects = PostQuerySet.as_manager()
+
+    # download_count는 다운로드 뷰에서 F()로 증가시키므로 함께 제외
+    counter_fields = ('download_count', 'comment_count')
+
+    class Meta:
+        # 자주 실행되는 조회에 맞춘 인덱스 (blog/tests.py의 test_query_plans에서 전체 스캔을 하지 않는지 확인)
+        indexes = [
+            # 카테고리 페이지: category로 거르고 최신순(-pk)으로 커서 페이지 나누기
+            models.Index(fields=['category', '-id'], name='blog_post_category_pk_idx'),
+            # 미분류 페이지와 사이드바의 미분류 게시물 수: category가 NULL인 게시물만 담은 부분 인덱스
+            models.Index(fields=['-id'], condition=models.Q(category__isnull=True), name='blog_post_uncategorized_idx'),
+            # 작성일 기간 조회
+            models.Index(fields=['created_at'], name='blog_post_created_at_idx'),
+        ]
+
     def __str__(self):
         """
         모델 인스턴스를 문자열로 출력할 때, [pk] 제목 :: 작성자 형태로 출력
         예: [1] 첫 번째 글 :: admin
         """
         return f'[{self.pk}] {self.title} :: {self.author}'
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        DB에서 읽어온 content 원본과 category를 보관해 두고, 저장할 때 바뀌었는지 비교하는 데 사용
+        """
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_content = loaded.get('content')
+        instance._loaded_category_id = loaded.get('category_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        content가 바뀌었거나 렌더러 버전이 달라졌을 때만 content_html을 다시 만든 뒤 저장
+        (head_image의 파생 이미지는 저장 후 백그라운드 작업으로 만듦, blog/signals.py)
+        """
+        update_fields = kwargs.get('update_fields')
+        if self.content_needs_render() and (update_fields is None or 'content' in update_fields):
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'content_html', 'content_html_version', 'excerpt'}
+
+        super().save(*args, **kwargs)
+        self._loaded_content = self.content
+        self._loaded_category_id = self.category_id
+
+    def content_needs_render(self):
+        """
+        content_html을 다시 렌더링해야 하는지 여부를 반환
+        content가 지연 로딩(defer)된 상태라면 바뀌었을 수 없으므로 False
+        """
+        if 'content' in self.get_deferred_fields():
+            return False
+
+        return (
+            self._state.adding
+            or self.content != getattr(self, '_loaded_content', None)
+            or self.content_html_version != MARKDOWN_RENDER_VERSION
+        )
+
+    def render_content(self):
+        """
+        content를 HTML로 변환해 content_html과 excerpt를 채움 (DB 저장은 하지 않음)
+        """
+        self.content_html = markdown(self.content)
+        self.content_html_version = MARKDOWN_RENDER_VERSION
+        self.excerpt = Truncator(self.content_html).words(EXCERPT_WORDS, html=True)
+
     def get_absolute_url(self):
         """
         게시물의 고유 URL을 반환
@@ -83,6 +233,13 @@ class Post(models.Model):
         """
         return f'/blog/{self.pk}'
 
+    def get_download_url(self):
+        """
+        첨부 파일 다운로드 URL을 반환 (다운로드 수를 센 뒤 파일을 보냄)
+        예: /blog/1/download
+        """
+        return f'/blog/{self.pk}/download'
+
     def get_file_name(self):
         """
         업로드된 파일의 파일명을 반환
@@ -99,7 +256,10 @@ class Post(models.Model):
     def get_content_markdown(self):
         """
         Markdown 형식의 콘텐츠를 HTML로 변환하여 반환
+        저장된 content_html이 현재 렌더러 버전이면 그대로 사용하고, 아니면 즉석에서 변환
         """
+        if self.content_html_version == MARKDOWN_RENDER_VERSION:
+            return self.content_html
         return markdown(self.content)
 
     def get_avatar_url(self):
@@ -107,16 +267,14 @@ class Post(models.Model):
         작성자의 아바타 URL을 반환
         소셜 계정이 있으면 해당 계정에서 아바타를 가져오고, 
         없으면 이메일을 기반으로 기본 아바타 URL을 생성
+        여러 게시물을 보여줄 때는 blog.avatars.prime_avatar_urls로 작성자들을 미리 한 번에 조회
         """
-        if self.author.socialaccount_set.exists():
-            return self.author.socialaccount_set.first().get_avatar_url()
-        else:
-            return f'https://doitdjango.com/avatar/id/2569/88f1d2892a7cfe94/svg/{self.author.email}'
+        return avatar_url_for(self.author)
 
 # Comment 모델: 게시물에 달린 댓글을 정의하는 모델
 class Comment(models.Model):
-    # 댓글이 속한 게시물
-    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # 댓글이 속한 게시물 (외래키 인덱스 대신 (post, created_at, id) 복합 인덱스를 사용, Meta.indexes)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, db_index=False)
     # 댓글 작성자
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     
@@ -128,6 +286,12 @@ class Comment(models.Model):
     # 댓글 수정일시 (수정 시 자동 갱신)
     modified_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # 상세 페이지의 댓글 목록: post로 거르고 작성 순서(created_at, pk)대로 정렬 없이 읽음
+            models.Index(fields=['post', 'created_at', 'id'], name='blog_comment_post_created_idx'),
+        ]
+
     def __str__(self):
         """
         모델 인스턴스를 문자열로 출력할 때, 작성자와 내용 형태로 출력
@@ -147,8 +311,59 @@ class Comment(models.Model):
         댓글 작성자의 아바타 URL을 반환
         소셜 계정이 있으면 해당 계정에서 아바타를 가져오고, 
         없으면 이메일을 기반으로 기본 아바타 URL을 생성
+        여러 댓글을 보여줄 때는 blog.avatars.prime_avatar_urls로 작성자들을 미리 한 번에 조회
         """
-        if self.author.socialaccount_set.exists():
-            return self.author.socialaccount_set.first().get_avatar_url()
-        else:
-            return f'https://doitdjango.com/avatar/id/2569/88f1d2892a7cfe94/svg/{self.author.email}'
+        return avatar_url_for(self.author)
+
+# SearchDocument 모델: 게시물 하나의 검색용 문서 (blog/search.py에서 생성/갱신)
+class SearchDocument(models.Model):
+    # 검색 대상 게시물 (게시물당 하나)
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True)
+    # 제목과 태그 이름을 토큰으로 나눠 공백으로 이어붙인 값 (가중치 높음)
+    title_tokens = models.TextField(blank=True)
+    # 부제목과 본문을 토큰으로 나눠 공백으로 이어붙인 값
+    body_tokens = models.TextField(blank=True)
+    # 검색 결과 스니펫(snippet)을 만들 때 사용하는 부제목 + 본문의 일반 텍스트
+    body_text = models.TextField(blank=True)
+
+    def __str__(self):
+        return f'SearchDocument for {self.post_id}'
+
+# SearchToken 모델: 토큰 -> 게시물 역색인(inverted index)
+# PostgreSQL이 아닌 DB(SQLite 등)에서 검색에 사용
+class SearchToken(models.Model):
+    # 토큰 (blog.search.tokenize 결과)
+    token = models.CharField(max_length=20)
+    # 토큰이 등장한 게시물
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # 점수: 필드별 가중치 × 등장 횟수의 합
+    weight = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.token} -> {self.post_id} ({self.weight})'
+
+    class Meta:
+        # 토큰으로 게시물을 찾는 조회에 쓰이는 (token, post) 유니크 인덱스
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'post'], name='blog_searchtoken_token_post_uniq'),
+        ]
+
+# RelatedPost 모델: 게시물마다 미리 계산해 둔 관련 게시물 상위 k개 (blog/related.py에서 생성/갱신)
+class RelatedPost(models.Model):
+    # 기준 게시물 (외래키 인덱스 대신 (post, rank) 유니크 제약의 인덱스를 사용)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_links', db_index=False)
+    # 관련 게시물 (이 게시물이 바뀌거나 삭제되면 이 행을 가진 게시물의 목록을 다시 계산)
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    # 순위 (0부터, 유사도가 높은 순)
+    rank = models.PositiveSmallIntegerField()
+    # 유사도 (태그 겹침과 본문 TF-IDF 코사인 유사도의 가중합, 0~1)
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # 상세 페이지에서 post로 거르고 rank 순서대로 한 번에 읽음
+            models.UniqueConstraint(fields=['post', 'rank'], name='blog_relatedpost_post_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id} -> {self.related_id} ({self.score:.3f})'
@@ -0,0 +1,205 @@
+"""
+커서(keyset) 기반 페이지 나누기
+
+?page=N 방식은 페이지마다 OFFSET과 COUNT(*) 쿼리가 필요해 뒤쪽 페이지일수록 느려짐
+대신 pk를 커서로 사용해 "이 pk보다 오래된/새로운 글 N+1개"만 조회하므로 어느 페이지든 비용이 같음
+- ?before=<pk> : pk보다 오래된 글 (Older)
+- ?after=<pk>  : pk보다 새로운 글 (Newer)
+pk는 생성 순서대로 증가하므로 created_at 순서와 같음
+"""
+import math
+
+from django.http import Http404
+from django.shortcuts import redirect
+
+# 예전 ?page=last 링크 (Paginator의 마지막 페이지 = 가장 오래된 글들)
+LAST_PAGE = 'last'
+
+
+def parse_cursor(value):
+    """
+    커서 값(pk)을 정수로 변환, 올바르지 않으면 None
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# 커서 방식 페이지 객체 (템플릿에서는 Django의 Page와 비슷하게 사용)
+class CursorPage:
+    def __init__(self, object_list, has_next, has_previous, query_params):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_page_url(self):
+        """
+        더 오래된 글 페이지의 쿼리스트링 (예: ?before=12)
+        """
+        if not self._has_next:
+            return ''
+        return self._build_url('before', self.object_list[-1].pk)
+
+    @property
+    def previous_page_url(self):
+        """
+        더 새로운 글 페이지의 쿼리스트링 (예: ?after=17)
+        """
+        if not self._has_previous:
+            return ''
+        return self._build_url('after', self.object_list[0].pk)
+
+    def _build_url(self, key, pk):
+        params = self._query_params.copy()
+        params.pop('before', None)
+        params.pop('after', None)
+        params[key] = pk
+        return f'?{params.urlencode()}'
+
+
+def _cursor_rows(request, queryset, per_page):
+    """
+    요청의 before/after 커서에 맞는 (per_page + 1개를 조회할 QuerySet, after, before)
+    """
+    after = parse_cursor(request.GET.get('after'))
+    before = parse_cursor(request.GET.get('before'))
+
+    if after is not None:
+        # 더 새로운 글: pk 오름차순으로 가져온 뒤 다시 최신순으로 뒤집음
+        return queryset.filter(pk__gt=after).order_by('pk')[:per_page + 1], after, before
+    if before is not None:
+        queryset = queryset.filter(pk__lt=before)
+    return queryset.order_by('-pk')[:per_page + 1], after, before
+
+
+def _cursor_page(request, rows, per_page, after, before):
+    if after is not None:
+        has_previous = len(rows) > per_page
+        object_list = rows[:per_page][::-1]
+        has_next = bool(object_list)
+    else:
+        has_next = len(rows) > per_page
+        object_list = rows[:per_page]
+        has_previous = before is not None and bool(object_list)
+
+    return CursorPage(object_list, has_next, has_previous, request.GET)
+
+
+def paginate_by_cursor(request, queryset, per_page):
+    """
+    요청의 before/after 커서에 맞는 한 페이지를 CursorPage로 반환
+    COUNT, OFFSET 없이 per_page + 1개만 조회해서 다음 페이지가 있는지 판단
+    """
+    rows, after, before = _cursor_rows(request, queryset, per_page)
+    return _cursor_page(request, list(rows), per_page, after, before)
+
+
+async def apaginate_by_cursor(request, queryset, per_page):
+    """
+    paginate_by_cursor의 비동기 버전 (비동기 뷰에서 사용)
+    """
+    rows, after, before = _cursor_rows(request, queryset, per_page)
+    return _cursor_page(request, [row async for row in rows], per_page, after, before)
+
+
+def _legacy_page(request):
+    """
+    ?page=N을 (나머지 쿼리 인자, 페이지 번호 또는 LAST_PAGE)로 바꿈
+    """
+    params = request.GET.copy()
+    page = params.pop('page')[-1]
+    if page == LAST_PAGE:
+        return params, LAST_PAGE
+    number = parse_cursor(page)
+    if number is None or number < 1:
+        raise Http404('잘못된 페이지 번호입니다.')
+    return params, number
+
+
+def _last_page_number(count, per_page):
+    # Paginator의 num_pages와 같음 (글이 없어도 1페이지)
+    return max(math.ceil(count / per_page), 1)
+
+
+def _page_cursors(queryset, per_page, number):
+    """
+    number번째 페이지 바로 앞 글의 pk를 조회할 QuerySet (1페이지면 None)
+    """
+    if number == 1:
+        return None
+    offset = (number - 1) * per_page
+    return queryset.prefetch_related(None).order_by('-pk').values_list('pk', flat=True)[offset - 1:offset]
+
+
+def _legacy_page_redirect(request, params, cursors):
+    if cursors is not None:
+        if not cursors:
+            raise Http404('페이지가 존재하지 않습니다.')
+        params['before'] = cursors[0]
+
+    if params:
+        return redirect(f'{request.path}?{params.urlencode()}')
+    return redirect(request.path)
+
+
+def legacy_page_redirect(request, queryset, per_page):
+    """
+    예전 ?page=N 링크를 같은 위치의 커서 URL로 리디렉션하는 응답을 반환 (?page가 없으면 None)
+    N번째 페이지 바로 앞 글의 pk를 한 번만 조회해서 ?before=<pk>로 바꿔줌
+    ?page=last는 Paginator와 같이 가장 오래된 글들이 있는 마지막 페이지 (게시물 수를 한 번 더 셈)
+    """
+    if 'page' not in request.GET:
+        return None
+
+    params, number = _legacy_page(request)
+    if number == LAST_PAGE:
+        number = _last_page_number(queryset.count(), per_page)
+    cursors = _page_cursors(queryset, per_page, number)
+    return _legacy_page_redirect(request, params, None if cursors is None else list(cursors))
+
+
+async def alegacy_page_redirect(request, queryset, per_page):
+    """
+    legacy_page_redirect의 비동기 버전 (비동기 뷰에서 사용)
+    """
+    if 'page' not in request.GET:
+        return None
+
+    params, number = _legacy_page(request)
+    if number == LAST_PAGE:
+        number = _last_page_number(await queryset.acount(), per_page)
+    cursors = _page_cursors(queryset, per_page, number)
+    return _legacy_page_redirect(request, params, None if cursors is None else [pk async for pk in cursors])
+
+
+# ListView에서 Paginator 대신 커서 방식 페이지 나누기를 사용하도록 하는 Mixin
+# paginate_by만큼씩 최신순(-pk)으로 보여줌
+class CursorPaginationMixin:
+    def get(self, request, *args, **kwargs):
+        response = legacy_page_redirect(request, self.get_queryset(), self.get_paginate_by(None))
+        if response is not None:
+            return response
+        return super().get(request, *args, **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_by_cursor(self.request, queryset, page_size)
+        # ListView가 기대하는 (paginator, page, object_list, is_paginated) 형태로 반환
+        return (None, page, page.object_list, page.has_other_pages())
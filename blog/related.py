@@ -0,0 +1,345 @@
+"""
+관련 게시물 (상세 페이지 하단의 '관련 글')
+
+- 게시물마다 태그 벡터(태그가 달렸으면 1)와 본문 TF-IDF 벡터(검색 색인 SearchDocument에 저장된 토큰)를 만들고
+  각각 길이를 1로 맞춘 뒤 가중치를 곱해 이어붙인 희소 행렬(scipy.sparse)로 계산
+  두 벡터의 내적 = TEXT_WEIGHT × 본문 코사인 유사도 + TAG_WEIGHT × 태그 코사인 유사도
+- 유사도는 CHUNK_SIZE개 게시물씩 행렬 곱으로 한꺼번에 구하고, 게시물마다 상위 RELATED_POSTS_COUNT개를
+  RelatedPost 테이블에 저장 (요청마다 모든 게시물과 비교하지 않고 상세 페이지는 (post, rank) 인덱스로 한 번에 읽음)
+- 게시물이나 태그가 바뀌면 백그라운드 작업으로 바뀐 게시물과, 목록에 영향을 받는 게시물만 다시 계산 (blog/tasks.py)
+- 만든 벡터(Corpus)는 프로세스(워커) 메모리에 두고, 다음 작업에서는 updated_at이 달라진 게시물의 행만 다시 만듦
+  (작업마다 전체 게시물의 토큰을 다시 읽어 행렬을 새로 만들지 않고, 게시물 수에 비례하는 행렬을 공유 캐시로 주고받지도 않음)
+  단어 목록과 IDF는 전체를 계산할 때 정하고 새 단어는 한 게시물에만 나온 단어의 IDF로 추가하므로 오래되면 조금씩 달라짐
+  -> CORPUS_MAX_AGE가 지나거나 build_related_posts 명령(전체 재계산)을 실행하면 IDF를 다시 계산
+"""
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils.html import strip_tags
+
+from .models import Post, RelatedPost
+from .search import BODY_WEIGHT, TITLE_WEIGHT, tokenize
+
+# 게시물마다 저장할 관련 게시물 수
+RELATED_POSTS_COUNT = 5
+# 이보다 유사도가 낮은 게시물은 관련 게시물로 보지 않음
+MIN_SCORE = 0.05
+# 유사도 가중치 (합이 1이면 유사도가 0~1)
+TEXT_WEIGHT = 0.6
+TAG_WEIGHT = 0.4
+# 한 번의 행렬 곱으로 유사도를 구할 게시물 수 (CHUNK_SIZE × 전체 게시물 수 크기의 배열을 만듦)
+CHUNK_SIZE = 256
+# 벡터 행렬에서 0이 아닌 값의 비율이 이보다 높으면 희소×밀집 행렬 곱을 사용
+# (단어 종류가 적어 벡터가 빽빽하면 희소×희소 곱보다 빠르고, 단어 종류가 많으면 희소×희소 곱이 빠름)
+DENSE_RATIO = 0.05
+# 프로세스에 둔 관련 게시물 계산용 벡터(Corpus)를 바뀐 행만 갱신해 쓰는 최대 시간(초), 지나면 IDF까지 전체를 다시 계산
+CORPUS_MAX_AGE = 60 * 60 * 24
+
+# 이 프로세스의 Corpus와 만든 시각(time.monotonic()), 여러 스레드가 동시에 갱신하지 않도록 잠금
+_corpus = None
+_corpus_built_at = 0.0
+_corpus_lock = threading.Lock()
+
+
+def post_terms(title_tokens, body_tokens):
+    """
+    게시물 하나의 토큰별 가중 등장 횟수 (제목/태그 토큰은 검색 색인과 같이 TITLE_WEIGHT배)
+    """
+    terms = {token: count * BODY_WEIGHT for token, count in Counter(body_tokens).items()}
+    for token, count in Counter(title_tokens).items():
+        terms[token] = terms.get(token, 0) + count * TITLE_WEIGHT
+    return terms
+
+
+def _post_tokens(post):
+    # 검색 색인(index_post)과 같은 방식으로 게시물을 토큰으로 나눔 (제목+태그 이름, 부제목+본문)
+    title_tokens = tokenize(post.title) + tokenize(' '.join(tag.name for tag in post.tags.all()))
+    return title_tokens, tokenize(f'{post.hook_text} {strip_tags(post.content_html)}')
+
+
+def _normalize_rows(matrix):
+    # 행마다 길이(L2 norm)를 1로 맞춤 (값이 없는 행은 그대로 0)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def _widen(matrix, columns):
+    # 열 수만 늘린 같은 행렬 (새 단어/태그가 추가되면 기존 행의 열 수를 맞춤)
+    return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], columns))
+
+
+def _term_matrix(documents, vocabulary):
+    """
+    [(제목 토큰, 본문 토큰), ...]의 행마다 토큰별 TF 희소 행렬 (vocabulary에 없는 토큰은 새 열로 추가)
+    """
+    indptr, indices, data = [0], [], []
+    for title_tokens, body_tokens in documents:
+        for token, count in post_terms(title_tokens, body_tokens).items():
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            # 자주 나오는 단어가 지나치게 큰 값을 갖지 않도록 로그를 씌운 등장 횟수(sublinear TF)
+            data.append(1 + math.log(count))
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary)),
+    )
+
+
+def _tag_matrix(tag_lists, tag_columns):
+    """
+    [[태그 pk, ...], ...]의 행마다 달린 태그가 1인 희소 행렬 (tag_columns에 없는 태그는 새 열로 추가)
+    """
+    rows, cols = [], []
+    for row, tag_ids in enumerate(tag_lists):
+        for tag_id in tag_ids:
+            rows.append(row)
+            cols.append(tag_columns.setdefault(tag_id, len(tag_columns)))
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(tag_lists), len(tag_columns)))
+
+
+def _idf(document_count, document_frequency):
+    # IDF: 여러 게시물에 흔하게 나오는 토큰일수록 작은 값
+    return np.log((1 + document_count) / (1 + document_frequency)) + 1
+
+
+def _weigh(term_matrix, tag_matrix, idf):
+    """
+    TF 행렬과 태그 행렬에 IDF와 가중치를 적용해서 행마다 길이를 맞춘 (본문 벡터, 태그 벡터)를 반환
+    """
+    term_matrix.data *= idf[term_matrix.indices]
+    return (
+        math.sqrt(TEXT_WEIGHT) * _normalize_rows(term_matrix),
+        math.sqrt(TAG_WEIGHT) * _normalize_rows(tag_matrix),
+    )
+
+
+# 전체 게시물의 유사도 계산용 벡터 (build_corpus()로 만들어 프로세스에 두고, load_corpus()는 바뀐 행만 다시 만듦)
+class Corpus:
+    def __init__(self, post_ids, versions, vocabulary, idf, document_count, tag_columns, text, tags):
+        # 행 번호 -> 게시물 pk
+        self.post_ids = np.asarray(post_ids, dtype=np.int64)
+        # 게시물 pk -> 행을 만들 때의 updated_at (만들어 둔 행이 최신인지 확인)
+        self.versions = versions
+        # 토큰 -> 본문 벡터의 열 번호, 열마다 IDF (IDF는 전체를 계산할 때의 게시물 수 document_count로 정함)
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.document_count = document_count
+        # 태그 pk -> 태그 벡터의 열 번호
+        self.tag_columns = tag_columns
+        # 행마다 길이를 1로 맞추고 가중치를 곱한 본문 TF-IDF 벡터, 태그 벡터 (CSR 희소 행렬)
+        self.text = text
+        self.tags = tags
+        self._index()
+
+    def _index(self):
+        # 게시물 pk -> 행 번호
+        self.rows = {int(post_id): row for row, post_id in enumerate(self.post_ids)}
+        # 행마다 [본문 TF-IDF, 태그] 벡터
+        self.vectors = sparse.hstack([self.text, self.tags], format='csr')
+        self.dense = self.vectors.nnz > DENSE_RATIO * self.vectors.shape[0] * self.vectors.shape[1]
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    def refresh(self, fresh=()):
+        """
+        게시물의 updated_at을 한 번의 쿼리로 비교해서, 바뀐(또는 새) 게시물과 fresh의 행만 게시물에서 직접 다시 만들고
+        삭제된 게시물의 행은 뺀 새 Corpus를 반환 (바뀐 것이 없으면 self)
+        """
+        versions = dict(Post.objects.order_by().values_list('pk', 'updated_at'))
+        stale = {post_id for post_id, version in versions.items() if post_id in fresh or self.versions.get(post_id) != version}
+        if not stale and len(versions) == len(self.versions):
+            return self
+
+        keep = [row for row, post_id in enumerate(self.post_ids.tolist()) if post_id in versions and post_id not in stale]
+        posts = list(Post.objects.filter(pk__in=stale).prefetch_related('tags'))
+        vocabulary, tag_columns = dict(self.vocabulary), dict(self.tag_columns)
+        term_matrix = _term_matrix([_post_tokens(post) for post in posts], vocabulary)
+        tag_matrix = _tag_matrix([[tag.pk for tag in post.tags.all()] for post in posts], tag_columns)
+        # IDF가 없는 새 토큰은 한 게시물에만 나온 토큰의 IDF를 사용
+        idf = np.concatenate([self.idf, np.full(len(vocabulary) - len(self.idf), _idf(self.document_count, 1))])
+        text, tags = _weigh(term_matrix, tag_matrix, idf)
+
+        post_ids = self.post_ids[keep].tolist() + [post.pk for post in posts]
+        return Corpus(
+            post_ids,
+            {post_id: versions[post_id] for post_id in post_ids},
+            vocabulary,
+            idf,
+            self.document_count,
+            tag_columns,
+            sparse.vstack([_widen(self.text[keep], len(vocabulary)), text], format='csr'),
+            sparse.vstack([_widen(self.tags[keep], len(tag_columns)), tags], format='csr'),
+        )
+
+    def similarities(self, rows):
+        """
+        rows(행 번호 목록)를 CHUNK_SIZE개씩 나눠 (행 번호 목록, 전체 게시물과의 유사도 배열)을 차례로 반환
+        자기 자신과의 유사도는 0으로 바꿈
+        """
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = np.asarray(rows[start:start + CHUNK_SIZE])
+            if self.dense:
+                scores = (self.vectors @ self.vectors[chunk].T.toarray()).T
+            else:
+                scores = (self.vectors[chunk] @ self.vectors.T).toarray()
+            scores[np.arange(len(chunk)), chunk] = 0
+            yield chunk, scores
+
+    def top_related(self, scores):
+        """
+        유사도 배열 한 행에서 상위 RELATED_POSTS_COUNT개의 [(게시물 pk, 유사도), ...] (유사도가 높은 순, 같으면 pk가 큰 순)
+        """
+        count = min(RELATED_POSTS_COUNT, len(scores))
+        if not count:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[scores[top] >= MIN_SCORE]
+        top = top[np.lexsort((-self.post_ids[top], -scores[top]))]
+        return [(int(self.post_ids[i]), round(float(scores[i]), 4)) for i in top]
+
+    def neighbours(self, rows):
+        """
+        rows(행 번호 목록)의 게시물마다 {게시물 pk: 상위 관련 게시물 목록}
+        """
+        result = {}
+        for chunk, scores in self.similarities(rows):
+            for row, row_scores in zip(chunk, scores):
+                result[int(self.post_ids[row])] = self.top_related(row_scores)
+        return result
+
+
+def build_corpus(fresh=()):
+    """
+    전체 게시물의 토큰/태그를 읽어 Corpus를 만듦 (IDF도 이때의 전체 게시물로 다시 계산)
+    토큰은 검색 색인(SearchDocument)에 저장된 값을 쓰고, fresh(방금 바뀐 게시물)와 아직 색인되지 않은 게시물만
+    게시물에서 직접 토큰으로 나눔 (색인 작업이 이 작업보다 늦게 실행될 수 있으므로)
+    """
+    indexed = Post.objects.order_by('pk').values_list(
+        'pk', 'updated_at', 'searchdocument__title_tokens', 'searchdocument__body_tokens',
+    )
+    documents, versions, missing = {}, {}, []
+    for post_id, updated_at, title_tokens, body_tokens in indexed.iterator(chunk_size=2000):
+        versions[post_id] = updated_at
+        if title_tokens is None or post_id in fresh:
+            documents[post_id] = ([], [])
+            missing.append(post_id)
+        else:
+            documents[post_id] = (title_tokens.split(), body_tokens.split())
+    for post in Post.objects.filter(pk__in=missing).prefetch_related('tags'):
+        documents[post.pk] = _post_tokens(post)
+
+    post_ids = list(documents)
+    rows = {post_id: row for row, post_id in enumerate(post_ids)}
+    vocabulary = {}
+    term_matrix = _term_matrix(list(documents.values()), vocabulary)
+    document_frequency = np.bincount(term_matrix.indices, minlength=len(vocabulary))
+
+    tag_lists = [[] for _ in post_ids]
+    links = Post.tags.through.objects.values_list('post_id', 'tag_id')
+    for post_id, tag_id in links.iterator(chunk_size=2000):
+        if post_id in rows:
+            tag_lists[rows[post_id]].append(tag_id)
+    tag_columns = {}
+    tag_matrix = _tag_matrix(tag_lists, tag_columns)
+
+    idf = _idf(len(post_ids), document_frequency)
+    text, tags = _weigh(term_matrix, tag_matrix, idf)
+    return Corpus(post_ids, versions, vocabulary, idf, len(post_ids), tag_columns, text, tags)
+
+
+def load_corpus(fresh=()):
+    """
+    이 프로세스의 Corpus에서 바뀐 게시물의 행만 다시 만들어 반환
+    아직 없거나(프로세스가 새로 시작됨) 만든 지 CORPUS_MAX_AGE가 지났으면 build_corpus()로 전체를 만듦
+    """
+    global _corpus, _corpus_built_at
+    with _corpus_lock:
+        if _corpus is None or time.monotonic() - _corpus_built_at > CORPUS_MAX_AGE:
+            _corpus, _corpus_built_at = build_corpus(fresh), time.monotonic()
+        else:
+            _corpus = _corpus.refresh(fresh)
+        return _corpus
+
+
+def clear_corpus():
+    """
+    이 프로세스의 Corpus를 버림 (다음 load_corpus()에서 전체를 다시 만듦)
+    """
+    global _corpus
+    with _corpus_lock:
+        _corpus = None
+
+
+def save_related(neighbours):
+    """
+    {게시물 pk: [(관련 게시물 pk, 유사도), ...]}를 저장하고 목록이 실제로 바뀐 게시물 pk 집합을 반환
+    (목록이 그대로인 게시물은 다시 쓰지 않음)
+    """
+    stored = defaultdict(list)
+    for post_id, related_id, score in (
+        RelatedPost.objects.filter(post_id__in=neighbours).order_by('post_id', 'rank').values_list('post_id', 'related_id', 'score')
+    ):
+        stored[post_id].append((related_id, score))
+
+    changed = {post_id for post_id, related in neighbours.items() if stored.get(post_id, []) != related}
+    if changed:
+        with transaction.atomic():
+            RelatedPost.objects.filter(post_id__in=changed).delete()
+            RelatedPost.objects.bulk_create([
+                RelatedPost(post_id=post_id, related_id=related_id, rank=rank, score=score)
+                for post_id in sorted(changed)
+                for rank, (related_id, score) in enumerate(neighbours[post_id])
+            ])
+    return changed
+
+
+def rebuild_related_posts():
+    """
+    모든 게시물의 관련 게시물을 (IDF도) 다시 계산하고 목록이 바뀐 게시물 pk 집합을 반환
+    """
+    global _corpus, _corpus_built_at
+    corpus = build_corpus()
+    with _corpus_lock:
+        _corpus, _corpus_built_at = corpus, time.monotonic()
+    changed = set()
+    rows = list(range(len(corpus)))
+    for start in range(0, len(rows), CHUNK_SIZE):
+        changed |= save_related(corpus.neighbours(rows[start:start + CHUNK_SIZE]))
+    return changed
+
+
+def update_related_posts(post_ids):
+    """
+    바뀐 게시물들(post_ids)의 관련 게시물과, 그 영향을 받는 다른 게시물의 목록만 다시 계산
+    - 바뀐 게시물이 목록에 들어 있는 게시물 (순위/유사도가 바뀌거나 빠질 수 있음)
+    - 바뀐 게시물과의 유사도가 지금 목록의 가장 낮은 유사도보다 높아진 게시물 (목록에 새로 들어옴)
+    목록이 바뀐 게시물 pk 집합과, 바뀐 게시물을 목록에 보여 주던 게시물 pk 집합(제목 등이 바뀌었을 수 있음)을 반환
+    삭제된 게시물의 pk는 무시 (RelatedPost는 함께 삭제되고, 그 게시물을 목록에 갖고 있던 게시물은 시그널에서 넘겨받음)
+    """
+    corpus = load_corpus(fresh=set(post_ids))
+    rows = [corpus.rows[post_id] for post_id in set(post_ids) if post_id in corpus.rows]
+    referencing = set(RelatedPost.objects.filter(related_id__in=post_ids).values_list('post_id', flat=True))
+
+    candidates = {}
+    for _, scores in corpus.similarities(rows):
+        best = scores.max(axis=0)
+        for row in np.flatnonzero(best >= MIN_SCORE):
+            candidates[int(corpus.post_ids[row])] = float(best[row])
+
+    thresholds = RelatedPost.objects.filter(post_id__in=candidates).values('post_id').annotate(
+        count=Count('pk'), lowest=Min('score'),
+    )
+    full = {row['post_id']: row['lowest'] for row in thresholds if row['count'] >= RELATED_POSTS_COUNT}
+    entering = {post_id for post_id, score in candidates.items() if score > full.get(post_id, MIN_SCORE - 1)}
+
+    affected = set(corpus.post_ids[rows].tolist()) | ((referencing | entering) & corpus.rows.keys())
+    changed = save_related(corpus.neighbours(sorted(corpus.rows[post_id] for post_id in affected)))
+    return changed, referencing
@@ -0,0 +1,203 @@
+"""
+블로그 게시물 검색
+
+- 제목, 태그 이름, 부제목, 본문을 2글자 단위(bigram) 토큰으로 나눠 색인
+  (띄어쓰기나 조사가 붙은 한국어 단어도 부분 일치로 찾을 수 있음)
+- 게시물/태그가 바뀔 때마다 해당 게시물만 다시 색인 (blog/signals.py)
+- SQLite 등에서는 SearchToken 역색인 테이블을, PostgreSQL에서는 GIN 인덱스를 건 full-text 검색을 사용
+"""
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .models import Post, SearchDocument, SearchToken
+
+# 제목/태그에서 나온 토큰은 부제목/본문보다 높은 점수를 받음
+TITLE_WEIGHT = 4
+BODY_WEIGHT = 1
+
+# 검색 결과 스니펫 길이 (일치 위치 앞/뒤로 보여줄 글자 수)
+SNIPPET_BEFORE = 60
+SNIPPET_AFTER = 140
+
+WORD_RE = re.compile(r'\w+')
+SPACE_RE = re.compile(r'\s+')
+
+
+def tokenize(text):
+    """
+    텍스트를 검색용 토큰 목록으로 변환
+    단어를 소문자로 바꾼 뒤 2글자씩 겹치게 잘라냄 (1글자 단어는 그대로 사용)
+    예: '파이썬 공부' -> ['파이', '이썬', '공부']
+    """
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def query_tokens(q):
+    """
+    검색어를 중복 없는 토큰 목록으로 변환 (순서 유지)
+    """
+    return list(dict.fromkeys(tokenize(q)))
+
+
+# SQLite 등 일반 DB용: SearchToken 역색인 테이블에서 토큰이 모두 일치하는 게시물을 점수 순으로 찾음
+class InvertedIndexBackend:
+    def update(self, post_id, weights):
+        SearchToken.objects.filter(post_id=post_id).delete()
+        SearchToken.objects.bulk_create([
+            SearchToken(post_id=post_id, token=token, weight=weight)
+            for token, weight in weights.items()
+        ])
+
+    def search(self, queryset, tokens):
+        # 역색인 조인을 먼저 토큰으로 걸러야 집계(Sum, Count)가 일치한 토큰에 대해서만 계산됨
+        return queryset.filter(searchtoken__token__in=tokens).annotate(
+            search_rank=Sum('searchtoken__weight'),
+            search_hits=Count('searchtoken'),
+        ).filter(search_hits=len(tokens)).order_by('-search_rank', '-pk')
+
+
+# PostgreSQL용: SearchDocument의 토큰 문자열에 대한 full-text 검색 (0015 마이그레이션의 GIN 인덱스 사용)
+class PostgresFullTextBackend:
+    def update(self, post_id, weights):
+        # SearchDocument만으로 검색하므로 역색인 테이블은 사용하지 않음
+        pass
+
+    def search(self, queryset, tokens):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        vector = postgres_search_vector('searchdocument__')
+        query = SearchQuery(' & '.join(f"'{token}'" for token in tokens), config='simple', search_type='raw')
+
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, query),
+        ).filter(search_vector=query).order_by('-search_rank', '-pk')
+
+
+def postgres_search_vector(prefix=''):
+    """
+    제목 토큰(가중치 A)과 본문 토큰(가중치 D)을 합친 tsvector 식
+    0015 마이그레이션의 GIN 인덱스와 같은 식이어야 인덱스가 사용됨
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector(f'{prefix}title_tokens', weight='A', config='simple')
+        + SearchVector(f'{prefix}body_tokens', weight='D', config='simple')
+    )
+
+
+def get_search_backend():
+    """
+    설정(BLOG_SEARCH_BACKEND)이나 DB 종류에 맞는 검색 백엔드를 반환
+    """
+    name = getattr(settings, 'BLOG_SEARCH_BACKEND', None)
+    if name is None:
+        name = 'postgres' if connection.vendor == 'postgresql' else 'inverted'
+
+    if name == 'postgres':
+        return PostgresFullTextBackend()
+    return InvertedIndexBackend()
+
+
+def index_post(post):
+    """
+    게시물 하나를 다시 색인 (SearchDocument와 검색 백엔드의 색인을 함께 갱신)
+    """
+    tag_names = [tag.name for tag in post.tags.all()]
+    title_tokens = tokenize(post.title) + tokenize(' '.join(tag_names))
+    body_text = SPACE_RE.sub(' ', f'{post.hook_text} {strip_tags(post.content_html)}').strip()
+    body_tokens = tokenize(body_text)
+
+    weights = Counter()
+    for token in title_tokens:
+        weights[token] += TITLE_WEIGHT
+    for token in body_tokens:
+        weights[token] += BODY_WEIGHT
+
+    with transaction.atomic():
+        SearchDocument.objects.update_or_create(
+            post_id=post.pk,
+            defaults={
+                'title_tokens': ' '.join(title_tokens),
+                'body_tokens': ' '.join(body_tokens),
+                'body_text': body_text,
+            },
+        )
+        get_search_backend().update(post.pk, weights)
+
+
+def reindex_posts(post_ids):
+    """
+    여러 게시물을 다시 색인 (태그 변경 등으로 여러 게시물이 영향을 받을 때 사용)
+    """
+    for post in Post.objects.filter(pk__in=post_ids).prefetch_related('tags'):
+        index_post(post)
+
+
+def search_posts(queryset, q):
+    """
+    검색어 q와 일치하는 게시물을 점수(search_rank)가 높은 순으로 반환
+    """
+    tokens = query_tokens(q)
+    if not tokens:
+        return queryset.none()
+    return get_search_backend().search(queryset, tokens)
+
+
+def attach_snippets(posts, q):
+    """
+    현재 페이지의 게시물에 검색어가 강조된 스니펫(search_snippet)을 붙임
+    페이지에 보이는 게시물의 본문 텍스트만 한 번의 쿼리로 가져옴
+    """
+    posts = list(posts)
+    body_texts = dict(
+        SearchDocument.objects.filter(post_id__in=[post.pk for post in posts]).values_list('post_id', 'body_text')
+    )
+    # 긴 검색어부터 강조되도록 길이 순으로 정렬
+    words = sorted(set(WORD_RE.findall(q.lower())), key=len, reverse=True)
+
+    for post in posts:
+        post.search_snippet = make_snippet(body_texts.get(post.pk, ''), words)
+
+
+def make_snippet(text, words):
+    """
+    text에서 검색어가 처음 나오는 부분을 잘라 검색어를 <mark>로 감싼 HTML을 반환
+    """
+    lowered = text.lower()
+    positions = [lowered.find(word) for word in words if word in lowered]
+    start = max(min(positions) - SNIPPET_BEFORE, 0) if positions else 0
+    end = start + SNIPPET_BEFORE + SNIPPET_AFTER
+    snippet = text[start:end]
+
+    if words:
+        pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+        parts = []
+        last = 0
+        for match in pattern.finditer(snippet):
+            parts.append(escape(snippet[last:match.start()]))
+            parts.append(f'<mark>{escape(match.group())}</mark>')
+            last = match.end()
+        parts.append(escape(snippet[last:]))
+        html = ''.join(parts)
+    else:
+        html = escape(snippet)
+
+    if start > 0:
+        html = '…' + html
+    if end < len(text):
+        html = html + '…'
+    return mark_safe(html)
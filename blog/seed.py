@@ -0,0 +1,159 @@
+"""
+성능 측정용 가짜 데이터 생성 (seed_data 명령)
+
+- 같은 seed이면 항상 같은 데이터를 만듦 (커밋 사이의 benchmark 결과를 비교할 수 있도록)
+- 게시물/뉴스/댓글은 export_corpus와 같은 형식의 레코드로 만들어 CorpusImporter로 넣음
+  (bulk_create, Markdown 렌더링, 검색 색인, 캐시 무효화를 가져오기와 같은 방식으로 처리)
+- 태그는 실제 블로그처럼 몇몇 태그에 게시물이 몰리도록 지프(Zipf) 분포로 고름
+"""
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.contrib.auth.models import User
+from django.db.models import Max
+from allauth.socialaccount.models import SocialAccount
+from news.models import NewsPost
+from .models import Comment, Post
+from .storage import upload_storage
+
+SEED_USER_PREFIX = 'seed_user_'
+# 작성 시각은 이 시각부터 2년 사이에 고르게 분포 (실행 시각과 관계없이 같은 데이터를 만들도록 고정)
+SEED_START = datetime(2023, 1, 1)
+# 시드 사용자 비밀번호 (benchmark에서 로그인해서 작성/수정 페이지를 측정할 때 사용)
+SEED_USER_PASSWORD = 'seed-password'
+
+WORDS = (
+    '장고 파이썬 데이터 서버 캐시 쿼리 인덱스 모델 템플릿 배포 성능 측정 요청 응답 경제 정치 사회 뉴스 '
+    '블로그 게시물 댓글 태그 카테고리 검색 이미지 파일 사용자 로그인 개발 테스트 운영 django python '
+    'cache query index model template deploy latency throughput request response postgres nginx gunicorn '
+    'worker queue signal middleware view url form admin static media markdown'
+).split()
+
+
+def _sentence(rng, min_words=6, max_words=16):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraph(rng):
+    return ' '.join(_sentence(rng) for _ in range(rng.randint(3, 8)))
+
+
+def make_markdown(rng):
+    """
+    제목, 문단, 목록, 코드 블록이 섞인 Markdown 본문
+    """
+    blocks = []
+    for section in range(rng.randint(1, 4)):
+        blocks.append(f'## {_sentence(rng, 2, 5)[:-1]}')
+        blocks.extend(_paragraph(rng) for _ in range(rng.randint(1, 3)))
+        if rng.random() < 0.4:
+            blocks.append('\n'.join(f'- {_sentence(rng, 3, 8)}' for _ in range(rng.randint(2, 5))))
+        if rng.random() < 0.2:
+            blocks.append(f'```python\nprint("{rng.choice(WORDS)}")\n```')
+    return '\n\n'.join(blocks)
+
+
+def _timestamp(rng, start, span_seconds):
+    created_at = start + timedelta(seconds=rng.randint(0, span_seconds))
+    return created_at, created_at + timedelta(seconds=rng.randint(0, 60 * 60 * 24 * 7))
+
+
+def create_seed_users(rng, count, social_ratio):
+    """
+    시드 사용자를 만들고 social_ratio 비율만큼 소셜 계정(Google)을 연결한 뒤 username 목록을 반환
+    """
+    usernames = [f'{SEED_USER_PREFIX}{i}' for i in range(count)]
+    password = make_password(SEED_USER_PASSWORD)
+    User.objects.bulk_create(
+        [User(username=username, email=f'{username}@example.com', password=password) for username in usernames],
+        ignore_conflicts=True,
+    )
+    # 첫 번째 시드 사용자는 게시물을 작성/수정할 수 있는 스태프
+    User.objects.filter(username=usernames[0]).update(is_staff=True)
+
+    users = User.objects.filter(username__in=usernames).order_by('pk')
+    SocialAccount.objects.bulk_create([
+        SocialAccount(
+            user=user,
+            provider='google',
+            uid=f'seed-{user.username}',
+            extra_data={'picture': f'https://example.com/avatar/{user.username}.png'},
+        )
+        for user in users
+        if rng.random() < social_ratio
+    ], ignore_conflicts=True)
+    return usernames
+
+
+def create_seed_files(rng, count):
+    """
+    첨부 파일로 쓸 CSV 파일을 만들고 저장된 이름 목록을 반환 (같은 내용은 내용 주소 저장소에 한 번만 저장됨)
+    """
+    names = []
+    for i in range(count):
+        rows = [','.join(rng.choices(WORDS, k=5)) for _ in range(rng.randint(50, 2000))]
+        names.append(upload_storage.save(f'seed-{i}.csv', ContentFile('\n'.join(rows).encode())))
+    return names
+
+
+def seed_records(rng, posts, news, comments, tags, categories, presses, usernames, files=()):
+    """
+    CorpusImporter에 넣을 레코드를 하나씩 만들어 반환하는 제너레이터
+    comments는 게시물 하나당 평균 댓글 수, files는 게시물 10%에 붙일 첨부 파일 이름 목록
+    """
+    span = 60 * 60 * 24 * 365 * 2
+
+    category_slugs = [f'seed-category-{i}' for i in range(categories)]
+    tag_slugs = [f'seed-tag-{i}' for i in range(tags)]
+    press_slugs = [f'seed-press-{i}' for i in range(presses)]
+    for label, slugs in (('blog.category', category_slugs), ('blog.tag', tag_slugs), ('news.press', press_slugs)):
+        for slug in slugs:
+            yield {'model': label, 'pk': None, 'fields': {'name': slug[5:], 'slug': slug}}
+
+    # 기존 데이터와 겹치지 않도록 가장 큰 pk 다음부터 사용
+    first_post = (Post.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+    first_news = (NewsPost.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+    first_comment = (Comment.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+    tag_weights = [1 / (i + 1) for i in range(tags)]
+
+    for pk in range(first_post, first_post + posts):
+        created_at, updated_at = _timestamp(rng, SEED_START, span)
+        yield {'model': 'blog.post', 'pk': pk, 'fields': {
+            'title': _sentence(rng, 2, 4)[:30],
+            'hook_text': _sentence(rng, 4, 10)[:100],
+            'content': make_markdown(rng),
+            'file_upload': rng.choice(files) if files and rng.random() < 0.1 else '',
+            'created_at': created_at.isoformat(),
+            'updated_at': updated_at.isoformat(),
+            'author': rng.choice(usernames),
+            'category': rng.choice(category_slugs) if category_slugs and rng.random() < 0.9 else None,
+            'tags': sorted(set(rng.choices(tag_slugs, tag_weights, k=rng.randint(0, 5)))) if tag_slugs else [],
+        }}
+
+    for pk in range(first_news, first_news + news):
+        created_at, updated_at = _timestamp(rng, SEED_START, span)
+        yield {'model': 'news.newspost', 'pk': pk, 'fields': {
+            'title': _sentence(rng, 2, 4)[:30],
+            'hook_text': _sentence(rng, 4, 10)[:100],
+            'content': '\n\n'.join(_paragraph(rng) for _ in range(rng.randint(2, 6))),
+            'file_upload': rng.choice(files) if files and rng.random() < 0.1 else '',
+            'created_at': created_at.isoformat(),
+            'updated_at': updated_at.isoformat(),
+            'author': rng.choice(usernames),
+            'category': rng.choice(press_slugs) if press_slugs else None,
+        }}
+
+    comment_pk = first_comment
+    for post_pk in range(first_post, first_post + posts):
+        for _ in range(rng.randint(0, comments * 2)):
+            created_at, modified_at = _timestamp(rng, SEED_START, span)
+            yield {'model': 'blog.comment', 'pk': comment_pk, 'fields': {
+                'post': post_pk,
+                'author': rng.choice(usernames),
+                'content': _sentence(rng),
+                'created_at': created_at.isoformat(),
+                'modified_at': modified_at.isoformat(),
+            }}
+            comment_pk += 1
@@ -0,0 +1,222 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from do_it_django_prj.page_cache import invalidate_cache_tags
+from .models import Post, Category, Tag, Comment, RelatedPost
+from .context_processors import invalidate_category_sidebar
+from .counters import UNCATEGORIZED_POSTS, adjust_category_count, adjust_count, adjust_counter
+from .tasks import schedule_index_posts, schedule_head_image_variants, schedule_related_posts
+from .avatars import invalidate_avatar_url
+from allauth.socialaccount.models import SocialAccount
+
+
+# Post나 Category가 저장/삭제되면 사이드바 카테고리 캐시를 무효화
+# 커밋 전에 다른 요청이 예전 데이터로 캐시를 다시 채울 수 있으므로 커밋 후에도 한 번 더 삭제
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sidebar_cache(sender, **kwargs):
+    invalidate_category_sidebar()
+    transaction.on_commit(invalidate_category_sidebar)
+
+
+def invalidate_pages(*tags):
+    """
+    태그에 의존하는 캐시된 페이지를 무효화 (커밋 후에도 한 번 더)
+    """
+    invalidate_cache_tags(*tags)
+    transaction.on_commit(lambda: invalidate_cache_tags(*tags))
+
+
+def invalidate_post_pages(post_ids):
+    """
+    게시물들의 상세 페이지와 게시물 목록 페이지 캐시를 무효화
+    """
+    invalidate_pages('blog.post-list', *(f'blog.post:{pk}' for pk in post_ids))
+
+
+# 게시물이 저장/삭제되면 그 게시물의 상세 페이지와 목록 페이지 캐시를 무효화
+# 카테고리별 게시물 수가 바뀌는 경우(생성, 삭제, 카테고리 변경)에만 사이드바가 있는 모든 페이지를 무효화
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_pages(sender, instance, created, **kwargs):
+    invalidate_post_pages([instance.pk])
+    if created or getattr(instance, '_loaded_category_id', None) != instance.category_id:
+        invalidate_pages('blog.sidebar')
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_pages(sender, instance, **kwargs):
+    invalidate_post_pages([instance.pk])
+    invalidate_pages('blog.sidebar')
+
+
+# 카테고리 이름은 사이드바와 게시물 카드에 표시되므로 사이드바가 있는 모든 페이지와 카드 조각 캐시를 무효화
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, **kwargs):
+    invalidate_pages('blog.sidebar', 'blog.taxonomy')
+
+
+def touch_posts(post_ids):
+    """
+    태그가 바뀐 게시물의 updated_at을 갱신 (updated_at을 키로 쓰는 카드/상세 헤더 조각 캐시가 다시 렌더링됨)
+    """
+    Post.objects.filter(pk__in=post_ids).update(updated_at=timezone.now())
+
+
+# 댓글이 바뀌면 그 게시물의 상세 페이지만 무효화
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    invalidate_pages(f'blog.post:{instance.post_id}')
+
+
+# 게시물이 저장되면 검색 색인 갱신, 관련 게시물 계산과 (head_image가 바뀌었으면) 파생 이미지 생성을 백그라운드 작업으로 실행
+@receiver(post_save, sender=Post)
+def schedule_post_jobs(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_index_posts([instance.pk])
+        schedule_related_posts([instance.pk])
+        schedule_head_image_variants(instance)
+
+
+# 게시물이 삭제되면 RelatedPost 행은 함께 삭제되므로, 이 게시물을 관련 글로 보여 주던 게시물을 기억해 두었다가 다시 계산
+@receiver(pre_delete, sender=Post)
+def remember_related_posts(sender, instance, **kwargs):
+    instance._related_post_ids = list(RelatedPost.objects.filter(related=instance).values_list('post_id', flat=True))
+
+
+@receiver(post_delete, sender=Post)
+def update_deleted_post_related_posts(sender, instance, **kwargs):
+    schedule_related_posts(getattr(instance, '_related_post_ids', []))
+
+
+# 게시물의 태그가 바뀌면 태그 이름이 포함된 검색 색인, 관련 게시물과 페이지 캐시를 갱신
+# reverse=True이면 tag.post_set 쪽에서 바꾼 경우로, instance가 Tag이고 pk_set이 게시물 pk
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_post_tags_search_index(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_index_posts([instance.pk])
+            schedule_related_posts([instance.pk])
+            touch_posts([instance.pk])
+            invalidate_post_pages([instance.pk])
+    elif action == 'pre_clear':
+        instance._search_post_ids = list(instance.post_set.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        schedule_index_posts(getattr(instance, '_search_post_ids', []))
+        schedule_related_posts(getattr(instance, '_search_post_ids', []))
+        touch_posts(getattr(instance, '_search_post_ids', []))
+        invalidate_post_pages(getattr(instance, '_search_post_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        schedule_index_posts(pk_set)
+        schedule_related_posts(pk_set)
+        touch_posts(pk_set)
+        invalidate_post_pages(pk_set)
+
+
+# 태그 이름이 바뀌거나 태그가 삭제되면 그 태그가 달린 게시물들을 다시 색인하고 페이지 캐시와 카드 조각 캐시를 무효화
+# 삭제된 경우에는 태그 벡터가 바뀌므로 관련 게시물도 다시 계산
+@receiver(post_save, sender=Tag)
+def update_tag_search_index(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        post_ids = list(instance.post_set.values_list('pk', flat=True))
+        schedule_index_posts(post_ids)
+        invalidate_post_pages(post_ids)
+        invalidate_pages('blog.taxonomy')
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tag_posts(sender, instance, **kwargs):
+    instance._search_post_ids = list(instance.post_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def update_deleted_tag_search_index(sender, instance, **kwargs):
+    schedule_index_posts(getattr(instance, '_search_post_ids', []))
+    schedule_related_posts(getattr(instance, '_search_post_ids', []))
+    invalidate_post_pages(getattr(instance, '_search_post_ids', []))
+    invalidate_pages('blog.taxonomy')
+
+
+# 댓글이 생성/삭제되면 게시물의 댓글 수를 F()로 증감 (raw: loaddata로 넣은 데이터는 reconcile_counters 명령으로 맞춤)
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_count(Post.objects.filter(pk=instance.post_id), 'comment_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    adjust_count(Post.objects.filter(pk=instance.post_id), 'comment_count', -1)
+
+
+# 게시물이 생성되거나 카테고리가 바뀌면 카테고리별 게시물 수(미분류 포함)를 F()로 증감
+# 바뀌기 전 카테고리는 DB에서 읽은 값(_loaded_category_id)을 사용하고, 모르면 reconcile_counters 명령에 맡김
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_category_count(instance.category_id, 1)
+    elif (
+        hasattr(instance, '_loaded_category_id')
+        and (update_fields is None or 'category' in update_fields)
+        and instance._loaded_category_id != instance.category_id
+    ):
+        adjust_category_count(instance._loaded_category_id, -1)
+        adjust_category_count(instance.category_id, 1)
+
+
+# 게시물이 삭제되면 태그 연결(through 행)은 m2m_changed 없이 함께 지워지므로 삭제 전에 태그 pk를 기억해 둠
+@receiver(pre_delete, sender=Post)
+def remember_post_tags(sender, instance, **kwargs):
+    instance._counted_tag_ids = list(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    adjust_category_count(getattr(instance, '_loaded_category_id', instance.category_id), -1)
+    adjust_count(Tag.objects.filter(pk__in=getattr(instance, '_counted_tag_ids', [])), 'post_count', -1)
+
+
+# 카테고리가 삭제되면 그 게시물들은 미분류가 되므로(SET_NULL, 시그널 없음) 삭제 전 게시물 수만큼 미분류 게시물 수를 늘림
+@receiver(pre_delete, sender=Category)
+def remember_category_posts(sender, instance, **kwargs):
+    instance._counted_post_count = instance.post_set.count()
+
+
+@receiver(post_delete, sender=Category)
+def count_deleted_category(sender, instance, **kwargs):
+    adjust_counter(UNCATEGORIZED_POSTS, getattr(instance, '_counted_post_count', 0))
+
+
+# 게시물의 태그 연결이 바뀌면 태그별 게시물 수를 F()로 증감
+# post_add의 pk_set에는 새로 연결된 pk만 들어오지만, remove는 연결되지 않은 pk도 들어오므로 지우기 전에 실제 연결을 확인
+# reverse=True이면 instance가 Tag이고 pk_set이 게시물 pk
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    source, target = ('tag_id', 'post_id') if reverse else ('post_id', 'tag_id')
+    links = sender.objects.filter(**{source: instance.pk})
+
+    if action == 'pre_remove':
+        instance._counted_link_ids = list(links.filter(**{f'{target}__in': pk_set}).values_list(target, flat=True))
+    elif action == 'pre_clear':
+        instance._counted_link_ids = list(links.values_list(target, flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        delta, pks = (1, pk_set) if action == 'post_add' else (-1, getattr(instance, '_counted_link_ids', []))
+        if reverse:
+            adjust_count(Tag.objects.filter(pk=instance.pk), 'post_count', delta * len(pks))
+        elif pks:
+            adjust_count(Tag.objects.filter(pk__in=pks), 'post_count', delta)
+
+
+# 소셜 계정이 연결/변경/삭제되면 해당 사용자의 아바타 URL 캐시와 아바타가 표시된 페이지 캐시를 삭제
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def invalidate_avatar_url_cache(sender, instance, **kwargs):
+    invalidate_avatar_url(instance.user_id)
+    transaction.on_commit(lambda: invalidate_avatar_url(instance.user_id))
+    invalidate_pages(f'blog.author:{instance.user_id}')
@@ -0,0 +1,124 @@
+"""
+첨부 파일(file_upload)용 내용 주소(content-addressed) 저장소
+
+- 업로드된 파일을 디스크에 쓰면서 SHA-256 해시를 계산하고, 같은 내용은 한 번만 저장
+  cas/<해시 앞 2자리>/<해시>/data        : 실제 파일 내용 (blob)
+  cas/<해시 앞 2자리>/<해시>/<파일명>    : blob의 하드 링크 (디스크 공간을 더 쓰지 않음)
+- 필드에 저장되는 이름은 'cas/ab/<해시>/보고서.pdf' 형태라서 get_file_name()/get_file_ext()와
+  다운로드 파일명(Content-Disposition), nginx의 X-Accel-Redirect 경로가 그대로 동작함
+- 같은 blob을 여러 게시물이 함께 쓰므로 delete()는 파일을 지우지 않고,
+  어떤 게시물도 참조하지 않는 파일은 `python manage.py gc_uploads`로 정리
+- 예전 경로(blog/files/%Y/%m/%d/...)에 저장된 파일은 그대로 읽을 수 있음
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+from django.utils.deconstruct import deconstructible
+
+CAS_DIR = 'cas'
+BLOB_NAME = 'data'
+# 업로드 중인 임시 파일 위치 (blob과 같은 파일 시스템이어야 os.replace로 옮길 수 있음)
+TMP_DIR = os.path.join(CAS_DIR, 'tmp')
+
+
+def blob_dir_name(digest):
+    return f'{CAS_DIR}/{digest[:2]}/{digest}'
+
+
+@deconstructible(path='blog.storage.ContentAddressedStorage')
+class ContentAddressedStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        """
+        파일 내용을 해시해서 blob으로 저장하고 필드에 저장할 이름('cas/ab/<해시>/<파일명>')을 반환
+        upload_to의 날짜 폴더는 사용하지 않고 파일명만 남김
+        """
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        validate_file_name(name, allow_relative_path=True)
+
+        digest = self._write_blob(content)
+        filename = self._fit_filename(os.path.basename(name), digest, max_length)
+        name = f'{blob_dir_name(digest)}/{filename}'
+        self._link(f'{blob_dir_name(digest)}/{BLOB_NAME}', name)
+
+        validate_file_name(name, allow_relative_path=True)
+        return name
+
+    def delete(self, name):
+        """
+        다른 게시물이 같은 파일을 참조할 수 있으므로 지우지 않음 (gc_uploads 명령이 정리)
+        예전 경로의 파일은 기존처럼 삭제
+        """
+        if not name.startswith(f'{CAS_DIR}/'):
+            super().delete(name)
+
+    def _write_blob(self, content):
+        # 임시 파일에 쓰면서 해시를 계산하고, 처음 보는 내용이면 blob 위치로 옮김
+        tmp_dir = self.path(TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        sha256 = hashlib.sha256()
+
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+            try:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+
+        digest = sha256.hexdigest()
+        blob = self.path(f'{blob_dir_name(digest)}/{BLOB_NAME}')
+        if os.path.exists(blob):
+            os.unlink(tmp.name)
+            # 이미 있는 blob을 다시 쓰면 수정 시각을 갱신해서 gc_uploads가 아직 커밋되지 않은 업로드의 파일을 지우지 않게 함
+            os.utime(blob)
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp.name, self.file_permissions_mode)
+            # 같은 내용이 동시에 올라와도 내용이 같으므로 어느 쪽이 덮어써도 됨
+            os.replace(tmp.name, blob)
+        return digest
+
+    def _link(self, blob_name, name):
+        # 파일명 링크가 없으면 blob의 하드 링크를 만듦 (하드 링크를 지원하지 않으면 복사)
+        # 파일명이 'data'이면 blob을 그대로 사용
+        if name == blob_name:
+            return
+        if self.exists(name):
+            # 복사본으로 만든 링크도 gc_uploads의 대기 시간 동안 지워지지 않도록 수정 시각을 갱신
+            os.utime(self.path(name))
+            return
+        try:
+            os.link(self.path(blob_name), self.path(name))
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(self.path(blob_name), self.path(name))
+
+    def _fit_filename(self, filename, digest, max_length):
+        # 필드의 max_length를 넘지 않도록 확장자는 남기고 파일명 앞부분만 남김
+        if max_length is None:
+            return filename
+
+        available = max_length - len(blob_dir_name(digest)) - 1
+        if len(filename) <= available:
+            return filename
+        stem, ext = os.path.splitext(filename)
+        return stem[:max(available - len(ext), 1)] + ext
+
+
+# Post, NewsPost의 file_upload가 함께 쓰는 저장소 (MEDIA_ROOT를 그대로 사용)
+upload_storage = ContentAddressedStorage()
@@ -0,0 +1,105 @@
+"""
+게시물 태그 입력 처리
+
+PostCreate/PostUpdate에서 입력받은 tags_str을 Tag 객체로 바꿔 게시물에 연결
+- 입력값을 정리(공백 정리, 길이 제한)하고 대소문자 구분 없이 중복 제거
+- 기존 태그는 한 번의 쿼리로 조회하고, 없는 태그만 bulk_create로 한 번에 생성
+- 게시물과의 연결도 한 번의 M2M insert로 처리
+"""
+import re
+from collections import namedtuple
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+from .models import Tag
+
+# 태그 구분자 (콤마 또는 세미콜론)
+TAG_SEPARATOR_RE = re.compile(r'[,;]')
+SPACE_RE = re.compile(r'\s+')
+
+# Tag.name 최대 길이
+TAG_NAME_MAX_LENGTH = Tag._meta.get_field('name').max_length
+
+# 게시물 태그를 바꾼 결과 (추가된 태그, 삭제된 태그 목록)
+TagChanges = namedtuple('TagChanges', ['added', 'removed'])
+
+
+def parse_tags(tags_str):
+    """
+    'python, 파이썬 공부; Python' 같은 입력을 정리된 태그 이름 목록으로 변환
+    - 콤마/세미콜론으로 나누고 앞뒤 공백 제거, 연속 공백은 하나로
+    - Tag.name 길이(20자)에 맞게 자르고, 슬러그를 만들 수 없는 이름은 제외
+    - 대소문자만 다른 이름은 처음 나온 것만 사용 (순서 유지)
+    """
+    names = {}
+    for name in TAG_SEPARATOR_RE.split(tags_str or ''):
+        name = SPACE_RE.sub(' ', name).strip()[:TAG_NAME_MAX_LENGTH].strip()
+        if name and slugify(name, allow_unicode=True):
+            names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def get_or_create_tags(names):
+    """
+    태그 이름 목록에 해당하는 Tag 객체 목록을 반환 (없는 태그는 생성, 순서 유지)
+    이름이 같거나 슬러그가 같은 기존 태그가 있으면 그 태그를 사용
+    동시에 같은 태그를 만드는 요청이 있어도 ignore_conflicts로 IntegrityError 없이 처리
+    """
+    if not names:
+        return []
+
+    slugs = {name: slugify(name, allow_unicode=True) for name in names}
+    lookup = Q(name__in=names) | Q(slug__in=slugs.values())
+    tags = _match_tags(names, slugs, Tag.objects.filter(lookup))
+
+    missing = [name for name in names if name not in tags]
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=slugs[name]) for name in missing],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts를 쓰면 pk가 채워지지 않으므로 다시 조회 (다른 요청이 먼저 만든 태그도 함께 찾음)
+        lookup = Q(name__in=missing) | Q(slug__in=[slugs[name] for name in missing])
+        tags.update(_match_tags(missing, slugs, Tag.objects.filter(lookup)))
+
+    # 같은 태그로 모인 이름이 여러 개일 수 있으므로 중복 제거
+    return list({tags[name].pk: tags[name] for name in names if name in tags}.values())
+
+
+def _match_tags(names, slugs, queryset):
+    """
+    조회한 태그를 이름 -> Tag로 연결 (이름이 같은 태그를 우선, 없으면 슬러그가 같은 태그)
+    """
+    by_name = {}
+    by_slug = {}
+    for tag in queryset:
+        by_name[tag.name] = tag
+        by_slug[tag.slug] = tag
+
+    matched = {}
+    for name in names:
+        tag = by_name.get(name) or by_slug.get(slugs[name])
+        if tag is not None:
+            matched[name] = tag
+    return matched
+
+
+def set_post_tags(post, tags_str, clear=False):
+    """
+    tags_str의 태그를 게시물에 연결하고 TagChanges(added, removed)를 반환
+    clear=True이면 입력에 없는 기존 태그는 게시물에서 제거 (수정 화면)
+    """
+    tags = get_or_create_tags(parse_tags(tags_str))
+    current = {tag.pk: tag for tag in post.tags.all()}
+    new_pks = {tag.pk for tag in tags}
+
+    added = [tag for tag in tags if tag.pk not in current]
+    removed = [tag for pk, tag in current.items() if pk not in new_pks] if clear else []
+
+    if removed:
+        post.tags.remove(*removed)
+    if added:
+        post.tags.add(*added)
+
+    return TagChanges(added, removed)
@@ -0,0 +1,128 @@
+"""
+blog 앱의 백그라운드 작업 (jobs.queue)
+
+게시물 저장 요청 안에서 하기에는 무거운 작업을 워커에서 실행
+- 검색 색인 갱신
+- head_image 파생 이미지 생성
+- 관련 게시물 계산
+"""
+import threading
+
+from django.apps import apps
+from django.db import transaction
+from django.utils import timezone
+from jobs.queue import enqueue, task
+from do_it_django_prj.page_cache import invalidate_cache_tags
+from .images import IMAGE_MODELS, delete_image_variants
+from .models import Post
+from .related import rebuild_related_posts, update_related_posts
+from .search import index_post
+
+# 트랜잭션이 커밋될 때 한 번에 관련 게시물을 다시 계산할 게시물 pk (스레드마다 따로 모음)
+_pending_related = threading.local()
+
+
+@task('blog.index_post')
+def index_post_task(post_id):
+    """
+    게시물 하나를 다시 색인 (실행 시점의 최신 데이터 사용, 그 사이 삭제됐으면 아무것도 하지 않음)
+    """
+    post = Post.objects.prefetch_related('tags').filter(pk=post_id).first()
+    if post is not None:
+        index_post(post)
+
+
+@task('blog.build_head_image_variants')
+def build_head_image_variants(model, pk):
+    """
+    게시물(Post, NewsPost)의 head_image 파생 이미지를 만들고 해당 페이지 캐시를 무효화
+    """
+    model_class = apps.get_model(model)
+    post = model_class.objects.only('pk', 'head_image', 'head_image_variants').filter(pk=pk).first()
+    if post is None or not post.refresh_head_image_variants():
+        return
+
+    # 그 사이 이미지가 다시 바뀌었으면 이 결과는 버림 (바뀐 이미지에 대한 작업이 따로 실행됨)
+    # updated_at도 갱신해서 updated_at을 키로 쓰는 조각 캐시(목록 카드, 상세 이미지)가 새 이미지로 다시 렌더링되게 함
+    updated = model_class.objects.filter(pk=pk, head_image=post.head_image.name or '').update(
+        head_image_variants=post.head_image_variants,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        delete_image_variants(post.head_image_variants)
+        return
+
+    detail_tag, list_tag = IMAGE_MODELS[model]
+    invalidate_cache_tags(detail_tag.format(pk), list_tag)
+
+
+@task('blog.update_related_posts')
+def update_related_posts_task(post_ids):
+    """
+    바뀐 게시물들과 영향을 받는 게시물의 관련 게시물을 다시 계산하고, 관련 글 목록이 달라진 상세 페이지 캐시를 무효화
+    """
+    changed, referencing = update_related_posts(post_ids)
+    invalidate_cache_tags(*(f'blog.post:{pk}' for pk in changed | referencing))
+
+
+@task('blog.rebuild_related_posts', timeout=60 * 60)
+def rebuild_related_posts_task():
+    """
+    모든 게시물의 관련 게시물을 다시 계산 (대량 가져오기 뒤 등, 게시물이 많으면 기본 제한 시간보다 오래 걸리므로 한 시간)
+    """
+    changed = rebuild_related_posts()
+    invalidate_cache_tags(*(f'blog.post:{pk}' for pk in changed))
+
+
+def schedule_index_posts(post_ids):
+    """
+    게시물들의 검색 색인 갱신 작업을 추가 (같은 게시물의 작업이 대기 중이면 하나로 합쳐짐)
+    """
+    for post_id in post_ids:
+        enqueue('blog.index_post', key=f'blog.index_post:{post_id}', post_id=post_id)
+
+
+def schedule_related_posts(post_ids):
+    """
+    게시물들의 관련 게시물 갱신 작업을 트랜잭션이 커밋될 때 추가 (트랜잭션 밖이면 바로 추가)
+    한 트랜잭션 안에서 여러 번 호출해도 (예: 게시물 저장 + 태그 변경) 게시물 pk를 모아 작업 하나로 추가
+    롤백된 트랜잭션에서 모은 pk는 버리지 않고 다음에 추가하는 작업에 함께 넣음 (다시 계산해도 결과는 같음)
+    """
+    post_ids = set(post_ids)
+    if not post_ids:
+        return
+    if not hasattr(_pending_related, 'post_ids'):
+        _pending_related.post_ids = set()
+    _pending_related.post_ids |= post_ids
+    transaction.on_commit(_enqueue_related_posts)
+
+
+def _enqueue_related_posts():
+    # 먼저 실행된 콜백이 모아 둔 pk를 모두 가져가므로 같은 트랜잭션의 나머지 콜백은 아무것도 하지 않음
+    post_ids = sorted(getattr(_pending_related, 'post_ids', ()))
+    _pending_related.post_ids = set()
+    if post_ids:
+        # 게시물 하나의 작업은 대기 중인 같은 작업과 하나로 합쳐짐
+        key = f'blog.update_related_posts:{post_ids[0]}' if len(post_ids) == 1 else ''
+        enqueue('blog.update_related_posts', key=key, post_ids=post_ids)
+
+
+def schedule_rebuild_related_posts():
+    """
+    모든 게시물의 관련 게시물을 다시 계산하는 작업을 추가
+    """
+    enqueue('blog.rebuild_related_posts', key='blog.rebuild_related_posts')
+
+
+def schedule_head_image_variants(instance):
+    """
+    head_image가 바뀐 게시물(Post, NewsPost)의 파생 이미지 생성 작업을 추가
+    """
+    if instance.head_image_variants_stale():
+        model = instance._meta.label
+        enqueue(
+            'blog.build_head_image_variants',
+            key=f'blog.build_head_image_variants:{model}:{instance.pk}',
+            model=model,
+            pk=instance.pk,
+        )
@@ -0,0 +1,11 @@
+from django import template
+from ..avatars import avatar_url_for
+
+register = template.Library()
+
+
+# 사용자의 아바타 URL을 반환하는 필터
+# 예: <img src="{{ user|avatar_url }}">
+@register.filter
+def avatar_url(user):
+    return avatar_url_for(user)
@@ -0,0 +1,13 @@
+from django import template
+from do_it_django_prj.page_cache import get_last_invalidated
+
+register = template.Library()
+
+
+# 게시물 카드/상세 헤더 조각 캐시 키에 넣을 태그/카테고리 버전
+# 태그/카테고리 이름이 바뀌거나 삭제되면 시그널에서 무효화하는 'blog.taxonomy' 태그의 시각 (blog/signals.py)
+# 페이지마다 한 번만 조회하도록 반복문 밖에서 사용
+# 예: {% post_card_version as card_version %}
+@register.simple_tag
+def post_card_version():
+    return get_last_invalidated(['blog.taxonomy'])
@@ -1,10 +1,37 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, AsyncClient, override_settings
 from django.contrib.auth.models import User
-from .models import Post, Category, Tag, Comment
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from do_it_django_prj.query_stats import QueryStats, query_shape
+from prometheus_client import REGISTRY
+from do_it_django_prj.testing import QueryCountTestMixin, QueryPlanTestMixin
+from .models import Post, Category, Tag, Comment, MARKDOWN_RENDER_VERSION
+from news.models import NewsPost, Press
+from .search import search_posts
+from allauth.socialaccount.models import SocialAccount
 from bs4 import BeautifulSoup
 
+from io import StringIO, BytesIO
+from unittest import mock
+from PIL import Image
+from urllib.parse import quote
+import gzip
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
 # 테스트 케이스 클래스 정의
-class TestView(TestCase):
+class TestView(QueryCountTestMixin, QueryPlanTestMixin, TestCase):
     def setUp(self):
         """
         테스트가 실행되기 전에 필요한 데이터와 객체들을 세팅합니다.
@@ -286,3 +313,1198 @@ class TestView(TestCase):
         new_post = Post.objects.latest('created_at')
         self.assertEqual(new_post.title, '새 게시물')
         self.assertIn(self.tag_python, new_post.tags.all())
+
+    def test_content_html(self):
+        """
+        게시물 저장 시 마크다운이 미리 렌더링되어 저장되고, content가 바뀔 때만 다시 렌더링되는지 테스트합니다.
+        """
+        # 생성 시점에 렌더링된 HTML과 렌더러 버전이 저장되는지 확인
+        post = Post.objects.get(pk=self.post1.pk)
+        self.assertEqual(post.content_html, '<p>마바사</p>')
+        self.assertEqual(post.content_html_version, MARKDOWN_RENDER_VERSION)
+
+        # content가 바뀌면 다시 렌더링되는지 확인
+        post.content = '# 제목'
+        post.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).content_html, '<h1>제목</h1>')
+
+        # 렌더러 버전이 오래된 게시물은 rerender_markdown 명령으로 다시 렌더링되는지 확인
+        Post.objects.filter(pk=post.pk).update(content_html='', content_html_version=0)
+        call_command('rerender_markdown', stdout=StringIO())
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.content_html, '<h1>제목</h1>')
+        self.assertEqual(post.content_html_version, MARKDOWN_RENDER_VERSION)
+
+    def test_post_list_excerpt(self):
+        """
+        목록 페이지가 저장된 excerpt를 사용하고, 본문(content, content_html) 컬럼은 조회하지 않는지 테스트합니다.
+        """
+        # excerpt는 content_html을 태그가 닫힌 HTML로 잘라 저장
+        long_post = Post.objects.create(
+            title='긴 글',
+            content='**' + ' '.join(['단어'] * 100) + '**',
+            author=self.user_trump,
+        )
+        self.assertTrue(long_post.excerpt.startswith('<p><strong>단어 단어'))
+        self.assertTrue(long_post.excerpt.endswith('…</strong></p>'))
+
+        for url in ['/blog/', self.tag_hello.get_absolute_url(), self.category_politic.get_absolute_url(),
+                    '/blog/category/no_category', '/blog/search/가나', '/']:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+            for query in queries.captured_queries:
+                self.assertNotIn('"blog_post"."content"', query['sql'], url)
+                self.assertNotIn('"blog_post"."content_html"', query['sql'], url)
+
+    def test_post_list_query_count(self):
+        """
+        목록/상세 페이지의 쿼리 수가 게시물, 태그, 댓글 수와 상관없이 일정한지 테스트합니다. (N+1 쿼리 방지)
+        """
+        def create_posts(count=3):
+            # 게시물을 더 만들면 페이지 크기 5를 넘기고, 태그와 댓글 작성자도 늘어남
+            for i in range(count):
+                post = Post.objects.create(
+                    title=f'쿼리 테스트 {Post.objects.count()}',
+                    content='내용',
+                    author=self.user_obama,
+                    category=self.category_society,
+                )
+                tag = Tag.objects.create(name=f'쿼리 태그 {post.pk}', slug=f'query-tag-{post.pk}')
+                post.tags.add(self.tag_hello, self.tag_python, tag)
+
+        def add_comments(count=3):
+            # 상세 페이지의 게시물에 댓글과 (소셜 계정이 있거나 없는) 댓글 작성자를 늘림
+            for i in range(count):
+                author = User.objects.create_user(
+                    username=f'commenter_{User.objects.count()}', email=f'commenter_{i}@example.com'
+                )
+                if i % 2 == 0:
+                    SocialAccount.objects.create(user=author, provider='google', uid=author.username)
+                Comment.objects.create(post=self.post1, author=author, content='댓글')
+
+        urls = ['/blog/', self.tag_hello.get_absolute_url(), self.category_society.get_absolute_url(),
+                '/blog/search/쿼리', '/']
+        create_posts(2)
+        self.assertQueryCountConstant(urls, create_posts)
+        add_comments(1)
+        self.assertQueryCountConstant([self.post1.get_absolute_url()], add_comments)
+
+        def create_news(count=3):
+            # 뉴스와 언론사, 작성자를 늘림
+            for i in range(count):
+                press = Press.objects.create(name=f'언론사 {Press.objects.count()}', slug=f'press-{Press.objects.count()}')
+                author = User.objects.create_user(username=f'reporter_{User.objects.count()}')
+                NewsPost.objects.create(title=f'뉴스 {i}', content='내용', author=author, category=press)
+
+        create_news(2)
+        press = Press.objects.first()
+        self.assertQueryCountConstant(['/news/', press.get_absolute_url(), NewsPost.objects.first().get_absolute_url()],
+                                      create_news)
+
+    def test_metrics(self):
+        """
+        /metrics가 URL 이름별 요청 수/응답 시간, DB 시간, 캐시 적중 수를 내부 요청에만 보여주고,
+        multiprocess 모드에서 여러 프로세스의 값을 합치는지 테스트합니다.
+        """
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        requests = sample('django_http_requests_total', method='GET', view='blog:post_detail', status='200')
+        latency = sample('django_http_request_duration_seconds_count', method='GET', view='blog:post_detail')
+        db = sample('django_db_duration_seconds_count', view='blog:post_detail')
+        not_found = sample('django_http_requests_total', method='GET', view='<unresolved>', status='404')
+        page_hits = sample('django_app_cache_requests_total', cache='page', result='hit')
+        page_misses = sample('django_app_cache_requests_total', cache='page', result='miss')
+
+        self.client.get(self.post1.get_absolute_url())
+        self.client.get(self.post1.get_absolute_url())
+        self.client.get('/없는-주소/')
+
+        self.assertEqual(
+            sample('django_http_requests_total', method='GET', view='blog:post_detail', status='200'), requests + 2)
+        self.assertEqual(
+            sample('django_http_request_duration_seconds_count', method='GET', view='blog:post_detail'), latency + 2)
+        self.assertEqual(sample('django_db_duration_seconds_count', view='blog:post_detail'), db + 2)
+        self.assertEqual(
+            sample('django_http_requests_total', method='GET', view='<unresolved>', status='404'), not_found + 1)
+        self.assertEqual(sample('django_app_cache_requests_total', cache='page', result='miss'), page_misses + 1)
+        self.assertEqual(sample('django_app_cache_requests_total', cache='page', result='hit'), page_hits + 1)
+
+        # 내부(METRICS_ALLOWED_IPS) 요청만 Prometheus 텍스트 형식으로 응답하고, /metrics 요청 자체는 기록하지 않음
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('django_http_request_duration_seconds_bucket{', response.content.decode())
+        self.assertNotIn('view="metrics"', response.content.decode())
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 404)
+        with self.settings(METRICS_ALLOWED_IPS=['10.0.0.0/8']):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code, 200)
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+        # gunicorn 워커처럼 프로세스 두 개가 같은 디렉터리에 기록한 값을 합쳐서 보여줌
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=metrics_dir)
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, '-c', 'from do_it_django_prj.metrics import count_cache; count_cache("page", hits=3)'],
+                env=env, check=True,
+            )
+        with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': metrics_dir}):
+            response = self.client.get('/metrics')
+        self.assertIn('django_app_cache_requests_total{cache="page",result="hit"} 6.0', response.content.decode())
+
+    def test_async_views(self):
+        """
+        ASGI용 URL 설정(async_urls)의 비동기 뷰가 동기 뷰와 같은 페이지를 반환하고,
+        조건부 GET, 페이지 캐시, 쿼리 측정 미들웨어가 비동기로 동작하는지 테스트합니다.
+        """
+        press = Press.objects.create(name='조선일보', slug='chosun')
+        news_post = NewsPost.objects.create(title='뉴스', content='뉴스 내용', author=self.user_obama, category=press)
+        NewsPost.objects.create(title='미분류 뉴스', content='내용', author=self.user_trump)
+        Comment.objects.create(post=self.post1, author=self.user_trump, content='두 번째 댓글')
+
+        urls = [
+            '/', '/blog/', f'/blog/?before={self.post3.pk}', self.post1.get_absolute_url(),
+            self.tag_hello.get_absolute_url(), self.category_politic.get_absolute_url(), '/blog/category/no_category',
+            '/news/', news_post.get_absolute_url(), press.get_absolute_url(), '/news/category/no_category',
+        ]
+        for url in urls:
+            match = resolve(url.split('?')[0], urlconf='do_it_django_prj.async_urls')
+            self.assertTrue(iscoroutinefunction(match.func), url)
+
+        async_client = AsyncClient()
+
+        def async_get(url, **extra):
+            with self.settings(ROOT_URLCONF='do_it_django_prj.async_urls'):
+                return async_to_sync(async_client.get)(url, **extra)
+
+        for url in urls:
+            cache.clear()
+            sync_response = self.client.get(url)
+            cache.clear()
+            response = async_get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.content.decode(), sync_response.content.decode(), url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+
+            # 다음 요청부터는 페이지 캐시에서, (조건부 GET을 지원하는 페이지는) 같은 ETag로 요청하면 304
+            # (캐시를 비운 직후에는 첫 요청에서 태그 무효화 시각을 새로 기록하므로 두 번째 렌더링부터 캐시됨)
+            async_get(url)
+            self.assertEqual(async_get(url)['X-Cache'], 'HIT', url)
+            if sync_response.has_header('ETag'):
+                cache.clear()
+                response = async_get(url)
+                self.assertEqual(async_get(url, headers={'If-None-Match': response['ETag']}).status_code, 304, url)
+
+        # 예전 ?page=N 링크는 커서 URL로 리디렉션 (없는 페이지는 404)
+        response = async_get('/blog/?page=1')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], '/blog/')
+        self.assertEqual(async_get('/blog/99999').status_code, 404)
+        self.assertEqual(async_get('/blog/?page=2').status_code, 404)
+        # 글이 한 페이지뿐이면 ?page=last도 첫 페이지
+        self.assertEqual(async_get('/blog/?page=last')['Location'], '/blog/')
+
+        # 스태프에게는 비동기 ORM에서 실행된 쿼리까지 센 Server-Timing 헤더를 붙임
+        async_client.force_login(self.user_trump)
+        response = async_get(self.post1.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.post1.title, response.content.decode())
+        queries = int(re.search(r'desc="(\d+) queries', response['Server-Timing']).group(1))
+        self.assertGreater(queries, 3)
+
+    def test_query_stats(self):
+        """
+        쿼리 측정 미들웨어가 스태프에게만 Server-Timing 헤더를 붙이고, 같은 모양의 쿼리 반복을 경고하는지 테스트합니다.
+        """
+        # 값만 다른 쿼리는 같은 모양으로 묶임
+        self.assertEqual(
+            query_shape('SELECT * FROM "blog_post" WHERE "id" = 1 AND "title" = \'a\'\'b\''),
+            query_shape('SELECT * FROM "blog_post" WHERE "id" = 22 AND "title" = \'c\''),
+        )
+        self.assertEqual(
+            query_shape('SELECT * FROM "blog_tag" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT * FROM "blog_tag" WHERE "id" IN (...)',
+        )
+
+        stats = QueryStats()
+        with stats.capture():
+            for post in Post.objects.all():
+                post.tags.count()
+        self.assertEqual(stats.count, 4)
+        self.assertEqual([count for shape, count in stats.repeated(threshold=2)], [3])
+
+        # 비로그인 사용자와 일반 사용자에게는 헤더를 붙이지 않음
+        response = self.client.get('/blog/')
+        self.assertNotIn('Server-Timing', response)
+        self.client.login(username='obama', password='1q2w3e4r!')
+        response = self.client.get('/blog/')
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.login(username='trump', password='1q2w3e4r!')
+        response = self.client.get('/blog/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+        # 목록 페이지에는 반복 쿼리가 없으므로 경고 로그가 남지 않음
+        with self.assertNoLogs('do_it_django_prj.query_stats', level='WARNING'):
+            self.client.get('/blog/')
+
+        # 기준을 낮추면 반복 쿼리와 쿼리 수 초과를 경고
+        with self.settings(QUERY_STATS_REPEAT_THRESHOLD=1, QUERY_STATS_MAX_QUERIES=1):
+            with self.assertLogs('do_it_django_prj.query_stats', level='WARNING') as logs:
+                response = self.client.get('/blog/')
+        self.assertIn('N+1 쿼리 의심 GET /blog/', logs.output[0])
+        self.assertIn('느린 요청 GET /blog/', logs.output[1])
+        self.assertIn('repeated', response['Server-Timing'])
+
+    def test_category_sidebar_cache(self):
+        """
+        사이드바 카테고리 위젯이 캐시에서 제공되고, Post/Category 변경 시 캐시가 무효화되는지 테스트합니다.
+        """
+        response = self.client.get('/blog/')
+        self.category_card_test(BeautifulSoup(response.content, 'lxml'))
+
+        # 두 번째 요청부터는 카테고리 관련 쿼리가 실행되지 않아야 함
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/blog/')
+        self.category_card_test(BeautifulSoup(response.content, 'lxml'))
+        for query in queries.captured_queries:
+            self.assertNotIn('FROM "blog_category"', query['sql'])
+            self.assertNotIn('"blog_post"."category_id" IS NULL', query['sql'])
+
+        # 게시물이 추가되면 카테고리별 게시물 수가 바로 갱신되어야 함
+        Post.objects.create(title='새 글', content='내용', author=self.user_trump, category=self.category_society)
+        Post.objects.create(title='미분류 글', content='내용', author=self.user_trump)
+        response = self.client.get('/blog/')
+        categories_card = BeautifulSoup(response.content, 'lxml').select_one('div#categories-card')
+        self.assertIn(f'{self.category_society.name} (1)', categories_card.text)
+        self.assertIn('미분류 (2)', categories_card.text)
+
+        # 카테고리가 추가되면 사이드바에 바로 나타나야 함
+        Category.objects.create(name='culture', slug='culture')
+        response = self.client.get('/blog/')
+        categories_card = BeautifulSoup(response.content, 'lxml').select_one('div#categories-card')
+        self.assertIn('culture (0)', categories_card.text)
+
+    def test_search(self):
+        """
+        검색이 제목, 태그, 본문을 대상으로 점수 순 정렬, 페이지 나누기, 검색어 강조를 지원하는지 테스트합니다.
+        """
+        # 제목으로 검색
+        response = self.client.get('/blog/search/가나')
+        bs = BeautifulSoup(response.content, 'lxml')
+        main_area = bs.select_one('div#main-area')
+        self.assertIn('검색: 가나 (1)', main_area.text)
+        self.assertIn(self.post1.title, main_area.text)
+        self.assertNotIn(self.post2.title, main_area.text)
+
+        # 태그 이름으로 검색 (대소문자 무시)
+        response = self.client.get('/blog/search/Python')
+        main_area = BeautifulSoup(response.content, 'lxml').select_one('div#main-area')
+        self.assertIn('검색: Python (1)', main_area.text)
+        self.assertIn(self.post3.title, main_area.text)
+
+        # 본문으로 검색하면 검색어가 강조된 스니펫이 표시됨
+        response = self.client.get('/blog/search/타파')
+        post2_card = BeautifulSoup(response.content, 'lxml').select_one('div#post-2')
+        self.assertEqual(post2_card.select_one('mark').text, '타파')
+
+        # 제목에서 일치한 게시물이 본문에서만 일치한 게시물보다 앞에 나옴
+        body_match = Post.objects.create(title='다른 글', content='가나다라 마바사', author=self.user_trump)
+        response = self.client.get('/blog/search/가나다')
+        cards = BeautifulSoup(response.content, 'lxml').select('div#main-area div.card')
+        self.assertEqual([card['id'] for card in cards], ['post-1', f'post-{body_match.pk}'])
+
+        # 태그 이름이 바뀌면 색인도 갱신됨
+        self.tag_hello.name = '안녕하세요'
+        self.tag_hello.save()
+        response = self.client.get('/blog/search/안녕')
+        self.assertIn(self.post1.title, BeautifulSoup(response.content, 'lxml').select_one('div#main-area').text)
+
+        # 검색 결과도 페이지당 5개씩 나눠서 보여줌
+        for i in range(7):
+            Post.objects.create(title=f'페이지 {i}', content='내용', author=self.user_trump)
+        response = self.client.get('/blog/search/페이지')
+        bs = BeautifulSoup(response.content, 'lxml')
+        self.assertIn('검색: 페이지 (7)', bs.select_one('div#main-area').text)
+        self.assertEqual(len(bs.select('div#main-area div.card')), 5)
+        response = self.client.get('/blog/search/페이지?page=2')
+        self.assertEqual(len(BeautifulSoup(response.content, 'lxml').select('div#main-area div.card')), 2)
+
+    def test_cursor_pagination(self):
+        """
+        목록 페이지가 COUNT, OFFSET 없이 커서(?before=, ?after=) 방식으로 페이지를 나누고,
+        예전 ?page=N 링크는 같은 위치의 커서 URL로 리디렉션되는지 테스트합니다.
+        """
+        posts = [self.post1, self.post2, self.post3]
+        for i in range(9):
+            posts.append(Post.objects.create(title=f'페이지 {i}', content='내용', author=self.user_trump))
+        posts.reverse()  # 최신순 (pk 내림차순)
+
+        def card_ids(response):
+            return [card['id'] for card in BeautifulSoup(response.content, 'lxml').select('div#main-area div.card')]
+
+        # 첫 페이지: 최신 글 5개, COUNT/OFFSET 쿼리 없음 (사이드바 캐시를 먼저 채워 둠)
+        self.client.get('/blog/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/blog/')
+        self.assertEqual(card_ids(response), [f'post-{post.pk}' for post in posts[:5]])
+        for query in queries.captured_queries:
+            self.assertNotIn('COUNT(*)', query['sql'])
+            self.assertNotIn('OFFSET', query['sql'])
+
+        # Older 링크를 따라가면 다음 5개
+        older = BeautifulSoup(response.content, 'lxml').find('a', string='← Older')['href']
+        self.assertEqual(older, f'?before={posts[4].pk}')
+        response = self.client.get('/blog/' + older)
+        self.assertEqual(card_ids(response), [f'post-{post.pk}' for post in posts[5:10]])
+
+        # 마지막 페이지에는 Older 링크가 비활성화됨
+        response = self.client.get(f'/blog/?before={posts[9].pk}')
+        self.assertEqual(card_ids(response), [f'post-{post.pk}' for post in posts[10:]])
+        bs = BeautifulSoup(response.content, 'lxml')
+        self.assertEqual(bs.find('a', string='← Older')['href'], '#')
+
+        # Newer 링크를 따라가면 이전 페이지로 돌아감
+        newer = bs.find('a', string='Newer →')['href']
+        self.assertEqual(newer, f'?after={posts[10].pk}')
+        response = self.client.get('/blog/' + newer)
+        self.assertEqual(card_ids(response), [f'post-{post.pk}' for post in posts[5:10]])
+
+        # 예전 ?page=N 링크는 커서 URL로 리디렉션
+        response = self.client.get('/blog/?page=3')
+        self.assertRedirects(response, f'/blog/?before={posts[9].pk}')
+        response = self.client.get('/blog/?page=1')
+        self.assertRedirects(response, '/blog/')
+        self.assertEqual(self.client.get('/blog/?page=9').status_code, 404)
+        # ?page=last는 Paginator와 같이 가장 오래된 글들이 있는 마지막 페이지
+        response = self.client.get('/blog/?page=last')
+        self.assertRedirects(response, f'/blog/?before={posts[9].pk}')
+
+        # 태그 페이지도 같은 방식으로 페이지를 나눔
+        for post in posts:
+            post.tags.add(self.tag_python)
+        response = self.client.get(self.tag_python.get_absolute_url())
+        self.assertEqual(card_ids(response), [f'post-{post.pk}' for post in posts[:5]])
+        response = self.client.get(self.tag_python.get_absolute_url() + '?page=2')
+        self.assertRedirects(response, f'{self.tag_python.get_absolute_url()}?before={posts[4].pk}')
+
+    def test_avatar_query_count(self):
+        """
+        댓글 작성자가 늘어나도 상세 페이지의 쿼리 수가 일정하고, 소셜 계정 아바타가 캐시되는지 테스트합니다.
+        """
+        def count_queries(url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return len(queries), response
+
+        SocialAccount.objects.create(
+            user=self.user_obama,
+            provider='google',
+            uid='obama',
+            extra_data={'picture': 'https://example.com/obama.png'},
+        )
+        url = self.post1.get_absolute_url()
+        self.client.get(url)
+        cache.clear()
+        query_count, response = count_queries(url)
+
+        # 서로 다른 작성자의 댓글을 추가해도 쿼리 수는 그대로여야 함 (같은 provider의 소셜 계정이 늘어나도 마찬가지)
+        cache.clear()
+        for i in range(5):
+            author = User.objects.create_user(username=f'commenter{i}', email=f'commenter{i}@example.com')
+            Comment.objects.create(post=self.post1, author=author, content=f'댓글 {i}')
+            if i:
+                SocialAccount.objects.create(
+                    user=author, provider='google', uid=f'commenter{i}',
+                    extra_data={'picture': f'https://example.com/commenter{i}.png'},
+                )
+        query_count_with_authors, response_with_authors = count_queries(url)
+        self.assertEqual(query_count_with_authors, query_count)
+        self.assertIn('https://example.com/commenter4.png', response_with_authors.content.decode())
+
+        # 소셜 계정 아바타와 기본 아바타가 올바르게 표시되어야 함
+        bs = BeautifulSoup(response.content, 'lxml')
+        self.assertEqual(bs.select_one(f'#comment-{self.comment1.pk} img')['src'], 'https://example.com/obama.png')
+        _, response = count_queries(url)
+        self.assertIn('svg/commenter0@example.com', response.content.decode())
+
+        # 캐시가 채워진 뒤에는 소셜 계정을 다시 조회하지 않음
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        for query in queries.captured_queries:
+            self.assertNotIn('FROM "socialaccount_socialaccount"', query['sql'])
+
+        # 소셜 계정이 삭제되면 캐시가 무효화되어 기본 아바타로 바뀜
+        SocialAccount.objects.filter(user=self.user_obama).delete()
+        _, response = count_queries(url)
+        bs = BeautifulSoup(response.content, 'lxml')
+        self.assertIn('doitdjango.com/avatar', bs.select_one(f'#comment-{self.comment1.pk} img')['src'])
+
+    def test_tags_str(self):
+        """
+        게시물 작성/수정 시 tags_str이 정리되어 한 번에 저장되고, 수정 시 지운 태그가 제거되는지 테스트합니다.
+        """
+        self.client.login(username='trump', password='1q2w3e4r!')
+
+        # 중복, 대소문자, 공백, 긴 이름이 섞인 입력도 정리되어 저장되어야 함
+        tags_str = 'python; 새 태그,  새   태그 ; NEW TAG;; ' + '가' * 30 + ', 파이썬 공부, ' + ', '.join(f't{i}' for i in range(20))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/blog/create_post/', {
+                'title': '태그 게시물',
+                'content': '내용',
+                'category': self.category_society.id,
+                'tags_str': tags_str,
+            })
+        self.assertEqual(response.status_code, 302)
+        new_post = Post.objects.latest('pk')
+        names = set(new_post.tags.values_list('name', flat=True))
+        self.assertEqual(names, {'python', '새 태그', 'NEW TAG', '가' * 20, '파이썬 공부'} | {f't{i}' for i in range(20)})
+        self.assertEqual(Tag.objects.get(name='새 태그').slug, '새-태그')
+
+        # 태그 수와 상관없이 태그 조회/생성/연결은 각각 한 번의 쿼리로 처리
+        tag_inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT') and 'INTO "blog_tag" ' in q['sql']]
+        post_tag_inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT') and 'INTO "blog_post_tags" ' in q['sql']]
+        self.assertEqual(len(tag_inserts), 1)
+        self.assertEqual(len(post_tag_inserts), 1)
+
+        # 수정 시 입력에서 지운 태그는 제거되고, 제거된 태그가 안내되어야 함
+        response = self.client.post(f'/blog/update_post/{new_post.pk}', {
+            'title': '태그 게시물',
+            'content': '내용',
+            'category': self.category_society.id,
+            'tags_str': 'Python, hello',
+        }, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(new_post.tags.values_list('name', flat=True)), {'python', 'hello'})
+        self.assertIn('태그가 삭제되었습니다', response.content.decode())
+        self.assertIn('파이썬 공부', response.content.decode())
+
+        # 태그 이름으로 검색 색인도 갱신되어야 함
+        response = self.client.get('/blog/search/hello')
+        self.assertIn('태그 게시물', response.content.decode())
+
+    def test_page_cache(self):
+        """
+        비로그인 GET 요청의 페이지가 캐시되고, 데이터가 바뀌면 관련된 페이지만 무효화되는지 테스트합니다.
+        """
+        def page_cache_count(result):
+            return REGISTRY.get_sample_value('django_app_cache_requests_total', {'cache': 'page', 'result': result}) or 0
+
+        hits, misses = page_cache_count('hit'), page_cache_count('miss')
+        post1_url = self.post1.get_absolute_url()
+        post2_url = self.post2.get_absolute_url()
+        urls = [post1_url, post2_url, '/blog/', self.tag_hello.get_absolute_url(), '/']
+
+        # 처음에는 MISS, 두 번째부터는 DB를 조회하지 않고 캐시에서 응답
+        for url in urls:
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response['X-Cache'], 'HIT')
+            self.assertEqual(len(queries), 0)
+        self.assertEqual((page_cache_count('hit') - hits, page_cache_count('miss') - misses), (5, 5))
+
+        # gzip을 지원하는 클라이언트에는 압축된 응답을 그대로 전달
+        response = self.client.get(post1_url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(self.post1.title, gzip.decompress(response.content).decode())
+
+        # 댓글이 달리면 그 게시물의 상세 페이지만 무효화됨
+        Comment.objects.create(post=self.post1, author=self.user_trump, content='캐시 테스트 댓글')
+        response = self.client.get(post1_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('캐시 테스트 댓글', response.content.decode())
+        for url in urls[1:]:
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        # 게시물을 수정하면 그 게시물의 상세 페이지와 목록 페이지가 무효화됨
+        self.post2.title = '수정된 제목'
+        self.post2.save()
+        self.assertEqual(self.client.get(post1_url)['X-Cache'], 'HIT')
+        for url in urls[1:]:
+            response = self.client.get(url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('수정된 제목', self.client.get('/blog/').content.decode())
+
+        # 카테고리가 바뀌면 사이드바가 있는 모든 페이지가 무효화됨
+        Category.objects.create(name='culture', slug='culture')
+        for url in urls:
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+        # 로그인 사용자의 요청은 캐시하지 않음
+        self.client.login(username='obama', password='1q2w3e4r!')
+        response = self.client.get(post1_url)
+        self.assertFalse(response.has_header('X-Cache'))
+        self.assertIn('obama', response.content.decode())
+
+    def test_conditional_get(self):
+        """
+        상세/목록 페이지가 ETag, Last-Modified를 보내고 바뀌지 않았으면 304로 응답하는지 테스트합니다.
+        """
+        url = self.post1.get_absolute_url()
+        response = self.client.get(url)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+
+        # 비로그인 요청은 페이지 캐시에서 바로 304
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        # 로그인 사용자는 ETag가 다르고, 렌더링 없이 집계 쿼리만으로 304
+        self.client.login(username='obama', password='1q2w3e4r!')
+        response = self.client.get(url)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        post_queries = [q for q in queries.captured_queries if '"blog_post"' in q['sql']]
+        self.assertEqual(len(post_queries), 1)
+
+        # 댓글이 달리면 새 ETag로 전체 페이지를 응답
+        Comment.objects.create(post=self.post1, author=self.user_trump, content='새 댓글')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # 댓글 작성자의 소셜 계정(아바타)이 바뀌면 ETag가 바뀌어 새 아바타로 다시 렌더링
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        SocialAccount.objects.create(user=self.user_trump, provider='google', uid='trump', extra_data={'picture': 'https://example.com/trump.png'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('https://example.com/trump.png', response.content.decode())
+
+        # 목록 페이지도 게시물이 바뀌기 전까지 304
+        response = self.client.get('/blog/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/blog/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.tag_hello.get_absolute_url(), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.post3.title = '제목 변경'
+        self.post3.save()
+        self.assertEqual(self.client.get('/blog/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # 없는 게시물은 그대로 404
+        self.assertEqual(self.client.get('/blog/9999').status_code, 404)
+
+    def test_head_image_variants(self):
+        """
+        head_image를 업로드하면 너비별 WebP/JPEG 파생 이미지가 만들어지고 목록/상세 페이지에서 srcset으로 사용되는지 테스트합니다.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+
+        # EXIF 회전 정보(가로로 저장된 세로 사진)가 있는 1600x1000 JPEG
+        image = Image.new('RGB', (1600, 1000), (200, 30, 30))
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: 시계 방향 90도 회전
+        exif[0x010F] = 'Camera'  # Make
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', exif=exif)
+
+        with override_settings(MEDIA_ROOT=media_root):
+            self.client.login(username='trump', password='1q2w3e4r!')
+            response = self.client.post('/blog/create_post/', {
+                'title': '이미지 게시물',
+                'content': '내용',
+                'head_image': SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg'),
+            })
+            self.assertEqual(response.status_code, 302)
+            post = Post.objects.latest('pk')
+
+            # 회전이 적용된 1000x1600 원본에서 400/800 너비(원본 너비 1000 포함)의 WebP, JPEG를 만듦
+            items = post.head_image_variants['items']
+            self.assertEqual(post.head_image_variants['source'], post.head_image.name)
+            self.assertEqual(sorted({item['width'] for item in items}), [400, 800, 1000])
+            self.assertEqual({item['ext'] for item in items}, {'webp', 'jpg'})
+
+            jpeg = next(item for item in items if item['ext'] == 'jpg' and item['width'] == 400)
+            self.assertEqual(jpeg['height'], 640)
+            with Image.open(post.head_image.storage.path(jpeg['name'])) as variant:
+                self.assertEqual(variant.size, (400, 640))
+                self.assertTrue(variant.info.get('progressive'))
+                self.assertEqual(len(variant.getexif()), 0)
+
+            # 목록/상세 페이지는 <picture>의 srcset으로 파생 이미지를 사용
+            for url in ['/blog/', post.get_absolute_url()]:
+                bs = BeautifulSoup(self.client.get(url).content, 'lxml')
+                picture = bs.select_one('picture')
+                self.assertEqual(picture.select_one('source')['type'], 'image/webp')
+                self.assertIn('__w400.webp 400w', picture.select_one('source')['srcset'])
+                self.assertIn('__w800.jpg', picture.select_one('img')['src'])
+
+            # 기존 이미지는 명령으로 파생 이미지를 다시 만들 수 있음
+            # 파생 이미지가 없을 때 렌더링해 둔 목록 카드/상세 이미지 조각 캐시도 새 srcset으로 다시 렌더링됨
+            Post.objects.filter(pk=post.pk).update(head_image_variants={}, updated_at=timezone.now())
+            cache.clear()
+            for url in ['/blog/', post.get_absolute_url()]:
+                bs = BeautifulSoup(self.client.get(url).content, 'lxml')
+                self.assertIsNone(bs.select_one('picture source'))
+            call_command('build_image_variants', model=['blog.Post'], stdout=StringIO())
+            post.refresh_from_db()
+            self.assertEqual(len(post.head_image_variants['items']), 6)
+            webp = next(item for item in post.head_image_variants['items'] if item['ext'] == 'webp' and item['width'] == 400)
+            for url in ['/blog/', post.get_absolute_url()]:
+                bs = BeautifulSoup(self.client.get(url).content, 'lxml')
+                self.assertIn(f"{webp['name']} 400w", bs.select_one('picture source')['srcset'])
+
+    def test_download_file(self):
+        """
+        첨부 파일 다운로드 뷰가 다운로드 수를 세고, Range 요청(206/416)과 X-Accel-Redirect를 처리하는지 테스트합니다.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        data = bytes(range(256)) * 4
+
+        with override_settings(MEDIA_ROOT=media_root):
+            post = Post.objects.create(title='첨부 파일', content='내용', author=self.user_trump)
+            post.file_upload = SimpleUploadedFile('보고서.csv', data)
+            post.save()
+            url = post.get_download_url()
+
+            # 상세 페이지의 다운로드 링크는 다운로드 뷰를 가리킴
+            bs = BeautifulSoup(self.client.get(post.get_absolute_url()).content, 'lxml')
+            self.assertTrue(bs.find('a', href=url))
+
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), data)
+            self.assertEqual(response['Content-Type'], 'text/csv')
+            self.assertIn("filename*=utf-8''%EB%B3%B4%EA%B3%A0%EC%84%9C.csv", response['Content-Disposition'])
+            self.assertEqual(response['Accept-Ranges'], 'bytes')
+            self.assertIn('private', response['Cache-Control'])
+            etag = response['ETag']
+
+            # 이어받기: 지정한 구간만 206으로 응답하고 다운로드 수에는 포함하지 않음
+            response = self.client.get(url, HTTP_RANGE='bytes=100-199')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(data)}')
+            self.assertEqual(response['Content-Length'], '100')
+            self.assertEqual(b''.join(response.streaming_content), data[100:200])
+
+            response = self.client.get(url, HTTP_RANGE='bytes=-24')
+            self.assertEqual(b''.join(response.streaming_content), data[-24:])
+
+            # 파일이 바뀌었으면(If-Range 불일치) 전체 파일로 응답하고 새 다운로드로 셈
+            response = self.client.get(url, HTTP_RANGE='bytes=100-', HTTP_IF_RANGE='"old"')
+            self.assertEqual(response.status_code, 200)
+            response.close()
+
+            response = self.client.get(url, HTTP_RANGE=f'bytes={len(data)}-')
+            self.assertEqual(response.status_code, 416)
+            self.assertEqual(response['Content-Range'], f'bytes */{len(data)}')
+
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            post.refresh_from_db()
+            self.assertEqual(post.download_count, 2)
+
+            # 운영 환경에서는 파일을 읽지 않고 nginx에 전송을 넘김
+            with override_settings(DOWNLOAD_ACCEL_REDIRECT=True):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{quote(post.file_upload.name)}')
+            self.assertEqual(response.content, b'')
+            post.refresh_from_db()
+            self.assertEqual(post.download_count, 3)
+
+            self.assertEqual(self.client.get(self.post1.get_download_url()).status_code, 404)
+
+    def test_upload_storage(self):
+        """
+        같은 내용의 첨부 파일은 한 번만 저장되고 파일명은 그대로 유지되며, gc_uploads가 참조되지 않는 파일만 지우는지 테스트합니다.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        data = b'%PDF-1.4 report' * 1000
+
+        with override_settings(MEDIA_ROOT=media_root):
+            post_a = Post.objects.create(title='첨부 A', content='내용', author=self.user_trump)
+            post_a.file_upload.save('보고서.pdf', SimpleUploadedFile('보고서.pdf', data))
+            post_b = Post.objects.create(title='첨부 B', content='내용', author=self.user_trump)
+            post_b.file_upload.save('report-final.pdf', SimpleUploadedFile('report-final.pdf', data))
+            post_c = Post.objects.create(title='첨부 C', content='내용', author=self.user_trump)
+            post_c.file_upload.save('보고서.pdf', SimpleUploadedFile('보고서.pdf', data))
+
+            # 같은 내용은 같은 blob을 가리키는 하드 링크로 저장되고 파일명은 그대로
+            self.assertRegex(post_a.file_upload.name, r'^cas/[0-9a-f]{2}/[0-9a-f]{64}/보고서\.pdf$')
+            self.assertEqual(post_a.file_upload.name, post_c.file_upload.name)
+            self.assertEqual(post_b.get_file_name(), 'report-final.pdf')
+            self.assertEqual(post_b.get_file_ext(), 'pdf')
+            blob_dir = os.path.dirname(post_a.file_upload.path)
+            self.assertEqual(sorted(os.listdir(blob_dir)), ['data', 'report-final.pdf', '보고서.pdf'])
+            self.assertTrue(os.path.samefile(post_a.file_upload.path, post_b.file_upload.path))
+            self.assertEqual(os.listdir(os.path.join(media_root, 'cas', 'tmp')), [])
+
+            response = self.client.get(post_b.get_download_url())
+            self.assertEqual(b''.join(response.streaming_content), data)
+
+            # 한 게시물을 지워도 다른 게시물이 참조하는 파일은 남음
+            post_b.delete()
+            post_a.delete()
+            call_command('gc_uploads', min_age=0, stdout=StringIO())
+            self.assertEqual(sorted(os.listdir(blob_dir)), ['data', '보고서.pdf'])
+            self.assertEqual(post_c.file_upload.read(), data)
+
+            # --min-age 안에 업로드된 파일은 참조되지 않아도 남김
+            post_c.delete()
+            call_command('gc_uploads', stdout=StringIO())
+            self.assertTrue(os.path.exists(blob_dir))
+
+            out = StringIO()
+            call_command('gc_uploads', min_age=0, stdout=out)
+            self.assertIn('blob 1개', out.getvalue())
+            self.assertFalse(os.path.exists(blob_dir))
+
+    def test_corpus_export_import(self):
+        """
+        export_corpus로 내보낸 JSONL을 import_corpus로 다시 가져오면 게시물, 태그, 댓글, 작성 시각이 그대로 복원되는지 테스트합니다.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'corpus.jsonl.gz')
+
+        Post.objects.filter(pk=self.post1.pk).update(
+            head_image='uploads/a.png',
+            head_image_variants={'source': 'uploads/a.png', 'items': [{'name': 'uploads/a__w400.jpg', 'width': 400, 'height': 300, 'ext': 'jpg', 'type': 'image/jpeg'}]},
+            created_at='2020-01-02 03:04:05.123456',
+        )
+        press = Press.objects.create(name='RSS 신문', slug='rss', feed_url='http://example.com/rss.xml', feed_etag='"v1"')
+        news_post = NewsPost.objects.create(
+            title='피드 기사', content='피드 본문', category=press,
+            source_url='http://example.com/articles/1', content_hash='a' * 64,
+        )
+        call_command('export_corpus', path, stdout=StringIO())
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['model'] for record in records[:3]], ['blog.category'] * 3)
+        self.assertEqual(sum(record['model'] == 'blog.post' for record in records), 3)
+
+        # 비어 있는 DB에 가져오기 (사용자도 username으로 다시 만듦)
+        Post.objects.all().delete()
+        Tag.objects.all().delete()
+        NewsPost.objects.all().delete()
+        Press.objects.all().delete()
+        User.objects.filter(username='obama').delete()
+        self.assertEqual(Comment.objects.count(), 0)
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            call_command('import_corpus', path, '--batch-size', '2', '--media-map', 'uploads/=blog/images/', stdout=StringIO())
+        post_inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT') and 'INTO "blog_post" ' in q['sql']]
+        self.assertEqual(len(post_inserts), 2)  # 게시물 3개를 2개씩 bulk_create
+
+        post1 = Post.objects.get(pk=self.post1.pk)
+        self.assertEqual(post1.title, '가나다라')
+        self.assertEqual(post1.head_image.name, 'blog/images/a.png')
+        self.assertEqual(post1.head_image_variants['items'][0]['name'], 'blog/images/a__w400.jpg')
+        self.assertFalse(post1.head_image_variants_stale())
+        self.assertEqual(str(post1.created_at), '2020-01-02 03:04:05.123456')
+        self.assertEqual(post1.content_html, self.post1.content_html)
+        self.assertEqual(list(post1.tags.values_list('slug', flat=True)), ['hello'])
+        self.assertEqual(sorted(Post.objects.get(pk=self.post3.pk).tags.values_list('name', flat=True)), ['python', '파이썬 공부'])
+        self.assertEqual(Post.objects.get(pk=self.post3.pk).author.username, 'obama')
+        self.assertFalse(Post.objects.get(pk=self.post3.pk).author.has_usable_password())
+        self.assertEqual(post1.comment_set.get().content, '첫 번째 댓글')
+        self.assertEqual(post1.category, self.category_politic)
+
+        # 언론사 피드 주소와 기사의 중복 확인 값(원문 주소, 내용 해시)도 복원 (ETag는 다시 받도록 비움)
+        press = Press.objects.get(slug='rss')
+        self.assertEqual((press.feed_url, press.feed_etag), ('http://example.com/rss.xml', ''))
+        news_post = NewsPost.objects.get(pk=news_post.pk)
+        self.assertEqual(news_post.category, press)
+        self.assertEqual((news_post.source_url, news_post.content_hash), ('http://example.com/articles/1', 'a' * 64))
+
+        # 시그널 대신 검색 색인을 직접 갱신함
+        self.assertEqual(list(search_posts(Post.objects.all(), '가나다라')), [post1])
+
+        # 중단된 곳부터 다시 가져와도 중복되지 않음
+        with open(f'{path}.checkpoint', 'w') as f:
+            json.dump({'line': 5}, f)
+        out = StringIO()
+        call_command('import_corpus', path, '--resume', stdout=out)
+        self.assertIn('5번째 줄 다음부터', out.getvalue())
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertEqual(Post.tags.through.objects.count(), 3)
+
+        # 비어 있지 않은 DB에 다시 가져오면 pk가 이미 있는 게시물(다른 글일 수 있음)은 건너뛰고 태그도 붙이지 않음
+        Post.objects.filter(pk=self.post1.pk).update(title='다른 글')
+        Post.objects.get(pk=self.post1.pk).tags.clear()
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_corpus', path, stdout=out)
+        self.assertIn('pk가 이미 있는 게시물 3개, 뉴스 1개를 건너뛰었습니다', out.getvalue())
+        self.assertIn('게시물 0 · 뉴스 0', out.getvalue())
+        self.assertEqual(Post.objects.get(pk=self.post1.pk).title, '다른 글')
+        self.assertFalse(Post.objects.get(pk=self.post1.pk).tags.exists())
+        self.assertEqual(Post.objects.count(), 3)
+
+        # 새 게시물은 가져온 pk 다음 번호를 사용
+        self.assertGreater(Post.objects.create(title='새 글', content='내용').pk, self.post3.pk)
+
+    def test_seed_data_benchmark(self):
+        """
+        seed_data로 만든 데이터로 benchmark가 모든 URL 패턴을 측정하고 결과를 JSON으로 저장하는지 테스트합니다.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        output = os.path.join(tmp_dir, 'benchmark.json')
+
+        with override_settings(MEDIA_ROOT=tmp_dir):
+            call_command('seed_data', posts=30, news=5, users=3, tags=5, categories=2, presses=2, files=2, stdout=StringIO())
+            self.assertEqual(Post.objects.filter(author__username__startswith='seed_user_').count(), 30)
+            self.assertTrue(SocialAccount.objects.filter(user__username__startswith='seed_user_').exists())
+
+            call_command('benchmark', requests=2, warmup=1, output=output, stdout=StringIO(), stderr=StringIO())
+
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(report['meta']['data']['posts'], 33)
+        results = {result['route']: result for result in report['results']}
+        # 댓글 삭제(GET으로 데이터를 바꾸는 경로)를 뺀 모든 경로를 측정
+        self.assertIn('blog/<int:pk>', results)
+        self.assertIn('news/category/<str:slug>', results)
+        self.assertIn('', results)
+        self.assertNotIn('blog/delete_comment/<int:pk>', results)
+        self.assertEqual(results['blog/<int:pk>']['status'], [200])
+        self.assertTrue(results['blog/create_post/']['authenticated'])
+        self.assertEqual(results['blog/create_post/']['status'], [200])
+        for result in results.values():
+            self.assertEqual(result['requests'], 2)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertIsNotNone(result['queries'])
+
+    def test_warm_up(self):
+        """
+        gunicorn 워밍업이 템플릿을 컴파일해서 캐시 로더에 넣고, URL 패턴과 사이드바 캐시를 준비한 뒤 DB 연결을 닫는지 테스트합니다.
+        """
+        from django.template import engines
+        from blog.context_processors import CATEGORY_SIDEBAR_CACHE_KEY
+        from do_it_django_prj.warmup import warm_up
+
+        cache.clear()
+        engine = engines['django'].engine
+        cached_loader = engine.template_loaders[0]
+        cached_loader.reset()
+
+        # 테스트의 트랜잭션 안에서 연결을 닫지 않도록 close_all만 가로챔
+        with mock.patch('do_it_django_prj.warmup.connections') as connections:
+            stats = warm_up()
+        connections.close_all.assert_called_once()
+
+        self.assertGreater(stats['templates'], 0)
+        self.assertGreater(stats['url_patterns'], 0)
+        self.assertIn('blog/post_list.html', cached_loader.get_template_cache)
+        self.assertIn('news/base.html', cached_loader.get_template_cache)
+        self.assertIsNotNone(cache.get(CATEGORY_SIDEBAR_CACHE_KEY))
+
+        # 컴파일된 템플릿을 다시 읽지 않고 사용
+        with mock.patch.object(cached_loader, 'get_contents', side_effect=AssertionError):
+            self.assertEqual(self.client.get('/blog/').status_code, 200)
+
+    def test_post_card_fragment_cache(self):
+        """
+        목록 카드와 상세 헤더를 조각 캐시에서 다시 쓰고, 게시물/태그/카테고리가 바뀌면
+        키(updated_at, 태그/카테고리 버전)가 달라져서 삭제하지 않아도 새로 렌더링되는지 테스트합니다.
+        """
+        cache.clear()
+        # 로그인 사용자의 요청은 페이지 캐시를 거치지 않으므로 조각 캐시만 확인할 수 있음
+        self.client.force_login(self.user_obama)
+
+        def card(post):
+            soup = BeautifulSoup(self.client.get('/blog/').content, 'html.parser')
+            return soup.find('div', id=f'post-{post.pk}').text
+
+        def detail_header(post):
+            soup = BeautifulSoup(self.client.get(post.get_absolute_url()).content, 'html.parser')
+            return soup.find('header').text
+
+        self.assertIn('가나다라', card(self.post1))
+        self.assertIn('가나다라', detail_header(self.post1))
+
+        # updated_at이 그대로이면 (시그널 없이 DB만 바꾼 경우) 캐시된 조각을 사용
+        Post.objects.filter(pk=self.post1.pk).update(title='캐시되지 않은 제목')
+        self.assertIn('가나다라', card(self.post1))
+        self.assertIn('가나다라', detail_header(self.post1))
+
+        # 게시물을 저장하면 updated_at이 바뀌어서 다시 렌더링
+        self.post1.refresh_from_db()
+        self.post1.title = '바뀐 제목'
+        self.post1.save()
+        self.assertIn('바뀐 제목', card(self.post1))
+        self.assertIn('바뀐 제목', detail_header(self.post1))
+
+        # 태그 추가(게시물의 updated_at 갱신), 태그/카테고리 이름 변경(버전 변경)도 반영
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post1.tags.add(self.tag_python)
+        self.assertIn('python', card(self.post1))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag_hello.name = '안녕'
+            self.tag_hello.save()
+            self.category_politic.name = '정치'
+            self.category_politic.save()
+        self.assertIn('안녕', card(self.post1))
+        self.assertIn('정치', card(self.post1))
+        self.assertIn('안녕', detail_header(self.post1))
+        self.assertIn('정치', detail_header(self.post1))
+
+        # 검색 요약은 검색어마다 다르므로 캐시하지 않음 (같은 카드라도 검색 페이지에서만 검색어를 강조)
+        response = self.client.get('/blog/search/마바사')
+        post1_card = BeautifulSoup(response.content, 'html.parser').find('div', id=f'post-{self.post1.pk}')
+        self.assertEqual(post1_card.find('mark').text, '마바사')
+        soup = BeautifulSoup(self.client.get('/blog/').content, 'html.parser')
+        self.assertIsNone(soup.find('div', id=f'post-{self.post1.pk}').find('mark'))
+
+    def test_query_plans(self):
+        """
+        목록/상세 페이지에서 자주 실행되는 조회가 인덱스를 사용하고 테이블 전체를 스캔하지 않는지 EXPLAIN으로 테스트합니다.
+        (SQLite, PostgreSQL에서 실행하고 다른 DB에서는 건너뜀)
+        """
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        from datetime import timedelta
+        from .views import category_page_validators, tag_page_validators
+
+        press = Press.objects.create(name='조선일보', slug='chosun')
+        NewsPost.objects.create(title='뉴스', content='뉴스 내용', author=self.user_obama, category=press)
+        NewsPost.objects.create(title='미분류 뉴스', content='내용', author=self.user_obama)
+        request = RequestFactory().get('/blog/')
+        request.user = AnonymousUser()
+        now = timezone.now()
+
+        # 미분류 페이지 (부분 인덱스) / 사이드바의 미분류 게시물 수 / 조건부 GET 검증값
+        self.assertNoFullScan(lambda: list(Post.objects.for_list().filter(category=None).order_by('-pk')[:6]), ordered=True)
+        self.assertNoFullScan(lambda: Post.objects.filter(category=None).count())
+        self.assertNoFullScan(lambda: category_page_validators(request, 'no_category'))
+        # 카테고리 페이지 (다음 페이지는 커서 pk__lt)
+        self.assertNoFullScan(
+            lambda: list(Post.objects.for_list().filter(category=self.category_politic).order_by('-pk')[:6]), ordered=True,
+        )
+        self.assertNoFullScan(
+            lambda: list(
+                Post.objects.for_list().filter(category=self.category_politic, pk__lt=self.post3.pk).order_by('-pk')[:6]
+            ),
+            ordered=True,
+        )
+        self.assertNoFullScan(lambda: category_page_validators(request, self.category_politic.slug))
+        self.assertNoFullScan(lambda: list(self.tag_hello.post_set.for_list().order_by('-pk')[:6]))
+        self.assertNoFullScan(lambda: tag_page_validators(request, self.tag_hello.slug))
+        # 상세 페이지의 댓글은 작성 순서대로 인덱스에서 읽음
+        self.assertNoFullScan(lambda: list(Post.objects.for_detail().filter(pk=self.post1.pk)), ordered=True)
+        # 작성일 기간 조회
+        self.assertNoFullScan(lambda: list(Post.objects.filter(created_at__range=(now - timedelta(days=7), now))))
+        self.assertNoFullScan(lambda: list(NewsPost.objects.filter(created_at__gte=now - timedelta(days=7))))
+        # 뉴스 언론사 페이지 / 미분류 페이지
+        self.assertNoFullScan(lambda: list(NewsPost.objects.filter(category=press).order_by('-pk')[:6]), ordered=True)
+        self.assertNoFullScan(lambda: list(NewsPost.objects.filter(category=None).order_by('-pk')[:6]), ordered=True)
+        self.assertNoFullScan(lambda: NewsPost.objects.filter(category=None).count())
+
+        # 인덱스가 없는 조회는 실패로 잡아냄
+        with self.assertRaises(AssertionError):
+            self.assertNoFullScan(lambda: list(Post.objects.filter(hook_text='부제목')))
+
+    def test_denormalized_counters(self):
+        """
+        댓글 수, 태그/카테고리별 게시물 수, 미분류 게시물 수 카운터가 저장/삭제/태그 변경 시 갱신되고,
+        reconcile_counters 명령이 어긋난 값을 찾아서 고치는지 테스트합니다.
+        """
+        from .counters import UNCATEGORIZED_POSTS, uncategorized_post_count
+
+        def counts():
+            return {
+                'comments': dict(Post.objects.values_list('pk', 'comment_count')),
+                'tags': dict(Tag.objects.values_list('slug', 'post_count')),
+                'categories': dict(Category.objects.values_list('slug', 'post_count')),
+                'uncategorized': uncategorized_post_count(),
+            }
+
+        def actual_counts():
+            return {
+                'comments': {post.pk: post.comment_set.count() for post in Post.objects.all()},
+                'tags': {tag.slug: tag.post_set.count() for tag in Tag.objects.all()},
+                'categories': {category.slug: category.post_set.count() for category in Category.objects.all()},
+                'uncategorized': Post.objects.filter(category=None).count(),
+            }
+
+        # setUp에서 만든 데이터 (게시물 생성, 태그 추가, 댓글 생성)
+        self.assertEqual(counts(), actual_counts())
+        self.assertEqual(counts()['uncategorized'], 1)
+
+        # 불러온 뒤 카운터가 바뀌어도 save()가 예전 값(0)으로 덮어쓰지 않음
+        post2 = Post.objects.get(pk=self.post2.pk)
+        Comment.objects.create(post=self.post2, author=self.user_obama, content='두 번째 댓글')
+        post2.title = '바뀐 제목'
+        post2.save()
+        self.assertEqual(Post.objects.get(pk=self.post2.pk).comment_count, 1)
+        stale_tag = Tag.objects.get(pk=self.tag_hello.pk)
+        self.post2.tags.add(self.tag_hello)
+        stale_tag.name = '안녕'
+        stale_tag.save()
+        self.assertEqual(counts(), actual_counts())
+
+        # 카테고리 변경, 태그 remove/set/clear (연결되지 않은 태그를 remove해도 줄지 않음), 역방향(tag.post_set) 변경
+        self.post3.category = self.category_society
+        self.post3.save()
+        self.post1.category = None
+        self.post1.save()
+        self.post1.tags.remove(self.tag_python)
+        self.post3.tags.set([self.tag_python, self.tag_hello])
+        self.tag_python_kor.post_set.add(self.post1, self.post2)
+        self.assertEqual(counts(), actual_counts())
+        self.tag_python_kor.post_set.clear()
+        self.post2.tags.clear()
+        self.assertEqual(counts(), actual_counts())
+
+        # 게시물 삭제(태그 연결, 댓글도 함께 삭제), 댓글 삭제, 카테고리 삭제(게시물이 미분류가 됨)
+        Comment.objects.filter(post=self.post2).delete()
+        self.post3.delete()
+        self.category_politic.delete()
+        self.category_economy.delete()
+        self.assertEqual(counts(), actual_counts())
+        self.assertEqual(counts()['uncategorized'], 2)
+
+        # 사이드바는 카운터 값을 집계(COUNT) 없이 읽음 (카테고리 목록, 미분류 게시물 수)
+        from .context_processors import get_category_sidebar
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            get_category_sidebar()
+        self.assertEqual(len(queries), 2)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+        soup = BeautifulSoup(self.client.get('/blog/').content, 'html.parser')
+        self.assertIn('미분류 (2)', soup.select_one('div#categories-card').text)
+
+        # 시그널을 거치지 않은 변경은 reconcile_counters 명령이 찾아서 고침 (--dry-run은 출력만)
+        Post.objects.filter(pk=self.post1.pk).update(comment_count=5)
+        Tag.objects.filter(pk=self.tag_hello.pk).update(post_count=0)
+        Post.objects.filter(pk=self.post2.pk).update(category=self.category_society)
+        out = StringIO()
+        call_command('reconcile_counters', '--dry-run', stdout=out)
+        self.assertIn('Post.comment_count: 어긋난 행 1개 (합계 차이 -4)', out.getvalue())
+        self.assertIn('Tag.post_count: 어긋난 행 1개 (합계 차이 +1)', out.getvalue())
+        self.assertIn(f'{UNCATEGORIZED_POSTS}: 어긋난 행 1개 (합계 차이 -1)', out.getvalue())
+        self.assertNotEqual(counts(), actual_counts())
+
+        out = StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('어긋난 값 4개를 고쳤습니다.', out.getvalue())
+        self.assertEqual(counts(), actual_counts())
+        out = StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('모든 카운터가 실제 개수와 같습니다.', out.getvalue())
+
+    def test_related_posts(self):
+        """
+        태그/본문이 비슷한 게시물이 관련 글로 저장되고, 게시물/태그가 바뀌거나 삭제되면 영향을 받는 게시물만 다시 계산되어
+        상세 페이지에 (post, rank) 인덱스 조회 한 번으로 표시되는지 테스트합니다.
+        """
+        from .models import RelatedPost
+        from jobs.models import Job
+        from .related import RELATED_POSTS_COUNT, build_corpus, clear_corpus, load_corpus
+
+        def related(post):
+            return list(RelatedPost.objects.filter(post=post).order_by('rank').values_list('related_id', flat=True))
+
+        def related_titles(post):
+            soup = BeautifulSoup(self.client.get(post.get_absolute_url()).content, 'html.parser')
+            section = soup.find('section', id='related-posts')
+            return [a.text for a in section.find_all('a')] if section else []
+
+        cache.clear()
+        clear_corpus()
+        self.assertEqual(related_titles(self.post1), [])
+
+        # 제목/본문/태그가 post1과 비슷한 게시물을 만들면 post1의 관련 글 첫 번째가 되고 post1의 상세 페이지 캐시도 무효화
+        with self.captureOnCommitCallbacks(execute=True):
+            post4 = Post.objects.create(title='가나다라 마바', content='마바사 아자', author=self.user_trump)
+            post4.tags.add(self.tag_hello)
+        self.assertEqual(related(self.post1)[0], post4.pk)
+        self.assertEqual(related(post4)[0], self.post1.pk)
+        self.assertNotIn(self.post1.pk, related(self.post2))
+        self.assertEqual(related_titles(self.post1)[0], '가나다라 마바')
+        self.assertTrue(all(len(related(post)) <= RELATED_POSTS_COUNT for post in Post.objects.all()))
+
+        # 관련 글 제목이 바뀌면 그 글을 보여 주던 상세 페이지도 다시 렌더링
+        with self.captureOnCommitCallbacks(execute=True):
+            post4.title = '바뀐 관련 글'
+            post4.save()
+        self.assertEqual(related_titles(self.post1)[0], '바뀐 관련 글')
+
+        # 상세 페이지는 관련 글을 (post, rank) 인덱스로 한 번에 읽음
+        self.client.force_login(self.user_obama)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.post1.get_absolute_url())
+        self.assertEqual(len([query for query in queries if 'FROM "blog_relatedpost"' in query['sql']]), 1)
+        self.assertNoFullScan(lambda: list(Post.objects.for_detail().filter(pk=self.post1.pk)), ordered=True)
+        self.client.logout()
+
+        # 태그와 본문이 달라지면 목록에서 빠지고, 비슷해진 게시물의 목록에 들어감 (역방향 태그 변경, 태그 삭제도 다시 계산)
+        with self.captureOnCommitCallbacks(execute=True):
+            post4.content = '전혀 다른 내용'
+            post4.title = '무관한 글'
+            post4.save()
+            self.tag_hello.post_set.remove(post4)
+        self.assertNotIn(post4.pk, related(self.post1))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag_python.post_set.add(post4)
+            post4.title = '가갸거겨'
+            post4.content = '구규그기'
+            post4.save()
+        self.assertEqual(related(self.post3)[0], post4.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tag_python.delete()
+            self.tag_python_kor.delete()
+        self.assertEqual(related(self.post3)[0], post4.pk)
+
+        # 게시물을 삭제하면 그 게시물을 보여 주던 게시물의 목록을 다시 계산
+        with self.captureOnCommitCallbacks(execute=True):
+            post4.delete()
+        self.assertNotIn(post4.pk, related(self.post3))
+        self.assertFalse(RelatedPost.objects.filter(related_id=post4.pk).exists())
+
+        # 프로세스에 둔 말뭉치를 바뀐 게시물만 다시 계산해 갱신해도 관련도 순위는 처음부터 만든 말뭉치와 같음
+        def ranking(corpus):
+            rows = list(range(len(corpus)))
+            return {pk: [related_id for related_id, _ in top] for pk, top in corpus.neighbours(rows).items()}
+
+        incremental, rebuilt = load_corpus(), build_corpus()
+        self.assertEqual(incremental.post_ids.tolist(), rebuilt.post_ids.tolist())
+        self.assertEqual(ranking(incremental), ranking(rebuilt))
+        # 바뀐 게시물이 없으면 그대로 재사용하고, 버려졌거나(새 프로세스) 오래되면 전체를 다시 만듦
+        self.assertIs(load_corpus(), incremental)
+        clear_corpus()
+        self.assertIsNot(load_corpus(), incremental)
+        self.assertEqual(ranking(load_corpus()), ranking(rebuilt))
+        with mock.patch('blog.related.CORPUS_MAX_AGE', -1):
+            self.assertIsNot(load_corpus(), load_corpus())
+
+        # 시그널 없이 넣은 게시물(색인도 없음)은 전체 재계산 명령으로 반영
+        post5 = Post(title='가나다라', content='마바사', author=self.user_trump)
+        post5.render_content()
+        Post.objects.bulk_create([post5])
+        self.assertEqual(related(self.post1), [])
+        out = StringIO()
+        call_command('build_related_posts', stdout=out)
+        self.assertIn('2개 게시물의 관련 글이 바뀌었습니다', out.getvalue())
+        self.assertEqual(related(self.post1), [post5.pk])
+        self.assertEqual(related(post5), [self.post1.pk])
+
+        # 한 트랜잭션 안에서 게시물 저장과 태그 추가가 일어나도 커밋될 때 관련 게시물 갱신 작업은 하나만 추가
+        with override_settings(JOBS_EAGER=False), self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                post6 = Post.objects.create(title='가나다라', content='마바사', author=self.user_trump)
+                post6.tags.add(self.tag_hello)
+            self.assertFalse(Job.objects.filter(name='blog.update_related_posts').exists())
+        self.assertEqual(
+            list(Job.objects.filter(name='blog.update_related_posts').values_list('kwargs', flat=True)),
+            [{'post_ids': [post6.pk]}],
+        )
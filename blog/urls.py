@@ -1,16 +1,28 @@
 from django.urls import path, include
 from . import views
 
+# URL 이름 앞에 붙는 네임스페이스 (예: blog:post_list), 메트릭의 view 라벨로도 사용
+app_name = "blog"
 
-urlpatterns = [
-    path("search/<str:q>", views.PostSearch.as_view()),                  # 127.0.0.1/blog/search/1
-    path("delete_comment/<int:pk>", views.delete_comment),               # 127.0.0.1/blog/delete_comment/1
-    path("update_comment/<int:pk>", views.CommentUpdate.as_view()),      # 127.0.0.1/blog/update_comment/1
-    path("update_post/<int:pk>", views.PostUpdate.as_view()),            # 127.0.0.1/blog/update_post/1
-    path("create_post/", views.PostCreate.as_view()),                    # 127.0.0.1/blog/create_post/
-    path("tag/<str:slug>", views.tag_page),                              # 127.0.0.1/blog/tag/경제
-    path("category/<str:slug>", views.category_page),                    # 127.0.0.1/blog/category/경제
-    path("<int:pk>/new_comment", views.new_comment),                     # 127.0.0.1/blog/1/new_comment
-    path("<int:pk>", views.PostDetail.as_view()),                        # 127.0.0.1/blog/1
-    path("", views.PostList.as_view())                                   # 127.0.0.1/blog/
-]
+
+def build_urlpatterns(read_views):
+    """
+    URL 패턴 목록 (읽기 경로인 목록/상세/태그/카테고리는 read_views 모듈의 뷰를 사용)
+    WSGI에서는 views(동기 뷰), ASGI에서는 async_views(비동기 뷰, blog/async_urls.py)
+    """
+    return [
+        path("search/<str:q>", views.PostSearch.as_view(), name="post_search"),                  # 127.0.0.1/blog/search/1
+        path("delete_comment/<int:pk>", views.delete_comment, name="delete_comment"),            # 127.0.0.1/blog/delete_comment/1
+        path("update_comment/<int:pk>", views.CommentUpdate.as_view(), name="update_comment"),   # 127.0.0.1/blog/update_comment/1
+        path("update_post/<int:pk>", views.PostUpdate.as_view(), name="update_post"),            # 127.0.0.1/blog/update_post/1
+        path("create_post/", views.PostCreate.as_view(), name="create_post"),                    # 127.0.0.1/blog/create_post/
+        path("tag/<str:slug>", read_views.tag_page, name="tag_page"),                            # 127.0.0.1/blog/tag/경제
+        path("category/<str:slug>", read_views.category_page, name="category_page"),             # 127.0.0.1/blog/category/경제
+        path("<int:pk>/download", views.download_file, name="download_file"),                    # 127.0.0.1/blog/1/download
+        path("<int:pk>/new_comment", views.new_comment, name="new_comment"),                     # 127.0.0.1/blog/1/new_comment
+        path("<int:pk>", read_views.post_detail, name="post_detail"),                            # 127.0.0.1/blog/1
+        path("", read_views.post_list, name="post_list")                                         # 127.0.0.1/blog/
+    ]
+
+
+urlpatterns = build_urlpatterns(views)
@@ -1,81 +1,174 @@
-from django.db.models import Q
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
-from django.utils.text import slugify
-from .models import Post, Category, Tag, Comment
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from .models import Post, Category, Tag, Comment, MARKDOWN_RENDER_VERSION
 from .forms import CommentForm
+from .search import search_posts, attach_snippets
+from .avatars import prime_avatar_urls
+from .tags import set_post_tags
+from .downloads import serve_download
+from do_it_django_prj.page_cache import add_cache_tags
+from do_it_django_prj.conditional import build_validators, conditional_page
+from .pagination import CursorPaginationMixin, paginate_by_cursor, legacy_page_redirect
+
+# 목록 페이지에서 한 페이지에 보여줄 포스트 수
+POSTS_PER_PAGE = 5
+
+
+def post_list_validators(request, post_list):
+    """
+    게시물 목록 페이지의 ETag/Last-Modified (가장 최근 수정 시각과 게시물 수를 한 번의 집계 쿼리로 구함)
+    """
+    row = post_list.aggregate(updated_at=Max('updated_at'), post_count=Count('pk'))
+    return build_validators(
+        request,
+        ['blog.post-list', 'blog.sidebar'],
+        [row['updated_at']],
+        row['post_count'],
+        MARKDOWN_RENDER_VERSION,
+    )
+
+
+def tag_page_validators(request, slug):
+    return post_list_validators(request, Post.objects.filter(tags__slug=slug))
+
+
+def category_page_validators(request, slug):
+    if slug == 'no_category':
+        return post_list_validators(request, Post.objects.filter(category=None))
+    return post_list_validators(request, Post.objects.filter(category__slug=slug))
+
+
+def post_list_page_validators(request):
+    return post_list_validators(request, Post.objects.all())
+
+
+def post_detail_validators(request, pk):
+    """
+    게시물 상세 페이지의 ETag/Last-Modified (게시물 수정 시각, 댓글 최근 수정 시각과 댓글 수를 한 번의 쿼리로 구함)
+    댓글 수는 댓글을 세지 않고 카운터 컬럼(comment_count) 값을 사용
+    댓글 작성자의 아바타가 바뀐 시각은 페이지 캐시와 같은 blog.author:<id> 태그의 무효화 시각으로 반영
+    게시물이 없으면 None (뷰에서 404 처리)
+    """
+    row = Post.objects.filter(pk=pk).aggregate(
+        updated_at=Max('updated_at'),
+        comment_modified_at=Max('comment__modified_at'),
+        comment_count=Max('comment_count'),
+    )
+    if row['updated_at'] is None:
+        return None
+    author_ids = []
+    if row['comment_count']:
+        author_ids = Comment.objects.filter(post_id=pk).order_by().values_list('author_id', flat=True).distinct()
+    return build_validators(
+        request,
+        [f'blog.post:{pk}', 'blog.sidebar', *(f'blog.author:{author_id}' for author_id in author_ids)],
+        [row['updated_at'], row['comment_modified_at']],
+        row['comment_count'],
+        MARKDOWN_RENDER_VERSION,
+    )
+
 
 # 특정 태그에 해당하는 포스트들을 표시하는 함수형 뷰
+# 목록이 바뀌지 않았으면 렌더링하지 않고 304로 응답
+@conditional_page(tag_page_validators)
 def tag_page(request, slug):
     # slug를 기반으로 태그 객체를 가져옴
     tag = Tag.objects.get(slug=slug)
-    # 해당 태그와 연관된 모든 포스트를 가져옴
-    post_list = tag.post_set.all()
-
-    # 'post_list.html' 템플릿을 렌더링하며, 태그와 포스트 리스트를 포함한 다른 데이터를 전달
+    # 해당 태그와 연관된 모든 포스트를 가져옴 (본문은 불러오지 않음)
+    post_list = tag.post_set.for_list()
+
+    # 예전 ?page=N 링크는 커서 방식 URL로 리디렉션
+    response = legacy_page_redirect(request, post_list, POSTS_PER_PAGE)
+    if response is not None:
+        return response
+    page = paginate_by_cursor(request, post_list, POSTS_PER_PAGE)
+    add_cache_tags(request, 'blog.post-list', 'blog.sidebar')
+
+    # 'post_list.html' 템플릿을 렌더링하며, 태그와 현재 페이지의 포스트 리스트를 전달
+    # 사이드바 카테고리 데이터는 blog.context_processors.categories가 전달
     return render(
         request,
         "blog/post_list.html",
         {
-            "post_list": post_list,  # 선택된 태그와 관련된 포스트 리스트
-            "categories": Category.objects.all(),  # 사이드바에 표시될 카테고리들
-            "no_category_post_count": Post.objects.filter(category=None).count(),  # 카테고리가 없는 포스트 수
+            "post_list": page.object_list,  # 선택된 태그와 관련된 포스트 리스트 (현재 페이지)
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
             "tag": tag,  # 현재 선택된 태그
         }
     )
 
 # 특정 카테고리에 해당하는 포스트들을 표시하는 함수형 뷰
+@conditional_page(category_page_validators)
 def category_page(request, slug):
     # 'no_category' 슬러그일 경우, 카테고리가 없는 포스트들만 가져옴
     if slug == 'no_category':
         category = '미분류'  # 카테고리가 없는 포스트들은 '미분류'로 표시
-        post_list = Post.objects.filter(category=None)  # 카테고리가 없는 포스트들
+        post_list = Post.objects.for_list().filter(category=None)  # 카테고리가 없는 포스트들
     else:
         # 슬러그를 기반으로 카테고리 객체를 가져옴
         category = Category.objects.get(slug=slug)
         # 해당 카테고리에 속한 포스트들을 가져옴
-        post_list = Post.objects.filter(category=category)
+        post_list = Post.objects.for_list().filter(category=category)
 
-    # 'post_list.html' 템플릿을 렌더링하며, 카테고리와 포스트 리스트를 포함한 다른 데이터를 전달
+    # 예전 ?page=N 링크는 커서 방식 URL로 리디렉션
+    response = legacy_page_redirect(request, post_list, POSTS_PER_PAGE)
+    if response is not None:
+        return response
+    page = paginate_by_cursor(request, post_list, POSTS_PER_PAGE)
+    add_cache_tags(request, 'blog.post-list', 'blog.sidebar')
+
+    # 'post_list.html' 템플릿을 렌더링하며, 카테고리와 현재 페이지의 포스트 리스트를 전달
     return render(
         request,
         "blog/post_list.html",
         {
-            "post_list": post_list,  # 선택된 카테고리와 관련된 포스트 리스트
-            "categories": Category.objects.all(),  # 사이드바에 표시될 카테고리들
-            "no_category_post_count": Post.objects.filter(category=None).count(),  # 카테고리가 없는 포스트 수
+            "post_list": page.object_list,  # 선택된 카테고리와 관련된 포스트 리스트 (현재 페이지)
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
             "category": category,  # 현재 선택된 카테고리
         }
     )
 
 # 포스트 리스트를 보여주는 클래스 기반 뷰
-class PostList(ListView):
+# 커서(?before=, ?after=) 방식으로 페이지를 나눠 COUNT, OFFSET 쿼리 없이 조회
+@method_decorator(conditional_page(post_list_page_validators), name='get')
+class PostList(CursorPaginationMixin, ListView):
     model = Post
+    queryset = Post.objects.for_list()  # 목록에서는 본문을 불러오지 않음
     ordering = "-pk"  # 포스트를 최신 순으로 정렬
-    paginate_by = 5  # 페이지당 5개 포스트씩 표시
+    paginate_by = POSTS_PER_PAGE  # 페이지당 5개 포스트씩 표시
 
-    # 템플릿에 추가적인 데이터를 전달하는 메서드
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # 카테고리와 카테고리가 없는 포스트 수를 추가하여 전달
-        context['categories'] = Category.objects.all()
-        context['no_category_post_count'] = Post.objects.filter(category=None).count()
+        # 게시물 목록과 사이드바가 바뀔 때만 페이지 캐시를 무효화
+        add_cache_tags(self.request, 'blog.post-list', 'blog.sidebar')
 
         return context
 
 # 특정 포스트의 상세 정보를 보여주는 클래스 기반 뷰
+# 게시물과 댓글이 바뀌지 않았으면 렌더링하지 않고 304로 응답
+@method_decorator(conditional_page(post_detail_validators), name='get')
 class PostDetail(DetailView):
     model = Post
+    queryset = Post.objects.for_detail()  # 태그, 댓글, 댓글 작성자를 함께 불러옴
 
     # 템플릿에 추가적인 데이터를 전달하는 메서드
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # 카테고리와 카테고리가 없는 포스트 수, 댓글 폼을 추가하여 전달
-        context['categories'] = Category.objects.all()
-        context['no_category_post_count'] = Post.objects.filter(category=None).count()
+        # 댓글 폼을 추가하여 전달
         context['comment_form'] = CommentForm
+        # 댓글 작성자들의 아바타 URL을 한 번에 조회
+        comment_authors = [comment.author for comment in self.object.comment_set.all()]
+        prime_avatar_urls(comment_authors)
+        # 이 게시물(댓글 포함), 사이드바, 댓글 작성자의 아바타가 바뀔 때만 페이지 캐시를 무효화
+        add_cache_tags(self.request, f'blog.post:{self.object.pk}', 'blog.sidebar')
+        add_cache_tags(self.request, *(f'blog.author:{author.pk}' for author in comment_authors))
 
         return context
 
@@ -95,26 +188,14 @@ class PostCreate(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         # 인증된 사용자이고, 스태프 또는 슈퍼유저일 경우에만 포스트를 작성하도록 설정
         if current_user.is_authenticated and (current_user.is_staff or current_user.is_superuser):
             form.instance.author = current_user  # 현재 사용자를 작성자로 설정
-            response = super().form_valid(form)
-
-            # 태그 입력값을 받아 포스트에 추가하는 작업
-            tags_str = self.request.POST.get('tags_str')
-            if tags_str:
-                tags_str = tags_str.strip()  # 공백 제거
-                tags_str = tags_str.replace(',', ';')  # 콤마를 세미콜론으로 변경
-                tags = tags_str.split(';')  # 세미콜론을 기준으로 태그 분리
-
-                # 각 태그에 대해 기존 태그를 찾거나 새로운 태그를 생성하고 포스트에 추가
-                for tag in tags:
-                    tag = tag.strip()  # 각 태그의 공백 제거
-                    tag_obj = Tag.objects.filter(name=tag).first()  # 이미 존재하는 태그 확인
-
-                    if not tag_obj:
-                        # 태그가 없으면 새로 생성
-                        slug = slugify(tag, allow_unicode=True)
-                        tag_obj = Tag.objects.create(name=tag, slug=slug)
-                    
-                    self.object.tags.add(tag_obj)  # 포스트에 태그 추가
+            # 저장과 태그 추가를 한 트랜잭션으로 묶어 커밋될 때 백그라운드 작업(관련 게시물 계산)을 한 번만 추가
+            with transaction.atomic():
+                response = super().form_valid(form)
+
+                # 태그 입력값(콤마/세미콜론 구분)을 받아 포스트에 한 번에 추가
+                tags_str = self.request.POST.get('tags_str')
+                if tags_str:
+                    set_post_tags(self.object, tags_str)
 
             return response
 
@@ -160,30 +241,26 @@ class PostUpdate(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         # 인증된 사용자이고, 스태프 또는 슈퍼유저일 경우에만 포스트를 수정하도록 설정
         if current_user.is_authenticated and (current_user.is_staff or current_user.is_superuser):
             form.instance.author = current_user  # 현재 사용자를 작성자로 설정
-            response = super().form_valid(form)
-
-            # 태그 입력값을 받아 포스트에 추가하는 작업
-            tags_str = self.request.POST.get('tags_str')
-            if tags_str:
-                tags_str = tags_str.strip()  # 공백 제거
-                tags_str = tags_str.replace(',', ';')  # 콤마를 세미콜론으로 변경
-                tags = tags_str.split(';')  # 세미콜론을 기준으로 태그 분리
-
-                # 각 태그에 대해 기존 태그를 찾거나 새로운 태그를 생성하고 포스트에 추가
-                for tag in tags:
-                    tag = tag.strip()  # 각 태그의 공백 제거
-                    tag_obj = Tag.objects.filter(name=tag).first()  # 이미 존재하는 태그 확인
-
-                    if not tag_obj:
-                        # 태그가 없으면 새로 생성
-                        slug = slugify(tag, allow_unicode=True)
-                        tag_obj = Tag.objects.create(name=tag, slug=slug)
-                    
-                    self.object.tags.add(tag_obj)  # 포스트에 태그 추가
+            # 저장과 태그 변경을 한 트랜잭션으로 묶어 커밋될 때 백그라운드 작업(관련 게시물 계산)을 한 번만 추가
+            with transaction.atomic():
+                response = super().form_valid(form)
+
+                # 태그 입력값을 받아 포스트의 태그를 입력값과 같게 맞춤 (입력에서 지운 태그는 제거)
+                tags_str = self.request.POST.get('tags_str')
+                changes = set_post_tags(self.object, tags_str, clear=True) if tags_str is not None else None
+            if changes is not None and changes.removed:
+                removed = ', '.join(tag.name for tag in changes.removed)
+                messages.info(self.request, f'태그가 삭제되었습니다: {removed}')
 
             return response
 
 
+# 첨부 파일을 다운로드하는 뷰 함수 (다운로드 수를 센 뒤 nginx 또는 Django가 파일을 보냄)
+def download_file(request, pk):
+    post = get_object_or_404(Post.objects.only('pk', 'file_upload'), pk=pk)
+    return serve_download(request, post)
+
+
 # 댓글을 새로 작성하는 뷰 함수
 def new_comment(request, pk):
     if request.user.is_authenticated:
@@ -238,22 +315,31 @@ def delete_comment(request, pk):
 
 
 # 포스트를 검색하는 클래스 기반 뷰
-class PostSearch(PostList):
-    paginate_by = None
+# 검색 색인(blog/search.py)에서 점수가 높은 순으로 찾아 보여줌
+# 점수 순 정렬이라 pk 커서를 쓸 수 없으므로 ?page=N 방식으로 페이지를 나눔
+class PostSearch(ListView):
+    model = Post
+    paginate_by = POSTS_PER_PAGE
 
     # 검색어를 기반으로 포스트를 검색하는 메서드
     def get_queryset(self):
         q = self.kwargs.get('q')
-        post_list = Post.objects.filter(
-            Q(title__contains=q) | Q(tags__name__contains=q)
-        ).distinct()
+        return search_posts(Post.objects.for_list(), q)
 
-        return post_list
-    
     # 검색 결과와 함께 검색 정보를 추가하는 메서드
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         q = self.kwargs.get('q')
-        context['search_info'] = f'검색: {q} ({self.get_queryset().count()})'
+
+        # 현재 페이지의 게시물에만 검색어가 강조된 스니펫을 붙임
+        attach_snippets(context['object_list'], q)
+        # 검색 결과 수는 페이지 나누기에서 이미 센 값을 재사용
+        context['search_info'] = f'검색: {q} ({context["paginator"].count})'
+        add_cache_tags(self.request, 'blog.post-list', 'blog.sidebar')
 
         return context
+
+
+# 읽기 경로의 뷰 (blog/urls.py에서 async_views의 같은 이름의 비동기 뷰와 바꿔 쓸 수 있도록 같은 이름을 붙임)
+post_list = PostList.as_view()
+post_detail = PostDetail.as_view()
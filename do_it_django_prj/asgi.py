@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "do_it_django_prj.settings")
+# ASGI로 실행하면 읽기 경로(목록, 상세, 태그, 카테고리, 첫 화면)에 비동기 뷰를 사용 (do_it_django_prj/async_urls.py)
+os.environ.setdefault("ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
@@ -0,0 +1,5 @@
+# ASGI(uvicorn 워커)로 배포할 때 사용하는 URL 설정 (ASYNC_VIEWS=1이면 ROOT_URLCONF로 사용)
+# do_it_django_prj/urls.py와 같은 패턴이고, 읽기 경로(목록, 상세, 태그, 카테고리, 첫 화면)만 비동기 뷰를 사용
+from .urls import build_urlpatterns
+
+urlpatterns = build_urlpatterns("async_urls")
@@ -0,0 +1,515 @@
+"""
+URL 패턴별 응답 시간 측정 (benchmark 명령)
+
+- blog, news, single_pages의 URL 패턴을 모두 찾아서 경로 인자(<int:pk>, <str:slug> 등)를 실제 데이터로 채움
+- Django 테스트 클라이언트(client)와 실제 gunicorn 프로세스(live) 두 가지 방식으로 요청
+  live는 동기 워커(WSGI, mode 'live')와 uvicorn 워커(ASGI + 비동기 뷰, mode 'live-asgi')로 띄울 수 있음
+- live에서는 동시 연결 수(concurrency)만큼 동시에 요청하고 초당 처리량(rps)도 기록하며,
+  요청 헤더를 천천히 보내는 느린 클라이언트(slow_clients)를 함께 붙여서 워커가 묶이는지 비교할 수 있음
+- startup은 gunicorn을 워커마다 앱을 읽는 설정(lazy)과 preload + 워밍업 설정(preload)으로 띄워서
+  워커별 첫 요청 응답 시간과 메모리(RSS, 공유 페이지를 나눠 센 PSS)를 비교 (gunicorn.conf.py)
+- 경로마다 p50/p95/평균 응답 시간, 쿼리 수(client만), 응답 크기를 JSON으로 저장하고
+  다른 커밋에서 저장한 결과와 비교 (compare_results)
+- 로그인해야 하는 페이지(작성/수정)는 시드 스태프 사용자로 로그인해서 측정
+- GET으로 데이터를 바꾸는 경로(댓글 삭제)는 측정하지 않음
+"""
+import http.client
+import os
+import platform
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote
+from contextlib import contextmanager
+from datetime import datetime
+
+import django
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver
+from blog.models import Category, Comment, Post, Tag
+from news.models import NewsPost, Press
+
+# 측정할 URLconf (ASYNC_VIEWS=1이면 async_urls)
+BENCHMARK_URLCONFS = (
+    'blog.urls', 'news.urls', 'single_pages.urls',
+    'blog.async_urls', 'news.async_urls', 'single_pages.async_urls',
+)
+
+# live 모드의 서버 종류별 (gunicorn에 줄 앱과 워커 클래스, 결과의 mode)
+LIVE_SERVERS = {
+    'wsgi': ('do_it_django_prj.wsgi:application', 'sync', 'live'),
+    'asgi': ('do_it_django_prj.asgi:application', 'uvicorn_worker.UvicornWorker', 'live-asgi'),
+}
+
+# startup에서 비교할 gunicorn 설정 (gunicorn.conf.py의 환경 변수)
+STARTUP_PROFILES = {
+    'lazy': {'GUNICORN_PRELOAD': '0', 'GUNICORN_WARMUP': '0'},
+    'preload': {'GUNICORN_PRELOAD': '1', 'GUNICORN_WARMUP': '1'},
+}
+# startup에서 워커가 모두 뜬 뒤 첫 요청을 보내기 전까지 기다리는 시간(초) (워커가 앱을 다 읽도록)
+STARTUP_SETTLE = 2
+
+# 느린 클라이언트가 요청 헤더를 한 줄씩 보내는 간격(초)
+SLOW_CLIENT_INTERVAL = 1
+# live 모드에서 응답을 기다리는 시간(초), 넘으면 상태 코드 0(시간 초과)으로 기록
+# (느린 클라이언트가 동기 워커를 모두 차지하면 서버가 요청을 받지 못함)
+LIVE_TIMEOUT = 10
+
+# GET 요청으로 데이터를 바꾸므로 측정하지 않는 경로
+UNSAFE_ROUTES = ('blog/delete_comment/<int:pk>',)
+
+# 검색 경로(<str:q>)에 사용할 검색어
+SEARCH_QUERY = '장고'
+
+PARAM_RE = re.compile(r'<(?:(\w+):)?(\w+)>')
+
+
+def discover_routes():
+    """
+    측정할 URL 패턴 목록을 반환 (예: 'blog/<int:pk>', 'news/category/<str:slug>', '')
+    """
+    routes = []
+    for resolver in get_resolver().url_patterns:
+        if isinstance(resolver, URLResolver) and getattr(resolver.urlconf_module, '__name__', None) in BENCHMARK_URLCONFS:
+            prefix = str(resolver.pattern)
+            for pattern in resolver.url_patterns:
+                route = prefix + str(pattern.pattern)
+                if route not in UNSAFE_ROUTES:
+                    routes.append(route)
+    return routes
+
+
+def sample_values(user):
+    """
+    경로 인자를 채울 값: 댓글이 가장 많은 게시물, 게시물이 가장 많은 태그/카테고리/언론사,
+    첨부 파일이 있는 게시물, 측정 사용자(user)가 쓴 게시물과 댓글
+    """
+    post = Post.objects.annotate(n=Count('comment')).order_by('-n', 'pk').first()
+    tag = Tag.objects.annotate(n=Count('post')).order_by('-n', 'pk').first()
+    category = Category.objects.annotate(n=Count('post')).order_by('-n', 'pk').first()
+    press = Press.objects.annotate(n=Count('newspost')).order_by('-n', 'pk').first()
+    news_post = NewsPost.objects.order_by('-pk').first()
+    file_post = Post.objects.exclude(file_upload='').order_by('-pk').first()
+    news_file_post = NewsPost.objects.exclude(file_upload='').order_by('-pk').first()
+    own_post = Post.objects.filter(author=user).order_by('-pk').first() if user else None
+    own_comment = Comment.objects.filter(author=user).order_by('-pk').first() if user else None
+
+    return {
+        'blog.post': post and post.pk,
+        'blog.tag': tag and tag.slug,
+        'blog.category': category and category.slug,
+        'blog.own_post': own_post and own_post.pk,
+        'blog.own_comment': own_comment and own_comment.pk,
+        'blog.file_post': file_post and file_post.pk,
+        'news.post': news_post and news_post.pk,
+        'news.file_post': news_file_post and news_file_post.pk,
+        'news.category': press and press.slug,
+        'search': SEARCH_QUERY,
+    }
+
+
+def _sample_key(route, name):
+    # 경로 인자 이름과 경로 모양으로 어떤 값을 넣을지 결정
+    app = route.split('/', 1)[0]
+    if name == 'q':
+        return 'search'
+    if name == 'slug':
+        return f'{app}.tag' if '/tag/' in route else f'{app}.category'
+    if 'download' in route:
+        return f'{app}.file_post'
+    if 'update_post' in route:
+        return 'blog.own_post'
+    if 'comment/' in route:
+        return 'blog.own_comment'
+    return f'{app}.post'
+
+
+def build_url(route, samples):
+    """
+    경로 인자를 채운 URL을 반환 (채울 값이 없으면 None)
+    """
+    values = {}
+    for _, name in PARAM_RE.findall(route):
+        value = samples.get(_sample_key(route, name))
+        if value is None:
+            return None
+        values[name] = value
+    return '/' + PARAM_RE.sub(lambda match: quote(str(values[match.group(2)])), route)
+
+
+def percentile(values, percent):
+    """
+    nearest-rank 방식의 백분위수
+    """
+    ordered = sorted(values)
+    rank = max(int(round(percent / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(mode, route, url, authenticated, timings, statuses, sizes, queries, rps=None):
+    return {
+        'mode': mode,
+        'route': route,
+        'url': url,
+        'authenticated': authenticated,
+        'requests': len(timings),
+        'status': sorted(set(statuses)),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'queries': statistics.median(queries) if queries else None,
+        'bytes': int(statistics.median(sizes)),
+        'rps': rps,
+    }
+
+
+def _needs_login(anonymous_status, logged_in_status):
+    # 비로그인 요청이 리디렉션/거부되고 로그인하면 다르게 응답하는 페이지는 로그인해서 측정
+    return anonymous_status in (302, 401, 403) and logged_in_status != anonymous_status
+
+
+def _bench_url(url, cold, i):
+    # cold이면 쿼리 문자열을 바꿔서 페이지 캐시를 거치지 않게 함 (뷰는 모르는 인자를 무시)
+    if not cold:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}_bench={i}"
+
+
+def run_client(targets, user, requests, warmup, cold, gzip):
+    """
+    Django 테스트 클라이언트로 경로마다 요청을 보내고 결과 목록을 반환
+    테스트 클라이언트의 호스트(testserver)를 허용하도록 ALLOWED_HOSTS에 추가해서 실행
+    """
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        return _run_client(targets, user, requests, warmup, cold, gzip)
+
+
+def _run_client(targets, user, requests, warmup, cold, gzip):
+    headers = {'HTTP_ACCEPT_ENCODING': 'gzip'} if gzip else {}
+    anonymous = Client(**headers)
+    logged_in = Client(**headers)
+    if user is not None:
+        logged_in.force_login(user)
+
+    results = []
+    for route, url in targets:
+        authenticated = user is not None and _needs_login(anonymous.get(url).status_code, logged_in.get(url).status_code)
+        client = logged_in if authenticated else anonymous
+
+        timings, statuses, sizes, queries = [], [], [], []
+        for i in range(warmup + requests):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = client.get(_bench_url(url, cold, i))
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = (time.perf_counter() - started) * 1000
+            if i >= warmup:
+                timings.append(elapsed)
+                statuses.append(response.status_code)
+                sizes.append(len(body))
+                queries.append(len(captured.captured_queries))
+
+        results.append(summarize('client', route, url, authenticated, timings, statuses, sizes, queries))
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn_server(workers, server='wsgi', timeout=30, extra_env=None):
+    """
+    현재 설정(DB 등 환경 변수)으로 gunicorn을 띄우고 (host, port, 마스터 pid)를 반환, 끝나면 종료
+    server가 'asgi'이면 uvicorn 워커로 asgi.py를 실행 (읽기 경로는 비동기 뷰)
+    extra_env로 gunicorn.conf.py의 설정(GUNICORN_PRELOAD 등)을 바꿀 수 있음
+    """
+    app, worker_class, _ = LIVE_SERVERS[server]
+    port = _free_port()
+    env = dict(os.environ, **(extra_env or {}))
+    hosts = env.get('DJANGO_ALLOWED_HOSTS')
+    if hosts:
+        env['DJANGO_ALLOWED_HOSTS'] = f'{hosts} 127.0.0.1'
+    # 벤치마크를 실행한 프로세스의 설정이 아니라 서버 종류에 맞는 URL 설정을 사용
+    env.pop('ASYNC_VIEWS', None)
+
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', app,
+            '--worker-class', worker_class,
+            '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers),
+            '--log-level', 'warning',
+        ],
+        env=env,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'gunicorn이 종료됐습니다. (종료 코드 {process.returncode})')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f'gunicorn이 {timeout}초 안에 시작되지 않았습니다.')
+                time.sleep(0.1)
+        yield '127.0.0.1', port, process.pid
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _http_get(conn, url, headers):
+    conn.request('GET', url, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+@contextmanager
+def slow_clients(host, port, count):
+    """
+    요청 헤더를 SLOW_CLIENT_INTERVAL초마다 한 줄씩 끝없이 보내는 연결 count개를 유지 (느린 모바일 클라이언트 흉내)
+    동기 워커는 헤더를 다 받을 때까지 이 연결에 묶이고, uvicorn 워커는 기다리는 동안 다른 요청을 처리함
+    """
+    stopped = threading.Event()
+
+    def trickle():
+        while not stopped.is_set():
+            try:
+                with socket.create_connection((host, port), timeout=10) as sock:
+                    sock.sendall(b'GET / HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+                    i = 0
+                    while not stopped.wait(SLOW_CLIENT_INTERVAL):
+                        sock.sendall(f'X-Slow-{i}: 1\r\n'.encode())
+                        i += 1
+            except OSError:
+                # 서버가 연결을 끊으면 (헤더 크기 제한, 타임아웃) 다시 연결
+                stopped.wait(0.1)
+
+    threads = [threading.Thread(target=trickle, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    try:
+        # 느린 연결이 워커를 차지할 때까지 잠시 기다린 뒤 측정
+        if count:
+            time.sleep(SLOW_CLIENT_INTERVAL)
+        yield
+    finally:
+        stopped.set()
+        for thread in threads:
+            thread.join()
+
+
+def _try_http_get(conn, url, headers):
+    # 시간 초과나 연결 오류는 상태 코드 0으로 반환 (다음 요청은 새 연결로)
+    try:
+        return _http_get(conn, url, headers)
+    except OSError:
+        conn.close()
+        return 0, b''
+
+
+def _measure_live(host, port, url, cold, headers, requests, warmup, concurrency):
+    """
+    concurrency개의 연결이 동시에 (warmup + requests)번씩 요청하고 (응답 시간, 상태 코드, 응답 크기, rps)를 반환
+    """
+    timings, statuses, sizes = [], [], []
+    lock = threading.Lock()
+    ready = threading.Barrier(concurrency + 1)
+
+    def worker(n):
+        conn = http.client.HTTPConnection(host, port, timeout=LIVE_TIMEOUT)
+        for i in range(warmup):
+            _try_http_get(conn, _bench_url(url, cold, f'{n}-{i}'), headers)
+        ready.wait()
+        for i in range(warmup, warmup + requests):
+            started = time.perf_counter()
+            status, body = _try_http_get(conn, _bench_url(url, cold, f'{n}-{i}'), headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                timings.append(elapsed)
+                statuses.append(status)
+                sizes.append(len(body))
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    # 모든 연결의 워밍업이 끝난 뒤부터 처리량을 잼
+    ready.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    rps = round(len(timings) / (time.perf_counter() - started), 1)
+    return timings, statuses, sizes, rps
+
+
+def run_live(targets, user, requests, warmup, cold, gzip, workers, server='wsgi', concurrency=1, slow=0):
+    """
+    gunicorn 프로세스에 HTTP 요청을 보내고 결과 목록을 반환 (연결은 keep-alive로 재사용)
+    concurrency개의 연결이 경로마다 requests번씩 동시에 요청하고, slow개의 느린 클라이언트를 함께 붙임
+    쿼리 수는 서버 프로세스 안에서만 알 수 있으므로 None
+    """
+    base_headers = {'Accept-Encoding': 'gzip'} if gzip else {}
+    auth_headers = dict(base_headers)
+    if user is not None:
+        # 테스트 클라이언트로 세션을 만들고 그 쿠키를 그대로 사용 (같은 DB의 세션)
+        client = Client()
+        client.force_login(user)
+        auth_headers['Cookie'] = f"sessionid={client.cookies['sessionid'].value}"
+
+    mode = LIVE_SERVERS[server][2]
+    results = []
+    with gunicorn_server(workers, server) as (host, port, _):
+        # 로그인 여부는 느린 클라이언트를 붙이기 전에 확인
+        checked = []
+        for route, url in targets:
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            authenticated = user is not None and _needs_login(
+                _http_get(conn, url, base_headers)[0], _http_get(conn, url, auth_headers)[0],
+            )
+            conn.close()
+            checked.append((route, url, authenticated))
+
+        with slow_clients(host, port, slow):
+            for route, url, authenticated in checked:
+                headers = auth_headers if authenticated else base_headers
+                timings, statuses, sizes, rps = _measure_live(
+                    host, port, url, cold, headers, requests, warmup, concurrency,
+                )
+                results.append(summarize(mode, route, url, authenticated, timings, statuses, sizes, [], rps))
+    return results
+
+
+def _child_pids(pid):
+    # /proc에서 부모 프로세스가 pid인 프로세스 목록 (Linux)
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # 'pid (이름) 상태 ppid ...' (이름에 공백이 있을 수 있으므로 마지막 ')' 뒤에서 나눔)
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def _memory_mb(pid, field, path='status'):
+    # /proc/<pid>/status의 VmRSS, /proc/<pid>/smaps_rollup의 Pss 등 (kB)을 MB로 반환
+    try:
+        with open(f'/proc/{pid}/{path}') as f:
+            for line in f:
+                if line.startswith(f'{field}:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def run_startup(url, workers, server='wsgi', timeout=30):
+    """
+    STARTUP_PROFILES의 설정마다 gunicorn을 새로 띄워서 워커별 첫 요청 응답 시간과 메모리(RSS/PSS)를 재고 결과 목록을 반환
+    워커 수만큼 연결을 동시에 열어 각 워커가 첫 요청을 하나씩 받도록 함
+    """
+    results = []
+    for profile, extra_env in STARTUP_PROFILES.items():
+        with gunicorn_server(workers, server, timeout, extra_env) as (host, port, pid):
+            started = time.monotonic()
+            while len(_child_pids(pid)) < workers:
+                if time.monotonic() - started > timeout:
+                    raise RuntimeError(f'gunicorn 워커가 {timeout}초 안에 모두 시작되지 않았습니다.')
+                time.sleep(0.1)
+            time.sleep(STARTUP_SETTLE)
+
+            timings, statuses, _, _ = _measure_live(host, port, url, False, {}, 1, 0, workers)
+            worker_pids = _child_pids(pid)
+            results.append({
+                'mode': 'startup',
+                'server': server,
+                'profile': profile,
+                'url': url,
+                'workers': workers,
+                'status': sorted(set(statuses)),
+                'first_request_ms': [round(timing, 3) for timing in sorted(timings)],
+                'rss_mb': [_memory_mb(worker_pid, 'VmRSS') for worker_pid in worker_pids],
+                'pss_mb': [_memory_mb(worker_pid, 'Pss', 'smaps_rollup') for worker_pid in worker_pids],
+                'master_rss_mb': _memory_mb(pid, 'VmRSS'),
+            })
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_meta(options):
+    """
+    결과 JSON에 함께 저장할 실행 환경과 데이터 규모
+    """
+    return {
+        'commit': _git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'data': {
+            'posts': Post.objects.count(),
+            'news': NewsPost.objects.count(),
+            'comments': Comment.objects.count(),
+            'tags': Tag.objects.count(),
+            'categories': Category.objects.count(),
+            'users': User.objects.count(),
+        },
+        'options': options,
+    }
+
+
+def compare_results(baseline, current, threshold):
+    """
+    두 결과의 같은 (mode, route)를 비교해서 (route, mode, 항목, 이전 값, 현재 값, 회귀 여부) 목록을 반환
+    응답 시간과 응답 크기는 threshold(%)보다 늘어나면, 처리량(rps)은 threshold(%)보다 줄어들면,
+    쿼리 수는 하나라도 늘어나면 회귀로 봄
+    """
+    previous = {(result['mode'], result['route']): result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = previous.get((result['mode'], result['route']))
+        if before is None:
+            continue
+        for field in ('p50_ms', 'p95_ms', 'queries', 'bytes', 'rps'):
+            old, new = before.get(field), result.get(field)
+            if old is None or new is None:
+                continue
+            if field == 'queries':
+                regressed = new > old
+            elif field == 'rps':
+                regressed = old > 0 and (old - new) / old * 100 > threshold
+            else:
+                regressed = old > 0 and (new - old) / old * 100 > threshold
+            rows.append((result['route'], result['mode'], field, old, new, regressed))
+    return rows
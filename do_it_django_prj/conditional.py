@@ -0,0 +1,77 @@
+"""
+조건부 GET(ETag / Last-Modified) 지원
+
+- 뷰마다 페이지 내용을 결정하는 값(게시물 updated_at, 댓글 modified_at, 게시물 수 등)을
+  한 번의 집계 쿼리로 구하고, 템플릿을 렌더링하기 전에 If-None-Match/If-Modified-Since와 비교해 304로 응답
+- 태그/카테고리 이름, 사이드바처럼 게시물 시각에 나타나지 않는 변경은
+  페이지 캐시의 무효화 시각(page_cache.get_last_invalidated)으로 반영
+- 로그인 사용자마다 화면(navbar 등)이 다르므로 ETag에 사용자 id를 포함
+- 같은 ETag를 gzip/비압축 응답에 함께 쓰므로 약한(weak) ETag를 사용 (nginx에서도 그대로 재검증 가능)
+- 비동기 뷰(async_views.py)에도 같은 데코레이터를 사용 (검증값은 스레드에서 미리 계산)
+"""
+import hashlib
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.views.decorators.http import condition
+
+from .page_cache import get_last_invalidated
+
+# 한 요청에 대한 검증값 (ETag, Last-Modified)
+PageValidators = namedtuple('PageValidators', ['etag', 'last_modified'])
+
+
+def build_validators(request, cache_tags, timestamps, *parts):
+    """
+    페이지 내용을 결정하는 시각(timestamps)과 값(parts), 페이지 캐시 태그로 PageValidators를 만듦
+    """
+    # USE_TZ = False이면 DB의 시각과 같은 naive(로컬) 시각으로 비교
+    invalidated_at = datetime.fromtimestamp(get_last_invalidated(cache_tags, request), tz=timezone.utc if settings.USE_TZ else None)
+    last_modified = max([timestamp for timestamp in timestamps if timestamp is not None] + [invalidated_at])
+
+    key = repr((request.user.pk, [str(timestamp) for timestamp in timestamps], invalidated_at.timestamp(), parts))
+    etag = f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
+    return PageValidators(etag, last_modified)
+
+
+def conditional_page(get_validators):
+    """
+    get_validators(request, *args, **kwargs)가 반환한 PageValidators로 조건부 GET을 처리하는 뷰 데코레이터
+    get_validators가 None을 반환하면 (예: 게시물이 없음) 검증 없이 뷰를 그대로 실행
+    """
+    def validators(request, *args, **kwargs):
+        # ETag와 Last-Modified를 따로 구하지 않도록 요청마다 한 번만 계산
+        if not hasattr(request, '_page_validators'):
+            # 표시할 메시지가 있는 요청은 304로 응답하면 메시지가 사라지므로 검증하지 않음
+            if 'messages' in request.COOKIES:
+                request._page_validators = None
+            else:
+                request._page_validators = get_validators(request, *args, **kwargs)
+        return request._page_validators
+
+    def etag_func(request, *args, **kwargs):
+        page_validators = validators(request, *args, **kwargs)
+        return page_validators.etag if page_validators else None
+
+    def last_modified_func(request, *args, **kwargs):
+        page_validators = validators(request, *args, **kwargs)
+        return page_validators.last_modified if page_validators else None
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+        if not iscoroutinefunction(view):
+            return conditional_view
+
+        # condition은 비동기 뷰에서도 etag_func를 이벤트 루프에서 바로 호출하므로,
+        # DB/캐시를 조회하는 검증값 계산은 스레드에서 먼저 해 두고 condition에서는 저장된 값만 사용
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            await sync_to_async(validators)(request, *args, **kwargs)
+            return await conditional_view(request, *args, **kwargs)
+
+        return async_view
+
+    return decorator
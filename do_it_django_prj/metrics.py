@@ -0,0 +1,172 @@
+"""
+Prometheus 메트릭 수집과 /metrics 엔드포인트
+
+- MetricsMiddleware가 요청마다 URL 이름(예: blog:post_detail)별 응답 시간, 상태 코드, 처리 중인 요청 수를 기록
+- DB 쿼리 수/시간은 QueryStatsMiddleware(do_it_django_prj/query_stats.py)가 모은 값을 받아서 기록
+- 앱의 캐시(페이지 캐시, 사이드바, 아바타)는 count_cache()로 적중(hit)/실패(miss) 횟수를 기록
+- gunicorn 워커 여러 개의 값을 합치기 위해 PROMETHEUS_MULTIPROC_DIR가 있으면 multiprocess 모드를 사용
+  (각 워커가 디렉터리의 파일에 값을 쓰고, /metrics 요청을 받은 워커가 모든 파일을 합쳐서 응답, gunicorn.conf.py 참고)
+- /metrics는 METRICS_ALLOWED_IPS에서 온 요청에만 응답하고 나머지는 404 (nginx에서도 막음)
+"""
+import ipaddress
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.urls import Resolver404, resolve
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+# 응답 시간 구간(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 요청 하나의 쿼리 수 구간
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# 라벨 값이 끝없이 늘어나지 않도록 이 밖의 메서드는 'other'로 기록
+KNOWN_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+# URL 패턴에 맞지 않는 요청(404)의 view 라벨
+UNRESOLVED_VIEW = '<unresolved>'
+
+REQUESTS = Counter(
+    'django_http_requests_total', '요청 수', ['method', 'view', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'django_http_request_duration_seconds', '요청 처리 시간(초)', ['method', 'view'], buckets=LATENCY_BUCKETS,
+)
+# livesum: 살아 있는 워커들의 값을 더함 (처리 중인 요청 수 / 워커 수 = 워커 포화도)
+REQUESTS_IN_PROGRESS = Gauge(
+    'django_http_requests_in_progress', '처리 중인 요청 수', multiprocess_mode='livesum',
+)
+WORKER_PROCESSES = Gauge(
+    'django_worker_processes', '요청을 처리하는 워커 프로세스 수', multiprocess_mode='livesum',
+)
+DB_QUERIES = Histogram(
+    'django_db_queries_per_request', '요청 하나의 쿼리 수', ['view'], buckets=QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Histogram(
+    'django_db_duration_seconds', '요청 하나의 DB 시간(초)', ['view'], buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    'django_db_query_duration_seconds', '쿼리 하나의 실행 시간(초)', buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'django_app_cache_requests_total', '앱 캐시 조회 수', ['cache', 'result'],
+)
+
+
+def count_cache(name, hits=0, misses=0):
+    """
+    앱 캐시(name)의 적중/실패 횟수를 기록 (예: count_cache('page', hits=1))
+    """
+    if hits:
+        CACHE_REQUESTS.labels(name, 'hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(name, 'miss').inc(misses)
+
+
+def view_label(request):
+    """
+    요청이 연결된 URL 이름 (예: blog:post_detail), 이름이 없는 패턴은 URL 패턴 그대로
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        # 뷰까지 가지 않은 응답(페이지 캐시 적중, 리디렉션 등)은 직접 URL을 찾음
+        try:
+            match = resolve(request.path_info, getattr(request, 'urlconf', None))
+        except Resolver404:
+            return UNRESOLVED_VIEW
+    return match.view_name if match.url_name else match.route
+
+
+def get_registry():
+    """
+    /metrics로 내보낼 레지스트리 (multiprocess 모드이면 모든 워커의 파일을 합친 레지스트리)
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def is_internal_request(request):
+    """
+    METRICS_ALLOWED_IPS(IP 또는 네트워크 목록)에서 온 요청인지 확인
+    X-Forwarded-For는 위조할 수 있으므로 REMOTE_ADDR만 확인
+    """
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+
+# Prometheus 텍스트 형식으로 메트릭을 반환하는 뷰 (내부 요청만)
+def metrics_view(request):
+    if not is_internal_request(request):
+        raise Http404
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+# 요청별 메트릭을 기록하는 미들웨어
+# 다른 미들웨어의 처리 시간까지 포함하도록 MIDDLEWARE 목록의 맨 앞에 둠 (ASGI에서는 비동기로 동작)
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pid = None
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+        self.finish(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+        self.finish(request, response, started)
+        return response
+
+    def start(self):
+        # 워커 프로세스마다 한 번 (gunicorn --preload로 fork된 경우에도 워커의 pid로 기록)
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            WORKER_PROCESSES.set(1)
+        REQUESTS_IN_PROGRESS.inc()
+        return time.perf_counter()
+
+    def finish(self, request, response, started):
+        duration = time.perf_counter() - started
+        view = view_label(request)
+        if view != 'metrics':
+            self.record(request, response, view, duration)
+
+    def record(self, request, response, view, duration):
+        method = request.method if request.method in KNOWN_METHODS else 'other'
+        REQUESTS.labels(method, view, str(response.status_code)).inc()
+        REQUEST_LATENCY.labels(method, view).observe(duration)
+
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            DB_QUERIES.labels(view).observe(stats.count)
+            DB_DURATION.labels(view).observe(stats.duration)
+            for query_duration in stats.durations:
+                DB_QUERY_DURATION.observe(query_duration)
@@ -0,0 +1,203 @@
+"""
+비로그인 사용자용 전체 페이지 응답 캐시
+
+- 비로그인 GET 요청의 응답(HTML)을 URL별로 gzip 압축해서 캐시에 저장
+- 뷰는 add_cache_tags()로 페이지가 의존하는 데이터를 태그로 표시하고, 태그가 붙은 페이지만 캐시함
+  예: 'blog.post:7' (7번 게시물 상세), 'blog.post-list' (게시물 목록), 'blog.sidebar' (사이드바 카테고리)
+- 데이터가 바뀌면 시그널에서 invalidate_cache_tags()로 태그의 무효화 시각을 기록하고,
+  렌더링을 시작한 시각이 그보다 앞선 페이지만 무효화 (예: 7번 게시물에 댓글이 달리면 /blog/7만 다시 렌더링)
+  렌더링 도중에 데이터가 바뀐 경우에도 예전 내용이 캐시에 남지 않음
+- 캐시 적중/실패 횟수를 메트릭(do_it_django_prj/metrics.py, 모든 워커의 합)에 기록하고 응답에 X-Cache 헤더(HIT/MISS)를 붙임
+"""
+import gzip
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+from .metrics import count_cache
+
+# 페이지 캐시 유지 시간(초), 태그 무효화가 누락되더라도 이 시간이 지나면 다시 렌더링
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+PAGE_KEY = 'pagecache:page:{}'
+TAG_KEY = 'pagecache:tag:{}'
+
+# 캐시된 응답에 그대로 다시 붙일 헤더 (ETag, Last-Modified는 캐시 적중 시 조건부 GET에도 사용)
+STORED_HEADERS = ('Content-Type', 'Content-Language', 'ETag', 'Last-Modified')
+
+
+def add_cache_tags(request, *tags):
+    """
+    현재 요청의 응답이 의존하는 데이터 태그를 추가 (태그가 있는 응답만 페이지 캐시에 저장됨)
+    """
+    if not hasattr(request, '_page_cache_tags'):
+        request._page_cache_tags = set()
+    request._page_cache_tags.update(tags)
+
+
+def invalidate_cache_tags(*tags):
+    """
+    태그의 무효화 시각을 현재 시각으로 기록해서 그 전에 렌더링된 페이지를 모두 무효화
+    """
+    now = time.time()
+    cache.set_many({TAG_KEY.format(tag): now for tag in tags}, None)
+
+
+def get_last_invalidated(tags, request=None):
+    """
+    태그들 중 가장 최근에 무효화된 시각을 반환
+    캐시에서 사라진 태그는 언제 무효화됐는지 알 수 없으므로 지금 무효화된 것으로 기록
+    페이지 캐시에 저장할 요청(request)의 렌더링 중에 조회하면 store_response와 같이 렌더링 직전에 무효화된 것으로 기록
+    (지금으로 기록하면 처음 쓰이는 태그가 렌더링 시작보다 늦게 무효화된 것이 되어 이 페이지가 캐시되지 않음)
+    """
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    stored = cache.get_many(keys)
+    started_at = getattr(request, '_page_cache_started_at', None)
+    missing_at = time.time() if started_at is None else started_at - 0.001
+
+    for key in keys:
+        if key not in stored:
+            # 다른 요청이 동시에 기록한 시각이 있으면 그 값을 사용
+            cache.add(key, missing_at, None)
+            stored[key] = cache.get(key, 0)
+
+    return max(stored.values(), default=0)
+
+
+def _page_key(request):
+    url = request.build_absolute_uri()
+    return PAGE_KEY.format(hashlib.md5(url.encode()).hexdigest())
+
+
+def _accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+# 비로그인 GET 요청에 캐시된 페이지를 돌려주고, 캐시할 수 있는 응답은 저장하는 미들웨어
+# 인증/세션/메시지 미들웨어 뒤(MIDDLEWARE 목록의 마지막)에 둬야 request.user를 확인할 수 있음
+# ASGI에서는 비동기로 동작하고, 캐시 조회/저장만 스레드에서 실행
+class PageCacheMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_cacheable_request(request, request.user):
+            return self.get_response(request)
+
+        key = _page_key(request)
+        started_at = request._page_cache_started_at = time.time()
+        response = self.get_hit_response(request, key)
+        if response is not None:
+            return response
+
+        response = self.get_response(request)
+        self.process_miss(request, key, response, started_at)
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_cacheable_request(request, await request.auser()):
+            return await self.get_response(request)
+
+        key = _page_key(request)
+        started_at = request._page_cache_started_at = time.time()
+        response = await sync_to_async(self.get_hit_response)(request, key)
+        if response is not None:
+            return response
+
+        response = await self.get_response(request)
+        await sync_to_async(self.process_miss)(request, key, response, started_at)
+        return response
+
+    def get_hit_response(self, request, key):
+        """
+        캐시된 페이지가 있으면 응답(또는 304)을 반환하고, 없으면 None
+        """
+        response = self.get_cached_response(request, key)
+        if response is None:
+            return None
+        count_cache('page', hits=1)
+        # 클라이언트가 같은 버전을 갖고 있으면 본문 없이 304로 응답
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+            response=response,
+        )
+
+    def process_miss(self, request, key, response, started_at):
+        if self.is_cacheable_response(request, response):
+            count_cache('page', misses=1)
+            self.store_response(request, key, response, started_at)
+            response['X-Cache'] = 'MISS'
+
+    def is_cacheable_request(self, request, user):
+        # 로그인 사용자나 표시할 메시지(messages 쿠키)가 있는 요청은 사용자마다 화면이 다름
+        return (
+            request.method == 'GET'
+            and not user.is_authenticated
+            and 'messages' not in request.COOKIES
+        )
+
+    def is_cacheable_response(self, request, response):
+        tags = getattr(request, '_page_cache_tags', None)
+        session = getattr(request, 'session', None)
+        return (
+            bool(tags)
+            and response.status_code == 200
+            and not response.streaming
+            and not response.has_header('Content-Encoding')
+            and not response.cookies
+            # CSRF 토큰이나 세션을 사용한 페이지는 사용자마다 내용이 다름
+            and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            and not (session is not None and session.modified)
+            and 'private' not in response.get('Cache-Control', '')
+            and 'no-store' not in response.get('Cache-Control', '')
+        )
+
+    def store_response(self, request, key, response, started_at):
+        # 처음 쓰이는 태그는 렌더링 직전에 무효화된 것으로 기록 (이 페이지는 유효, 그 전의 페이지는 무효)
+        for tag in request._page_cache_tags:
+            cache.add(TAG_KEY.format(tag), started_at - 0.001, None)
+
+        cache.set(key, {
+            'tags': sorted(request._page_cache_tags),
+            'rendered_at': started_at,
+            'status': response.status_code,
+            'headers': {name: response[name] for name in STORED_HEADERS if response.has_header(name)},
+            'body': gzip.compress(response.content),
+        }, PAGE_CACHE_TIMEOUT)
+
+    def get_cached_response(self, request, key):
+        entry = cache.get(key)
+        if entry is None:
+            return None
+
+        # 렌더링을 시작한 뒤에 태그가 하나라도 무효화됐으면 예전 페이지
+        if get_last_invalidated(entry['tags']) >= entry['rendered_at']:
+            return None
+
+        if _accepts_gzip(request):
+            response = HttpResponse(entry['body'], status=entry['status'])
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(entry['body']), status=entry['status'])
+
+        for name, value in entry['headers'].items():
+            response[name] = value
+        response['Content-Length'] = len(response.content)
+        response['X-Cache'] = 'HIT'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
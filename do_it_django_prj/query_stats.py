@@ -0,0 +1,149 @@
+"""
+요청별 SQL 쿼리 수/시간 측정과 N+1 쿼리 감지
+
+- QueryStatsMiddleware가 요청마다 모든 DB 연결에 execute_wrapper를 걸어 쿼리 수와 DB 시간을 셈
+- 값(파라미터, 숫자, 문자열, IN 목록)을 지운 쿼리 모양(shape)이 QUERY_STATS_REPEAT_THRESHOLD번 이상
+  반복되면 N+1 쿼리로 보고 경고 로그를 남김 (예: 템플릿의 post.tags.exists, category.post_set.count)
+- DB 시간이 QUERY_STATS_SLOW_MS를 넘거나 쿼리 수가 QUERY_STATS_MAX_QUERIES를 넘는 요청도 경고 로그를 남김
+- 스태프에게는 응답에 Server-Timing 헤더(db, app)를 붙여서 브라우저 개발자 도구에서 바로 확인할 수 있게 함
+- 테스트에서는 do_it_django_prj.testing.QueryCountTestMixin으로 쿼리 수가 행 수에 따라 늘어나는지 확인
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# 쿼리 모양을 만들 때 지울 값들
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN \((?:[^()]*)\)', re.IGNORECASE)
+SPACE_RE = re.compile(r'\s+')
+
+
+def query_shape(sql):
+    """
+    값만 다른 쿼리를 같은 것으로 묶기 위한 쿼리 모양
+    예: SELECT ... WHERE "blog_post"."id" = %s  /  ... WHERE "id" IN (%s, %s) -> ... WHERE "id" IN (...)
+    """
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return SPACE_RE.sub(' ', sql).strip()
+
+
+# DB 연결의 execute_wrapper로 걸어서 실행된 쿼리 수, 시간, 모양을 모으는 클래스
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.durations = []
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.duration += duration
+            self.durations.append(duration)
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def repeated(self, threshold=None):
+        """
+        threshold번(기본값: QUERY_STATS_REPEAT_THRESHOLD) 이상 반복된 쿼리 모양과 횟수 목록 (많은 순)
+        """
+        if threshold is None:
+            threshold = settings.QUERY_STATS_REPEAT_THRESHOLD
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def capture(self):
+        """
+        모든 DB 연결에 이 객체를 execute_wrapper로 거는 context manager
+        """
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+def server_timing(stats, total_ms):
+    """
+    Server-Timing 헤더 값 (예: db;dur=12.3;desc="15 queries, 10 repeated", app;dur=40.1)
+    """
+    repeated = sum(count for _, count in stats.repeated())
+    desc = f'{stats.count} queries' + (f', {repeated} repeated' if repeated else '')
+    return f'db;dur={stats.duration_ms:.1f};desc="{desc}", app;dur={total_ms:.1f}'
+
+
+# 요청별 쿼리 수/시간을 측정하는 미들웨어
+# 세션/인증 미들웨어의 쿼리까지 포함하도록 MIDDLEWARE 목록의 맨 앞에 둠
+# ASGI에서는 비동기로 동작 (비동기 ORM의 쿼리는 요청마다 정해진 스레드에서 실행되므로 그 스레드의 연결에 execute_wrapper를 걺)
+class QueryStatsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        # MetricsMiddleware(do_it_django_prj/metrics.py)에서 쿼리 수/시간을 기록할 수 있도록 요청에 저장
+        stats = request.query_stats = QueryStats()
+        started = time.perf_counter()
+        with stats.capture():
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        self.log(request, stats, total_ms)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            response['Server-Timing'] = server_timing(stats, total_ms)
+        return response
+
+    async def __acall__(self, request):
+        stats = request.query_stats = QueryStats()
+        started = time.perf_counter()
+        capture = await sync_to_async(stats.capture)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(capture.close)()
+        total_ms = (time.perf_counter() - started) * 1000
+
+        self.log(request, stats, total_ms)
+        user = await request.auser() if hasattr(request, 'auser') else None
+        if user is not None and user.is_staff:
+            response['Server-Timing'] = server_timing(stats, total_ms)
+        return response
+
+    def log(self, request, stats, total_ms):
+        repeated = stats.repeated()
+        if repeated:
+            logger.warning(
+                'N+1 쿼리 의심 %s %s: 쿼리 %d개 중 같은 모양 반복\n%s',
+                request.method, request.get_full_path(), stats.count,
+                '\n'.join(f'  {count}회: {shape}' for shape, count in repeated),
+            )
+        if stats.duration_ms > settings.QUERY_STATS_SLOW_MS or stats.count > settings.QUERY_STATS_MAX_QUERIES:
+            logger.warning(
+                '느린 요청 %s %s: 쿼리 %d개, DB %.1fms, 전체 %.1fms',
+                request.method, request.get_full_path(), stats.count, stats.duration_ms, total_ms,
+            )
@@ -23,7 +23,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('SECRET_KEY', "django-insecure-$j)s@0j+xhl^=g*(0@__pno+bipucfx81)2g&6lu1^a+%wis&=")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get('DEBUG', True)
+# 환경 변수는 문자열이므로 DEBUG=0도 참이 되지 않도록 '1'과 비교 (DEBUG이면 요청마다 쿼리를 메모리에 쌓음)
+DEBUG = os.environ.get('DEBUG', '1') == '1'
 
 if os.environ.get('DJANGO_ALLOWED_HOSTS'):
     ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS').split(' ')
@@ -52,9 +53,14 @@ INSTALLED_APPS = [
     "blog",
     "single_pages",
     "news",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    # 요청별 Prometheus 메트릭 기록 (다른 미들웨어의 처리 시간까지 재도록 맨 앞에 위치)
+    'do_it_django_prj.metrics.MetricsMiddleware',
+    # 요청별 쿼리 수/DB 시간 측정 (다른 미들웨어의 쿼리까지 세도록 메트릭 미들웨어 바로 뒤에 위치)
+    'do_it_django_prj.query_stats.QueryStatsMiddleware',
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -63,6 +69,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     'allauth.account.middleware.AccountMiddleware',
+    # 비로그인 GET 요청의 페이지 캐시 (request.user를 확인하므로 인증 미들웨어 뒤에 위치)
+    'do_it_django_prj.page_cache.PageCacheMiddleware',
 ]
 
 ## account 
@@ -95,19 +103,32 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
-ROOT_URLCONF = "do_it_django_prj.urls"
+# ASYNC_VIEWS=1이면 읽기 경로에 비동기 뷰를 연결한 URL 설정을 사용 (ASGI로 실행하면 asgi.py에서 기본값으로 켬)
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+ROOT_URLCONF = "do_it_django_prj.async_urls" if ASYNC_VIEWS else "do_it_django_prj.urls"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # 컴파일한 템플릿을 프로세스에 저장하는 캐시 로더를 명시 (gunicorn 워밍업에서 미리 채움, do_it_django_prj/warmup.py)
+            # DEBUG(runserver)에서도 템플릿 파일이 바뀌면 autoreload가 캐시를 비우므로 그대로 사용
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "blog.context_processors.categories",
             ],
         },
     },
@@ -131,6 +152,43 @@ DATABASES = {
 }
 
 
+# Cache
+# 여러 gunicorn 워커와 작업 워커가 같은 캐시를 공유하도록 운영 환경에서는 Redis(docker-compose의 redis 서비스)를 사용
+# Redis는 만료 시간이 있는 키(페이지, 조각 캐시)만 지우도록(volatile-lru) 설정해서
+# 만료 시간 없이 저장하는 페이지 캐시 태그의 무효화 시각은 메모리가 부족해도 지워지지 않음
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get('CACHE_BACKEND', "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get('CACHE_LOCATION', "do-it-django"),
+    }
+}
+# 로컬 메모리/파일 캐시는 항목이 MAX_ENTRIES개를 넘으면 임의로 1/3을 지우므로 (기본값 300)
+# 페이지, 태그 무효화 시각, 게시물 카드 조각이 모두 들어가도록 크게 잡음 (Redis는 maxmemory로 제한)
+if not CACHES["default"]["BACKEND"].endswith('RedisCache'):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.environ.get('CACHE_MAX_ENTRIES', 50000)),
+    }
+
+# 백그라운드 작업(jobs 앱)을 워커 없이 바로 실행할지 여부
+# 개발/테스트에서는 바로 실행하고, 운영(docker-compose의 worker 서비스)에서는 JOBS_EAGER=0으로 큐에 넣음
+JOBS_EAGER = os.environ.get('JOBS_EAGER', '1') == '1'
+
+# 비로그인 사용자용 페이지 캐시 유지 시간(초), 데이터가 바뀌면 시그널에서 해당 페이지만 바로 무효화
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 60 * 10))
+
+# 요청별 쿼리 측정(do_it_django_prj/query_stats.py) 기준
+# 같은 모양의 쿼리가 이 횟수 이상 반복되면 N+1 쿼리로 보고 경고 로그를 남김
+QUERY_STATS_REPEAT_THRESHOLD = int(os.environ.get('QUERY_STATS_REPEAT_THRESHOLD', 5))
+# DB 시간(ms)이나 쿼리 수가 이 값을 넘는 요청은 느린 요청으로 경고 로그를 남김
+QUERY_STATS_SLOW_MS = int(os.environ.get('QUERY_STATS_SLOW_MS', 500))
+QUERY_STATS_MAX_QUERIES = int(os.environ.get('QUERY_STATS_MAX_QUERIES', 50))
+
+# /metrics(Prometheus)에 접근할 수 있는 IP 또는 네트워크 목록 (공백으로 구분)
+# 운영(docker-compose)에서는 같은 네트워크의 Prometheus가 web:8000/metrics를 직접 수집하고, nginx에서는 막음
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1 ::1').split()
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -171,6 +229,12 @@ STATIC_ROOT = os.path.join(BASE_DIR, '_static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, '_media')
 
+# 첨부 파일 다운로드(blog/downloads.py)를 nginx에 넘길지 여부
+# 운영(nginx)에서는 DOWNLOAD_ACCEL_REDIRECT=1로 X-Accel-Redirect를 사용하고, 개발에서는 Django가 직접 보냄
+DOWNLOAD_ACCEL_REDIRECT = os.environ.get('DOWNLOAD_ACCEL_REDIRECT', '0') == '1'
+# MEDIA_ROOT를 가리키는 nginx의 internal location (nginx/nginx.conf)
+DOWNLOAD_ACCEL_PREFIX = '/protected-media/'
+
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
 # Default primary key field type
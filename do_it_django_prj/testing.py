@@ -0,0 +1,110 @@
+"""
+테스트용 도우미
+
+- QueryCountTestMixin.assertQueryCountConstant: 데이터(행)를 늘려도 뷰의 쿼리 수가 그대로인지 확인
+  (쿼리 수가 행 수에 따라 늘어나면 N+1 쿼리이므로 실패하고, 반복된 쿼리 모양을 메시지에 보여줌)
+- QueryPlanTestMixin.assertNoFullScan: 함수가 실행한 쿼리를 모두 EXPLAIN해서 테이블 전체 스캔(과 정렬)이 없는지 확인
+  SQLite와 PostgreSQL을 지원 (PostgreSQL은 작은 테스트 데이터에서도 인덱스를 쓸 수 있는지 보도록 순차 스캔을 끔)
+"""
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from .query_stats import QueryStats
+
+# DB별 EXPLAIN 결과에서 테이블 전체 스캔과 정렬을 찾는 정규식
+FULL_SCAN_RES = {
+    # SQLite: 'SCAN blog_post' (인덱스를 쓰면 'SCAN blog_post USING INDEX ...' 또는 'SEARCH ...')
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)$', re.MULTILINE),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+SORT_RES = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR ORDER BY'),
+    'postgresql': re.compile(r'(?:^|->)\s*(?:Incremental )?Sort\b', re.MULTILINE),
+}
+
+
+# TestCase와 함께 상속해서 사용
+# 예: class TestView(QueryCountTestMixin, TestCase)
+class QueryCountTestMixin:
+    def measure_queries(self, url):
+        """
+        캐시를 비운 상태에서 url을 요청하고 쿼리 측정 결과(QueryStats)를 반환
+        """
+        # 페이지/사이드바 캐시에 맞으면 쿼리가 실행되지 않으므로 매번 캐시를 비움
+        cache.clear()
+        stats = QueryStats()
+        with stats.capture():
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return stats
+
+    def assertQueryCountConstant(self, urls, grow, steps=2):
+        """
+        urls의 쿼리 수를 재고, grow()로 데이터를 늘리는 것을 steps번 반복하면서 쿼리 수가 그대로인지 확인
+        (목록이 비어 있으면 prefetch 쿼리가 생략되므로 grow() 전에도 행이 하나 이상 있어야 함)
+        urls는 url 목록 또는 url 목록을 반환하는 함수 (grow()로 만든 게시물의 url을 확인할 때)
+        """
+        get_urls = urls if callable(urls) else lambda: urls
+        # 첫 요청에만 실행되는 쿼리(Site 캐시 등 프로세스 단위 캐시)를 빼기 위해 한 번씩 먼저 요청
+        for url in get_urls():
+            self.measure_queries(url)
+        baseline = {url: self.measure_queries(url) for url in get_urls()}
+
+        for step in range(steps):
+            grow()
+            for url in get_urls():
+                stats = self.measure_queries(url)
+                if url not in baseline:
+                    baseline[url] = stats
+                    continue
+                expected = baseline[url]
+                if stats.count != expected.count:
+                    repeated = '\n'.join(
+                        f'  {count}회: {shape}' for shape, count in stats.repeated(threshold=2)
+                    )
+                    self.fail(
+                        f'{url}: 데이터를 늘린 뒤({step + 1}회) 쿼리 수가 {expected.count}개에서 '
+                        f'{stats.count}개로 바뀌었습니다.\n반복된 쿼리:\n{repeated}'
+                    )
+
+
+# TestCase와 함께 상속해서 사용
+# 예: self.assertNoFullScan(lambda: list(Post.objects.filter(category=None)[:5]))
+class QueryPlanTestMixin:
+    def explain_queries(self, run):
+        """
+        run()이 실행한 쿼리마다 (SQL, EXPLAIN 결과 문자열) 목록을 반환
+        """
+        if connection.vendor not in FULL_SCAN_RES:
+            self.skipTest(f'{connection.vendor}의 실행 계획은 확인하지 않습니다.')
+
+        with CaptureQueriesContext(connection) as captured:
+            run()
+
+        plans = []
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # 행이 적으면 인덱스가 있어도 순차 스캔을 고르므로, 인덱스로 실행할 수 있는지만 봄 (테스트 트랜잭션 안에서만)
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            for query in captured.captured_queries:
+                if not query['sql'].lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {query['sql']}")
+                plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+                plans.append((query['sql'], plan))
+        return plans
+
+    def assertNoFullScan(self, run, ordered=False):
+        """
+        run()이 실행한 SELECT 쿼리가 모두 인덱스를 사용하는지 확인
+        ordered=True이면 ORDER BY를 인덱스 순서로 처리하는지(별도 정렬이 없는지)도 확인
+        """
+        plans = self.explain_queries(run)
+        for sql, plan in plans:
+            tables = FULL_SCAN_RES[connection.vendor].findall(plan)
+            if tables:
+                self.fail(f'테이블 전체 스캔({", ".join(tables)}):\n{sql}\n{plan}')
+            if ordered and SORT_RES[connection.vendor].search(plan):
+                self.fail(f'인덱스 대신 정렬을 사용:\n{sql}\n{plan}')
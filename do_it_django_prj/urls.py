@@ -19,16 +19,27 @@ from django.conf.urls.static import static
 
 from django.contrib import admin
 from django.urls import path, include
+from .metrics import metrics_view
 
 
-urlpatterns = [
-    path("news/", include("news.urls")),
-    path("blog/", include("blog.urls")),
-    path("admin/", admin.site.urls),
-    path("markdownx/", include("markdownx.urls")),
-    path("accounts/", include("allauth.urls")),
-    path("", include("single_pages.urls")),
-]
+def build_urlpatterns(app_urls):
+    """
+    URL 패턴 목록 (blog, news, single_pages는 각 앱의 app_urls 모듈을 include)
+    WSGI에서는 'urls'(동기 뷰), ASGI에서는 'async_urls'(읽기 경로만 비동기 뷰, do_it_django_prj/async_urls.py)
+    """
+    urlpatterns = [
+        path("news/", include(f"news.{app_urls}")),
+        path("blog/", include(f"blog.{app_urls}")),
+        path("admin/", admin.site.urls),
+        path("markdownx/", include("markdownx.urls")),
+        path("accounts/", include("allauth.urls")),
+        path("metrics", metrics_view, name="metrics"),  # Prometheus 수집용 (내부 요청만)
+        path("", include(f"single_pages.{app_urls}")),
+    ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+    return urlpatterns
+
+
+urlpatterns = build_urlpatterns("urls")
@@ -0,0 +1,111 @@
+"""
+gunicorn 워커가 첫 요청을 받기 전에 미리 해 두는 준비 작업 (gunicorn.conf.py에서 호출)
+
+- 모든 템플릿을 컴파일해서 캐시 로더(cached.Loader)에 저장
+- URL 패턴을 모두 읽어서 뷰 모듈을 import하고 reverse용 사전을 만듦
+- 마크다운 렌더러(확장 기능 import), 번역 카탈로그, Site/ContentType 캐시, 사이드바 캐시를 채움
+- preload_app이면 마스터 프로세스에서 실행되므로 fork된 워커가 이 메모리를 copy-on-write로 공유
+  (DB 연결은 워커끼리 공유하면 안 되므로 끝나면 닫음)
+"""
+import logging
+import os
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+from markdownx.utils import markdown
+
+logger = logging.getLogger(__name__)
+
+
+def template_dirs(engine):
+    """
+    엔진의 로더들이 템플릿을 찾는 디렉터리 목록 (캐시 로더는 감싼 로더들의 디렉터리)
+    """
+    dirs = []
+    for loader in engine.template_loaders:
+        for inner in getattr(loader, 'loaders', [loader]):
+            dirs.extend(str(directory) for directory in inner.get_dirs() if str(directory) not in dirs)
+    return dirs
+
+
+def compile_templates():
+    """
+    템플릿 디렉터리(앱 templates 포함)의 모든 템플릿을 컴파일하고 (컴파일한 수, 실패한 수)를 반환
+    캐시 로더를 쓰면 컴파일 결과가 프로세스에 남아서 요청마다 다시 읽지 않음
+    """
+    compiled = failed = 0
+    for engine in engines.all():
+        for template_dir in template_dirs(engine.engine):
+            for root, _, files in os.walk(template_dir):
+                for filename in files:
+                    name = os.path.relpath(os.path.join(root, filename), template_dir).replace(os.sep, '/')
+                    try:
+                        engine.get_template(name)
+                    except (TemplateSyntaxError, UnicodeDecodeError):
+                        # 설치하지 않은 앱의 태그를 쓰는 템플릿(allauth의 mfa 등)이나 템플릿이 아닌 파일
+                        failed += 1
+                    else:
+                        compiled += 1
+    return compiled, failed
+
+
+def load_url_patterns(resolver=None):
+    """
+    URL 패턴을 모두 읽어서(뷰 모듈 import) 패턴 수를 반환하고, reverse용 사전을 미리 만듦
+    """
+    resolver = resolver or get_resolver()
+    count = 0
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            count += load_url_patterns(pattern)
+        else:
+            count += 1
+    resolver.reverse_dict
+    resolver.namespace_dict
+    return count
+
+
+def prime_caches():
+    """
+    DB를 조회해서 채우는 프로세스/공유 캐시를 채움 (DB에 연결할 수 없으면 건너뜀)
+    """
+    from blog.context_processors import get_category_sidebar
+
+    try:
+        Site.objects.get_current()
+        ContentType.objects.get_for_models(*apps.get_models())
+        get_category_sidebar()
+    except DatabaseError as e:
+        logger.warning('DB에 연결할 수 없어 캐시를 채우지 않았습니다: %s', e)
+    finally:
+        # fork된 워커가 마스터의 DB 연결/캐시 연결을 물려받지 않도록 닫음
+        connections.close_all()
+        cache.close()
+
+
+def warm_up():
+    """
+    첫 요청 전에 할 준비 작업을 모두 실행하고 (템플릿 수, 실패한 템플릿 수, URL 패턴 수, 소요 시간)을 반환
+    """
+    started = time.perf_counter()
+    translation.activate(settings.LANGUAGE_CODE)
+    compiled, failed = compile_templates()
+    url_count = load_url_patterns()
+    markdown('# warm up\n\n`code`')
+    prime_caches()
+    translation.deactivate()
+
+    return {
+        'templates': compiled,
+        'template_errors': failed,
+        'url_patterns': url_count,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,95 @@
+"""
+gunicorn 설정 (gunicorn은 실행한 디렉터리의 gunicorn.conf.py를 자동으로 읽음)
+
+- 워커 여러 개의 Prometheus 메트릭을 합치기 위해 PROMETHEUS_MULTIPROC_DIR를 지정 (do_it_django_prj/metrics.py)
+  워커는 이 값을 물려받아 메트릭을 디렉터리의 파일에 기록
+- 지정하지 않으면 gunicorn마다 임시 디렉터리를 만들어 사용하고 종료할 때 삭제
+- GUNICORN_SERVER=asgi이면 uvicorn 워커로 asgi.py를 실행 (읽기 경로에 비동기 뷰 사용, 느린 클라이언트가 워커를 묶지 않음)
+  명령줄에 앱을 지정하면(예: gunicorn do_it_django_prj.wsgi:application) 명령줄의 앱을 사용
+- 운영 설정: 워커 수는 CPU 수로 정하고(GUNICORN_WORKERS로 변경), 앱을 마스터에서 미리 읽은 뒤(preload_app) fork
+  fork 전에 템플릿 컴파일, URL 패턴, 마크다운, 캐시를 준비(do_it_django_prj/warmup.py)하고 gc.freeze()로
+  그 객체들을 GC 대상에서 빼서, 워커들이 메모리를 copy-on-write로 공유하고 첫 요청부터 빠르게 응답
+- GUNICORN_PRELOAD=0이면 워커마다 앱을 읽고 워밍업 (코드를 바꾼 뒤 HUP으로 워커만 다시 띄울 때)
+  GUNICORN_WARMUP=0이면 워밍업하지 않음
+"""
+import gc
+import os
+import shutil
+import tempfile
+
+if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='do-it-django-metrics-')
+    remove_metrics_dir = True
+else:
+    remove_metrics_dir = False
+
+# child_exit(SIGCHLD 처리 중)에서 import하면 워커 여러 개가 한꺼번에 종료될 때 import가 중첩되므로 미리 import
+# (PROMETHEUS_MULTIPROC_DIR를 정한 뒤에 import해야 multiprocess 모드로 동작)
+from prometheus_client import multiprocess  # noqa: E402
+
+if os.environ.get('GUNICORN_SERVER', 'wsgi') == 'asgi':
+    wsgi_app = 'do_it_django_prj.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'do_it_django_prj.wsgi:application'
+
+
+def cpu_count():
+    # 컨테이너/프로세스에 허용된 CPU 수
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# 동기 워커는 DB/IO를 기다리는 동안 CPU를 쓰지 않으므로 CPU 수의 2배 + 1, uvicorn 워커는 CPU 수만큼
+if 'GUNICORN_WORKERS' in os.environ:
+    workers = int(os.environ['GUNICORN_WORKERS'])
+elif os.environ.get('GUNICORN_SERVER', 'wsgi') == 'asgi':
+    workers = cpu_count()
+else:
+    workers = cpu_count() * 2 + 1
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+warm_up_app = os.environ.get('GUNICORN_WARMUP', '1') == '1'
+
+
+def warm_up(log):
+    from do_it_django_prj.warmup import warm_up
+    stats = warm_up()
+    log.info(
+        '워밍업 완료 (pid %s): 템플릿 %s개 (실패 %s개), URL 패턴 %s개, %s초',
+        os.getpid(), stats['templates'], stats['template_errors'], stats['url_patterns'], stats['seconds'],
+    )
+
+
+def on_starting(server):
+    # 이전 실행에서 남은 메트릭 파일을 지우고 시작 (카운터가 예전 값에서 이어지지 않도록)
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # preload_app이면 워커를 fork하기 전에 마스터에서 한 번만 워밍업
+    if warm_up_app and server.cfg.preload_app:
+        warm_up(server.log)
+        # 지금까지 만든 객체를 GC가 훑지 않게 해서, 워커의 GC가 공유 메모리 페이지를 건드려 복사하지 않도록 함
+        gc.collect()
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # preload_app이 아니면 워커마다 앱을 읽은 뒤 첫 요청 전에 워밍업
+    if warm_up_app and not worker.cfg.preload_app:
+        warm_up(worker.log)
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 livesum 게이지(처리 중인 요청 수, 워커 수) 파일을 정리
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if remove_metrics_dir:
+        shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
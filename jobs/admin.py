@@ -0,0 +1,42 @@
+from django.contrib import admin, messages
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import Job
+from .queue import queue_depth
+
+
+# Job 모델에 대한 관리자 설정
+# 목록 상단에 상태별 작업 수(큐 깊이)를 표시 (templates/admin/jobs/job/change_list.html)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key')
+    ordering = ('-pk',)
+    readonly_fields = ('locked_by', 'locked_at', 'created_at', 'finished_at', 'last_error')
+    actions = ['retry_jobs']
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context['queue_depth'] = queue_depth()
+        return super().changelist_view(request, extra_context=extra_context)
+
+    @admin.action(description='선택한 작업을 지금 다시 실행')
+    def retry_jobs(self, request, queryset):
+        try:
+            with transaction.atomic():
+                count = queryset.exclude(status=Job.RUNNING).update(
+                    status=Job.PENDING,
+                    run_at=timezone.now(),
+                    attempts=0,
+                    locked_by='',
+                    locked_at=None,
+                    finished_at=None,
+                )
+        except IntegrityError:
+            self.message_user(request, '같은 key로 대기 중인 작업이 있어 다시 실행할 수 없습니다.', messages.ERROR)
+            return
+        self.message_user(request, f'{count}개 작업을 다시 대기 상태로 바꿨습니다.')
+
+
+# Job 모델을 관리자에 등록
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from jobs.queue import claim_jobs, delete_finished_jobs, execute_job, finish_job, requeue_stale_jobs
+from jobs.worker import init_worker, run_job
+
+
+# --processes 0일 때 프로세스 풀 대신 사용하는 실행기 (디버깅, 테스트용)
+class InlineExecutor:
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+# Job 큐의 작업을 프로세스 풀에서 실행하는 워커
+# 예: python manage.py run_jobs
+#     python manage.py run_jobs --processes 4 --once
+class Command(BaseCommand):
+    help = '백그라운드 작업(Job)을 실행하는 워커를 시작합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='작업을 실행할 프로세스 수, 0이면 워커 프로세스 안에서 바로 실행 (기본값: CPU 수)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='한 번에 가져올 작업 수 (기본값: 프로세스 수 x 2)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='실행할 작업이 없을 때 다시 확인할 때까지 기다릴 시간(초) (기본값: 1)',
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=7,
+            help='완료된 작업을 보관할 일수 (기본값: 7)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='지금 실행할 수 있는 작업을 모두 실행한 뒤 종료합니다.',
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        batch_size = options['batch_size'] or max(processes, 1) * 2
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+
+        def stop(signum, frame):
+            self.stdout.write('종료 신호를 받았습니다. 실행 중인 작업을 마친 뒤 종료합니다.')
+            self.stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f'워커 {worker_id} 시작 (프로세스 {processes}개)')
+        done = failed = 0
+        last_cleanup = 0
+
+        pool = self.make_pool(processes)
+        # 프로세스 풀에서는 DB 연결을 정리한 뒤 실행하는 run_job, 바로 실행할 때는 execute_job 사용
+        job_func = run_job if processes else execute_job
+        try:
+            while not self.stopping:
+                # 한 시간에 한 번 오래된 완료 작업 정리
+                if time.monotonic() - last_cleanup > 60 * 60:
+                    delete_finished_jobs(options['keep_days'])
+                    last_cleanup = time.monotonic()
+
+                requeue_stale_jobs()
+                jobs = claim_jobs(worker_id, batch_size)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                futures = {pool.submit(job_func, job.name, job.kwargs): job for job in jobs}
+                broken = False
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        error = future.result()
+                    except BrokenProcessPool:
+                        # 작업 프로세스가 비정상 종료되면(메모리 부족 등) 풀을 다시 만듦
+                        error = traceback.format_exc()
+                        broken = True
+                    except Exception:
+                        error = traceback.format_exc()
+                    finish_job(job, error)
+                    if error is None:
+                        done += 1
+                    else:
+                        failed += 1
+
+                if broken:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self.make_pool(processes)
+        finally:
+            pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f'워커 종료 (완료 {done}개, 실패 {failed}개)'))
+
+    def make_pool(self, processes):
+        if not processes:
+            return InlineExecutor()
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=init_worker)
@@ -0,0 +1,57 @@
+from django.db import models
+from django.db.models import Q
+
+
+# Job 모델: 요청 밖(run_jobs 워커)에서 실행할 백그라운드 작업
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, '대기'),
+        (RUNNING, '실행 중'),
+        (DONE, '완료'),
+        (FAILED, '실패'),
+    ]
+
+    # 실행할 작업 이름 (@task로 등록한 이름, 예: 'blog.index_post')
+    name = models.CharField(max_length=100)
+    # 작업 함수에 전달할 키워드 인자
+    kwargs = models.JSONField(default=dict, blank=True)
+    # 중복 방지 키 (같은 키로 대기 중인 작업이 있으면 새로 추가하지 않음)
+    key = models.CharField(max_length=200, blank=True)
+
+    # 작업 상태
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    # 실행 예정 시각 (재시도할 때는 백오프만큼 뒤로 미뤄짐)
+    run_at = models.DateTimeField()
+    # 실행 횟수와 최대 실행 횟수
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    # 작업을 가져간 워커와 가져간 시각 (워커가 죽으면 일정 시간 뒤 다시 대기 상태로 돌림)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # 마지막 실패 내용
+    last_error = models.TextField(blank=True)
+
+    # 생성일시, 완료(또는 최종 실패)일시
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 워커가 실행할 작업을 찾는 쿼리 (status='pending' AND run_at <= now ORDER BY run_at)
+            models.Index(fields=['status', 'run_at'], name='jobs_job_status_run_at_idx'),
+        ]
+        constraints = [
+            # 같은 키의 작업은 대기 중인 것이 하나만 있도록 보장 (동시에 추가해도 중복되지 않음)
+            models.UniqueConstraint(
+                fields=['key'],
+                condition=Q(status='pending') & ~Q(key=''),
+                name='jobs_job_pending_key_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f'[{self.pk}] {self.name} ({self.status})'
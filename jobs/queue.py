@@ -0,0 +1,199 @@
+"""
+DB 기반 백그라운드 작업 큐
+
+- 각 앱의 tasks.py에서 @task('이름')으로 작업 함수를 등록하고, enqueue('이름', **kwargs)로 작업을 추가
+- 추가된 작업은 Job 테이블에 저장되고 run_jobs 명령(워커)이 프로세스 풀에서 실행 (별도 브로커 불필요)
+- key를 주면 같은 key로 대기 중인 작업이 있을 때 새로 추가하지 않음 (예: 게시물을 여러 번 저장해도 색인은 한 번)
+- 실패한 작업은 RETRY_BASE_DELAY * 2^(시도 횟수-1)초 뒤에 다시 실행하고, max_attempts번 실패하면 failed로 남김
+- 작업마다 timeout(초)을 두고, 그 시간 안에 끝나지 않은 running 작업은 워커가 죽은 것으로 보고 다시 대기 상태로 돌림
+- JOBS_EAGER = True이면 (개발, 테스트) 큐에 넣지 않고 enqueue를 호출한 자리에서 바로 실행
+"""
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# 등록된 작업 함수 (이름 -> 함수)
+TASKS = {}
+
+# 재시도 대기 시간(초): 10초, 20초, 40초, ... 최대 1시간
+RETRY_BASE_DELAY = 10
+RETRY_MAX_DELAY = 60 * 60
+
+# timeout을 지정하지 않은 작업의 제한 시간(초)
+DEFAULT_TIMEOUT = getattr(settings, 'JOBS_DEFAULT_TIMEOUT', 60 * 10)
+
+
+def task(name, max_attempts=5, timeout=None):
+    """
+    작업 함수를 이름으로 등록하는 데코레이터
+    작업 함수는 JSON으로 저장할 수 있는 키워드 인자만 받아야 함
+    timeout(초)은 작업이 정상적으로 걸릴 수 있는 가장 긴 시간보다 넉넉하게 잡음
+    (running 상태로 이 시간이 지나면 다른 워커가 다시 실행하므로, 너무 짧으면 같은 작업이 동시에 실행됨)
+    """
+    def decorator(func):
+        TASKS[name] = func
+        func.task_name = name
+        func.max_attempts = max_attempts
+        func.timeout = timeout or DEFAULT_TIMEOUT
+        return func
+    return decorator
+
+
+def task_timeout(name):
+    """
+    작업의 제한 시간(초) (더 이상 등록되지 않은 작업은 DEFAULT_TIMEOUT)
+    """
+    func = TASKS.get(name)
+    return func.timeout if func is not None else DEFAULT_TIMEOUT
+
+
+def enqueue(name, key='', delay=0, **kwargs):
+    """
+    작업을 큐에 추가하고 Job을 반환 (JOBS_EAGER이면 바로 실행하고 None을 반환)
+    트랜잭션 안에서 호출하면 커밋될 때 함께 저장되므로, 워커는 커밋된 데이터만 보고 작업을 실행함
+    """
+    func = TASKS[name]
+
+    if getattr(settings, 'JOBS_EAGER', False):
+        func(**kwargs)
+        return None
+
+    fields = {
+        'name': name,
+        'kwargs': kwargs,
+        'key': key,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'max_attempts': func.max_attempts,
+    }
+    if not key:
+        return Job.objects.create(**fields)
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(**fields)
+    except IntegrityError:
+        # 같은 key로 대기 중인 작업이 있으면 그 작업이 최신 데이터로 실행되므로 새로 추가하지 않음
+        existing = Job.objects.filter(key=key, status=Job.PENDING).first()
+        if existing is not None:
+            return existing
+        # 그 사이 워커가 가져갔다면 다시 추가
+        return Job.objects.create(**fields)
+
+
+def retry_delay(attempts):
+    """
+    attempts번 실패한 작업을 다시 실행하기까지 기다릴 시간(초)
+    """
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def claim_jobs(worker_id, limit):
+    """
+    실행할 때가 된 작업을 최대 limit개 가져와 running 상태로 바꾼 뒤 반환
+    여러 워커가 동시에 실행해도 같은 작업을 두 번 가져가지 않음
+    (PostgreSQL은 SKIP LOCKED, 그 외 DB는 status 조건을 건 UPDATE로 보장)
+    """
+    now = timezone.now()
+    token = f'{worker_id}:{uuid.uuid4().hex[:8]}'
+
+    with transaction.atomic():
+        pending = Job.objects.filter(status=Job.PENDING, run_at__lte=now).order_by('run_at', 'pk')
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        job_ids = list(pending.values_list('pk', flat=True)[:limit])
+
+        Job.objects.filter(pk__in=job_ids, status=Job.PENDING).update(
+            status=Job.RUNNING,
+            locked_by=token,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+
+    return list(Job.objects.filter(locked_by=token, status=Job.RUNNING).order_by('run_at', 'pk'))
+
+
+def execute_job(name, kwargs):
+    """
+    작업 함수를 실행하고 실패하면 traceback 문자열을, 성공하면 None을 반환 (워커 프로세스에서 실행)
+    """
+    try:
+        TASKS[name](**kwargs)
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def finish_job(job, error=None):
+    """
+    실행 결과를 기록 (성공: done, 실패: 재시도 대기 또는 failed)
+    """
+    now = timezone.now()
+    jobs = Job.objects.filter(pk=job.pk)
+
+    if error is None:
+        jobs.update(status=Job.DONE, finished_at=now, last_error='')
+        return
+
+    logger.warning('작업 실패 %s (%d/%d회)\n%s', job, job.attempts, job.max_attempts, error)
+    if job.attempts >= job.max_attempts:
+        jobs.update(status=Job.FAILED, finished_at=now, last_error=error)
+        return
+
+    try:
+        with transaction.atomic():
+            jobs.update(
+                status=Job.PENDING,
+                run_at=now + timedelta(seconds=retry_delay(job.attempts)),
+                locked_by='',
+                locked_at=None,
+                last_error=error,
+            )
+    except IntegrityError:
+        # 같은 key의 작업이 새로 대기 중이면 그 작업이 대신 실행되므로 이 작업은 끝냄
+        jobs.update(status=Job.FAILED, finished_at=now, last_error=f'같은 key의 대기 중인 작업으로 대체됨\n{error}')
+
+
+def requeue_stale_jobs():
+    """
+    워커가 죽어서 running 상태로 남은 작업(가져간 뒤 작업의 timeout이 지난 작업)을 다시 대기 상태로 돌리고 그 수를 반환
+    """
+    now = timezone.now()
+    # 가장 짧은 timeout이 지난 작업만 불러온 뒤 작업마다 자기 timeout과 비교 (running 작업은 워커 수만큼만 있음)
+    shortest = min([DEFAULT_TIMEOUT] + [func.timeout for func in TASKS.values()])
+    running = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=shortest))
+    stale_jobs = [job for job in running if job.locked_at < now - timedelta(seconds=task_timeout(job.name))]
+    for job in stale_jobs:
+        timeout = task_timeout(job.name)
+        finish_job(job, f'워커가 {timeout}초 안에 작업을 끝내지 않았습니다. ({job.locked_by})')
+    return len(stale_jobs)
+
+
+def delete_finished_jobs(days):
+    """
+    완료된 지 days일이 지난 작업을 삭제 (실패한 작업은 확인할 수 있도록 남김)
+    """
+    finished_before = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=finished_before).delete()
+    return deleted
+
+
+def queue_depth():
+    """
+    상태별 작업 수와 실행할 때가 지난 대기 작업 중 가장 오래된 것의 대기 시간(초)을 반환
+    """
+    counts = dict(Job.objects.values_list('status').annotate(count=Count('pk')).order_by())
+    oldest = Job.objects.filter(status=Job.PENDING, run_at__lte=timezone.now()).aggregate(oldest=Min('run_at'))['oldest']
+
+    depth = {status: counts.get(status, 0) for status, _ in Job.STATUS_CHOICES}
+    depth['oldest_pending_seconds'] = int((timezone.now() - oldest).total_seconds()) if oldest else 0
+    return depth
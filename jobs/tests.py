@@ -0,0 +1,157 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import DEFAULT_TIMEOUT, claim_jobs, enqueue, finish_job, queue_depth, requeue_stale_jobs, retry_delay, task
+
+# 테스트용 작업이 실행된 기록
+calls = []
+
+
+@task('jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task('jobs.tests.fail', max_attempts=2)
+def fail():
+    raise ValueError('실패')
+
+
+@task('jobs.tests.slow', timeout=DEFAULT_TIMEOUT * 6)
+def slow(value):
+    calls.append(value)
+
+
+# 테스트 케이스 클래스 정의
+@override_settings(JOBS_EAGER=False)
+class TestJobQueue(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_key(self):
+        """
+        같은 key로 대기 중인 작업이 있으면 새로 추가하지 않고, 실행 중이면 새로 추가하는지 테스트합니다.
+        """
+        job = enqueue('jobs.tests.record', key='record:1', value=1)
+        self.assertEqual(enqueue('jobs.tests.record', key='record:1', value=1), job)
+        self.assertEqual(Job.objects.count(), 1)
+
+        # 워커가 가져간 뒤에는 최신 데이터로 다시 실행해야 하므로 새 작업을 추가
+        self.assertEqual(claim_jobs('test', 10), [job])
+        self.assertNotEqual(enqueue('jobs.tests.record', key='record:1', value=1), job)
+        self.assertEqual(Job.objects.filter(status=Job.PENDING).count(), 1)
+
+        # key가 없으면 매번 추가
+        enqueue('jobs.tests.record', value=2)
+        enqueue('jobs.tests.record', value=2)
+        self.assertEqual(Job.objects.filter(key='').count(), 2)
+
+    def test_claim_jobs(self):
+        """
+        실행할 때가 된 작업만 순서대로 가져가고, 한 번 가져간 작업은 다시 가져가지 않는지 테스트합니다.
+        """
+        first = enqueue('jobs.tests.record', value=1)
+        second = enqueue('jobs.tests.record', value=2)
+        enqueue('jobs.tests.record', delay=60, value=3)
+
+        self.assertEqual(claim_jobs('a', 1), [first])
+        self.assertEqual(claim_jobs('b', 10), [second])
+        self.assertEqual(claim_jobs('c', 10), [])
+
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.RUNNING)
+        self.assertEqual(second.attempts, 1)
+        self.assertTrue(second.locked_by.startswith('b:'))
+
+    def test_retry_backoff(self):
+        """
+        실패한 작업이 백오프 후 다시 실행되고, 최대 횟수를 넘으면 failed로 남는지 테스트합니다.
+        """
+        self.assertEqual([retry_delay(n) for n in (1, 2, 3)], [10, 20, 40])
+        self.assertEqual(retry_delay(20), 60 * 60)
+
+        job = enqueue('jobs.tests.fail')
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            call_command('run_jobs', processes=0, once=True, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertIn('ValueError', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+
+        # 백오프 시간이 지나면 다시 실행되고, 두 번째 실패에서 끝남
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            call_command('run_jobs', processes=0, once=True, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(queue_depth()['failed'], 1)
+
+    def test_run_jobs(self):
+        """
+        워커가 대기 중인 작업을 실행하고 완료로 기록하는지 테스트합니다.
+        """
+        for value in range(3):
+            enqueue('jobs.tests.record', value=value)
+        self.assertEqual(queue_depth()['pending'], 3)
+
+        call_command('run_jobs', processes=0, once=True, stdout=StringIO())
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 3)
+        self.assertEqual(queue_depth()['pending'], 0)
+
+    def test_stale_job(self):
+        """
+        워커가 죽어서 실행 중으로 남은 작업이 다시 실행되는지 테스트합니다.
+        """
+        job = enqueue('jobs.tests.record', value=1)
+        claim_jobs('dead-worker', 10)
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1), run_at=timezone.now())
+
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            call_command('run_jobs', processes=0, once=True, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        finish_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+
+    def test_task_timeout(self):
+        """
+        실행 중으로 남은 작업을 전역 기준이 아니라 작업마다 지정한 timeout이 지난 뒤에 다시 대기 상태로 돌리는지 테스트합니다.
+        """
+        quick = enqueue('jobs.tests.record', value=1)
+        slow_job = enqueue('jobs.tests.slow', value=2)
+        claim_jobs('busy-worker', 10)
+        locked_at = timezone.now() - timedelta(seconds=DEFAULT_TIMEOUT * 2)
+        Job.objects.update(locked_at=locked_at)
+
+        # 기본 제한 시간이 지난 작업만 다시 대기 상태가 되고, 긴 작업은 계속 실행 중으로 둠
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            self.assertEqual(requeue_stale_jobs(), 1)
+        quick.refresh_from_db()
+        slow_job.refresh_from_db()
+        self.assertEqual(quick.status, Job.PENDING)
+        self.assertEqual(slow_job.status, Job.RUNNING)
+
+        # 긴 작업도 자기 timeout이 지나면 다시 대기 상태로 돌림
+        Job.objects.filter(pk=slow_job.pk).update(locked_at=timezone.now() - timedelta(seconds=DEFAULT_TIMEOUT * 7))
+        with self.assertLogs('jobs.queue', 'WARNING') as logs:
+            self.assertEqual(requeue_stale_jobs(), 1)
+        self.assertIn(f'{DEFAULT_TIMEOUT * 6}초', logs.output[0])
+        slow_job.refresh_from_db()
+        self.assertEqual(slow_job.status, Job.PENDING)
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager(self):
+        """
+        JOBS_EAGER이면 큐에 넣지 않고 바로 실행하는지 테스트합니다.
+        """
+        self.assertIsNone(enqueue('jobs.tests.record', value=1))
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.count(), 0)
@@ -0,0 +1,32 @@
+"""
+run_jobs 프로세스 풀의 각 프로세스에서 실행되는 함수
+
+프로세스 풀은 spawn 방식으로 새 파이썬 프로세스를 만들고 이 모듈의 함수를 불러오므로,
+이 모듈은 Django가 초기화되기 전에 import해도 되도록 모델을 모듈 최상단에서 불러오지 않음
+(spawn 방식이라 부모 프로세스의 DB 연결을 물려받지 않고, 각 프로세스가 필요할 때 자기 연결을 엶)
+"""
+import os
+import signal
+
+
+def init_worker():
+    """
+    프로세스가 시작될 때 한 번 Django를 초기화
+    """
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'do_it_django_prj.settings')
+    django.setup()
+    # Ctrl+C/종료 신호는 부모(run_jobs)가 받아서 실행 중인 작업을 마친 뒤 종료하도록 함
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_job(name, kwargs):
+    """
+    작업 하나를 실행하고 실패하면 traceback 문자열을, 성공하면 None을 반환
+    """
+    from django.db import close_old_connections
+    from .queue import execute_job
+
+    close_old_connections()
+    return execute_job(name, kwargs)
@@ -6,5 +6,7 @@ admin.site.register(NewsPost)
 
 class CategoryAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name', )}
+    # 피드 주소가 있는 언론사는 ingest_feeds 명령으로 기사를 가져옴
+    list_display = ('name', 'slug', 'feed_url')
 
 admin.site.register(Press, CategoryAdmin)
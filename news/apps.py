@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "news"
+
+    def ready(self):
+        # 페이지 캐시 무효화 시그널 핸들러 등록
+        from . import signals  # noqa: F401
@@ -0,0 +1,88 @@
+"""
+읽기 경로(목록, 상세, 언론사별 목록)의 비동기 뷰
+
+- ASGI(uvicorn 워커)로 배포할 때 views.py의 동기 뷰 대신 사용 (news/async_urls.py)
+- DB 조회는 비동기 ORM으로 하고, 템플릿 렌더링은 스레드에서 실행 (blog/async_views.py와 같은 방식)
+"""
+from django.shortcuts import aget_object_or_404
+from blog.async_views import arender
+from blog.pagination import alegacy_page_redirect, apaginate_by_cursor
+from do_it_django_prj.conditional import conditional_page
+from do_it_django_prj.page_cache import add_cache_tags
+from .models import NewsPost, Press
+from .views import (
+    PostList, category_page_validators, get_press_list, post_detail_validators, post_list_validators,
+)
+
+
+async def sidebar_context():
+    """
+    사이드바에 보여줄 언론사 목록(언론사별 뉴스 수 포함)과 미분류 뉴스 수
+    """
+    return {
+        "categories": [press async for press in get_press_list()],
+        "no_category_post_count": await NewsPost.objects.filter(category=None).acount(),
+    }
+
+
+# 언론사별 뉴스 목록 (views.category_page와 같은 페이지)
+@conditional_page(category_page_validators)
+async def category_page(request, slug):
+    if slug == 'no_category':
+        category = '미분류'
+        post_list = NewsPost.objects.filter(category=None)
+    else:
+        category = await Press.objects.aget(slug=slug)
+        post_list = NewsPost.objects.filter(category=category)
+    # 목록에 보여줄 작성자와 언론사를 함께 불러옴
+    post_list = post_list.select_related('author', 'category')
+
+    add_cache_tags(request, 'news.post-list', 'news.sidebar')
+
+    return await arender(
+        request,
+        "news/post_list.html",
+        {
+            "post_list": [post async for post in post_list],
+            "category": category,
+            **await sidebar_context(),
+        }
+    )
+
+
+# 뉴스 목록 (views.PostList와 같은 페이지)
+@conditional_page(post_list_validators)
+async def post_list(request):
+    response = await alegacy_page_redirect(request, PostList.queryset, PostList.paginate_by)
+    if response is not None:
+        return response
+    page = await apaginate_by_cursor(request, PostList.queryset, PostList.paginate_by)
+    add_cache_tags(request, 'news.post-list', 'news.sidebar')
+
+    return await arender(
+        request,
+        "news/post_list.html",
+        {
+            "post_list": page.object_list,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            **await sidebar_context(),
+        }
+    )
+
+
+# 뉴스 상세 (views.PostDetail과 같은 페이지)
+@conditional_page(post_detail_validators)
+async def post_detail(request, pk):
+    post = await aget_object_or_404(NewsPost, pk=pk)
+    add_cache_tags(request, f'news.post:{post.pk}', 'news.sidebar')
+
+    return await arender(
+        request,
+        "news/post_detail.html",
+        {
+            "object": post,
+            "post": post,
+            **await sidebar_context(),
+        }
+    )
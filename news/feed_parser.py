@@ -0,0 +1,145 @@
+"""
+RSS 2.0 / RSS 1.0(RDF) / Atom 피드 파싱 (news/feeds.py의 작업 프로세스에서 실행)
+
+- Django를 import하지 않으므로 spawn으로 띄운 작업 프로세스에서 설정 없이 바로 import할 수 있음
+- 항목마다 링크(절대 URL), 제목, 요약, 본문(태그를 뗀 일반 텍스트), 발행 시각(ISO 8601), 내용 해시를 반환
+- 내용 해시는 제목과 본문을 정규화한 값의 SHA-256으로, URL이 달라도 같은 기사(다른 경로로 배포된 기사)를 찾는 데 사용
+"""
+import hashlib
+import html
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+from xml.etree import ElementTree
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+RDF = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+DC_DATE = '{http://purl.org/dc/elements/1.1/}date'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+
+TAG_RE = re.compile(r'<[^>]*>')
+SPACE_RE = re.compile(r'\s+')
+
+
+# 피드 형식을 알 수 없거나 XML이 아닐 때 발생
+class FeedParseError(ValueError):
+    pass
+
+
+def clean_text(value):
+    """
+    HTML 태그를 떼고 엔티티를 풀어 공백을 하나로 합친 일반 텍스트
+    """
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', value or ''))).strip()
+
+
+def content_hash(title, content):
+    """
+    제목과 본문으로 만든 내용 해시 (대소문자, 공백 차이는 무시)
+    """
+    normalized = f'{clean_text(title).lower()}\n{clean_text(content).lower()}'
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def parse_date(value):
+    """
+    RFC 822(RSS) 또는 ISO 8601(Atom, dc:date) 시각을 UTC ISO 8601 문자열로 (알 수 없으면 '')
+    """
+    value = (value or '').strip()
+    if not value:
+        return ''
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return ''
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _text(element, path):
+    found = element.find(path)
+    return (found.text or '') if found is not None else ''
+
+
+def _absolute_url(base_url, link):
+    # 상대 링크를 base_url 기준의 절대 URL로 (잘못된 URL이면 '': 그 항목은 내용 해시로만 중복 확인)
+    link = (link or '').strip()
+    if not link:
+        return ''
+    try:
+        return urljoin(base_url, link)
+    except ValueError:
+        return ''
+
+
+def _entry(url, title, summary, content, published):
+    content = clean_text(content or summary)
+    title = clean_text(title)
+    return {
+        'url': url,
+        'title': title,
+        'summary': clean_text(summary),
+        'content': content,
+        'published': parse_date(published),
+        'hash': content_hash(title, content),
+    }
+
+
+def _rss_items(channel, base_url, item_tag, ns=''):
+    for item in channel.iter(item_tag):
+        link = _text(item, f'{ns}link')
+        if not link:
+            guid = item.find('guid')
+            if guid is not None and guid.get('isPermaLink', 'true') != 'false':
+                link = guid.text or ''
+        yield _entry(
+            _absolute_url(base_url, link),
+            _text(item, f'{ns}title'),
+            _text(item, f'{ns}description'),
+            _text(item, CONTENT_ENCODED),
+            _text(item, 'pubDate') or _text(item, DC_DATE),
+        )
+
+
+def _atom_entries(feed, base_url):
+    for entry in feed.iter(f'{ATOM}entry'):
+        link = ''
+        for candidate in entry.findall(f'{ATOM}link'):
+            if candidate.get('rel', 'alternate') == 'alternate':
+                link = candidate.get('href', '')
+                break
+        yield _entry(
+            _absolute_url(base_url, link),
+            _text(entry, f'{ATOM}title'),
+            _text(entry, f'{ATOM}summary'),
+            _text(entry, f'{ATOM}content'),
+            _text(entry, f'{ATOM}published') or _text(entry, f'{ATOM}updated'),
+        )
+
+
+def parse_feed(body, base_url=''):
+    """
+    피드 본문(bytes)에서 항목 목록을 반환 (링크도 본문도 없는 항목은 건너뜀)
+    상대 링크는 base_url(피드 URL) 기준의 절대 URL로 바꾸고, 잘못된 링크(예: 'http://[::1/x')는 비움
+    """
+    try:
+        root = ElementTree.fromstring(body)
+    except ElementTree.ParseError as e:
+        raise FeedParseError(f'XML을 읽을 수 없습니다: {e}') from e
+
+    if root.tag == f'{ATOM}feed':
+        entries = _atom_entries(root, base_url)
+    elif root.tag == 'rss':
+        entries = _rss_items(root, base_url, 'item')
+    elif root.tag == f'{RDF}RDF':
+        entries = _rss_items(root, base_url, f'{RSS1}item', RSS1)
+    else:
+        raise FeedParseError(f'알 수 없는 피드 형식입니다: {root.tag}')
+
+    return [entry for entry in entries if entry['url'] or entry['content']]
@@ -0,0 +1,205 @@
+"""
+언론사(Press) 피드에서 뉴스 가져오기 (ingest_feeds 명령)
+
+- feed_url이 있는 언론사의 피드를 asyncio + httpx.AsyncClient로 동시에 받음
+  (연결 풀을 공유하므로 같은 호스트의 피드는 keep-alive 연결을 재사용)
+- 지난번에 받은 ETag/Last-Modified를 보내서 바뀌지 않은 피드는 304로 본문 없이 받음
+- XML 파싱은 CPU 작업이므로 이벤트 루프를 막지 않도록 받는 대로 프로세스 풀에서 실행 (news/feed_parser.py)
+- 원문 주소와 내용 해시로 이미 있는 기사, 이번에 여러 피드에서 겹친 기사를 걸러내고 batch_size개씩 bulk_create로 넣음
+- bulk_create는 save()와 시그널을 거치지 않으므로 뉴스 목록/사이드바 페이지 캐시는 직접 무효화
+"""
+import asyncio
+import multiprocessing
+import time
+from collections import namedtuple
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+
+import httpx
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import Truncator
+from blog.corpus import keep_timestamps
+from do_it_django_prj.page_cache import invalidate_cache_tags
+from .feed_parser import FeedParseError, parse_feed
+from .models import NewsPost, Press
+
+# 동시에 받을 피드 수 (연결 풀 크기)
+FEED_CONCURRENCY = 20
+# 피드 하나를 받을 때 기다릴 시간(초)
+FEED_TIMEOUT = 10
+# 한 번의 중복 확인 쿼리와 bulk_create에 넣을 기사 수
+BATCH_SIZE = 500
+USER_AGENT = 'do-it-django-news-ingest/1.0'
+
+# 피드 하나를 받은 결과 (status: fetched, not_modified, failed)
+FeedResult = namedtuple('FeedResult', ['press_id', 'status', 'entries', 'etag', 'last_modified', 'error'])
+
+
+async def fetch_feed(client, pool, press_id, url, etag='', last_modified=''):
+    """
+    피드 하나를 받아 파싱한 FeedResult를 반환 (네트워크/HTTP/파싱/프로세스 풀 오류는 failed로 반환하고 예외를 올리지 않음)
+    pool이 None이면 이벤트 루프에서 바로 파싱
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = await client.get(url, headers=headers)
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        return FeedResult(press_id, 'failed', [], etag, last_modified, f'{type(e).__name__}: {e}')
+    if response.status_code == 304:
+        return FeedResult(press_id, 'not_modified', [], etag, last_modified, '')
+    if response.status_code != 200:
+        return FeedResult(press_id, 'failed', [], etag, last_modified, f'HTTP {response.status_code}')
+
+    try:
+        if pool is None:
+            entries = parse_feed(response.content, str(response.url))
+        else:
+            entries = await asyncio.get_running_loop().run_in_executor(pool, parse_feed, response.content, str(response.url))
+    except FeedParseError as e:
+        return FeedResult(press_id, 'failed', [], etag, last_modified, str(e))
+    except (ValueError, BrokenExecutor) as e:
+        # 파서가 미처 처리하지 못한 잘못된 값, 작업 프로세스가 죽어서 깨진 프로세스 풀
+        return FeedResult(press_id, 'failed', [], etag, last_modified, f'{type(e).__name__}: {e}')
+
+    return FeedResult(
+        press_id, 'fetched', entries,
+        response.headers.get('ETag', ''), response.headers.get('Last-Modified', ''), '',
+    )
+
+
+async def fetch_feeds(feeds, concurrency=FEED_CONCURRENCY, timeout=FEED_TIMEOUT, pool=None):
+    """
+    [(press_id, url, etag, last_modified), ...]를 동시에 받아 같은 순서의 FeedResult 목록을 반환
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        limits=limits, timeout=timeout, follow_redirects=True, headers={'User-Agent': USER_AGENT},
+    ) as client:
+        return await asyncio.gather(*(fetch_feed(client, pool, *feed) for feed in feeds))
+
+
+def make_pool(workers):
+    """
+    파싱용 프로세스 풀 (workers가 0이면 None: 이벤트 루프에서 바로 파싱)
+    run_jobs와 같이 spawn으로 띄움 (feed_parser는 Django 설정 없이 import됨)
+    """
+    if not workers:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def build_news_post(entry, press_id, now):
+    # NewsPost 필드 길이에 맞춰 자름 (원문 주소가 너무 길면 저장하지 않고 내용 해시로만 중복 확인)
+    url = entry['url'] if len(entry['url']) <= NewsPost._meta.get_field('source_url').max_length else ''
+    created_at = parse_datetime(entry['published']) if entry['published'] else None
+    if created_at is not None and not settings.USE_TZ:
+        # USE_TZ = False이면 DB에 TIME_ZONE 기준 시각으로 저장
+        created_at = timezone.make_naive(created_at)
+    return NewsPost(
+        title=Truncator(entry['title'] or entry['content']).chars(30),
+        hook_text=Truncator(entry['summary']).chars(100) if entry['summary'] != entry['content'] else '',
+        content=entry['content'],
+        category_id=press_id,
+        source_url=url,
+        content_hash=entry['hash'],
+        created_at=min(created_at, now) if created_at else now,
+        updated_at=now,
+    )
+
+
+def store_entries(results, batch_size=BATCH_SIZE):
+    """
+    FeedResult들의 기사 중 새 기사만 batch_size개씩 넣고 (넣은 수, 중복으로 건너뛴 수)를 반환
+    배치마다 원문 주소/내용 해시가 이미 있는지 한 번의 쿼리로 확인 (두 값 모두 유니크 인덱스가 있음)
+    """
+    entries = [(result.press_id, entry) for result in results for entry in result.entries]
+    seen_urls, seen_hashes = set(), set()
+    inserted = duplicates = 0
+    now = timezone.now()
+
+    for start in range(0, len(entries), batch_size):
+        batch = entries[start:start + batch_size]
+        urls = {entry['url'] for _, entry in batch if entry['url']}
+        hashes = {entry['hash'] for _, entry in batch}
+        for url, hash_ in NewsPost.objects.filter(
+            Q(source_url__in=urls) | Q(content_hash__in=hashes)
+        ).values_list('source_url', 'content_hash'):
+            seen_urls.add(url)
+            seen_hashes.add(hash_)
+
+        posts = []
+        for press_id, entry in batch:
+            if (entry['url'] and entry['url'] in seen_urls) or entry['hash'] in seen_hashes:
+                duplicates += 1
+                continue
+            seen_urls.add(entry['url'])
+            seen_hashes.add(entry['hash'])
+            posts.append(build_news_post(entry, press_id, now))
+
+        # 동시에 실행된 다른 가져오기가 먼저 넣은 기사는 유니크 제약에 걸려 건너뜀
+        # (ignore_conflicts이면 넣은 행을 알 수 없으므로, 이번 실행의 updated_at으로 실제로 넣은 기사만 다시 셈)
+        if not posts:
+            continue
+        with keep_timestamps(NewsPost):
+            NewsPost.objects.bulk_create(posts, ignore_conflicts=True)
+        written = NewsPost.objects.filter(content_hash__in=[post.content_hash for post in posts], updated_at=now).count()
+        inserted += written
+        duplicates += len(posts) - written
+
+    return inserted, duplicates
+
+
+def ingest_feeds(presses=None, concurrency=FEED_CONCURRENCY, workers=0, timeout=FEED_TIMEOUT, batch_size=BATCH_SIZE):
+    """
+    언론사들(기본값: 전체)의 피드를 받아 새 기사를 넣고 통계 dict를 반환
+    (피드 수, 받은 수, 바뀌지 않은 수, 실패 수, 기사 수, 넣은 수, 중복 수, 실패 목록, 받기/저장 소요 시간)
+    """
+    presses = list((Press.objects.all() if presses is None else presses).exclude(feed_url='').order_by('pk'))
+    started = time.perf_counter()
+
+    pool = make_pool(workers)
+    try:
+        results = asyncio.run(fetch_feeds(
+            [(press.pk, press.feed_url, press.feed_etag, press.feed_last_modified) for press in presses],
+            concurrency=concurrency, timeout=timeout, pool=pool,
+        ))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    fetched_at = time.perf_counter()
+
+    inserted, duplicates = store_entries(results, batch_size)
+
+    # 다음에 바뀌지 않은 피드를 304로 받을 수 있도록 ETag/Last-Modified 저장
+    by_pk = {press.pk: press for press in presses}
+    changed = []
+    for result in results:
+        press = by_pk[result.press_id]
+        if result.status == 'fetched' and (press.feed_etag, press.feed_last_modified) != (result.etag, result.last_modified):
+            press.feed_etag, press.feed_last_modified = result.etag[:200], result.last_modified[:100]
+            changed.append(press)
+    Press.objects.bulk_update(changed, ['feed_etag', 'feed_last_modified'])
+
+    if inserted:
+        invalidate_cache_tags('news.post-list', 'news.sidebar')
+
+    statuses = [result.status for result in results]
+    return {
+        'feeds': len(results),
+        'fetched': statuses.count('fetched'),
+        'not_modified': statuses.count('not_modified'),
+        'failed': statuses.count('failed'),
+        'entries': sum(len(result.entries) for result in results),
+        'inserted': inserted,
+        'duplicates': duplicates,
+        'errors': [(by_pk[result.press_id], result.error) for result in results if result.status == 'failed'],
+        'fetch_seconds': fetched_at - started,
+        'store_seconds': time.perf_counter() - fetched_at,
+    }
@@ -0,0 +1,76 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from news.feeds import BATCH_SIZE, FEED_CONCURRENCY, FEED_TIMEOUT, ingest_feeds
+from news.models import Press
+
+
+# 언론사(Press) 피드에서 새 기사를 가져오는 명령 (cron 등으로 주기적으로 실행)
+# 예: python manage.py ingest_feeds
+#     python manage.py ingest_feeds --press chosun --press hani --concurrency 50
+class Command(BaseCommand):
+    help = 'feed_url이 있는 언론사의 RSS/Atom 피드를 동시에 받아 새 기사를 뉴스로 넣습니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--press',
+            action='append',
+            default=[],
+            help='가져올 언론사 slug (여러 번 지정 가능, 기본값: 피드 주소가 있는 모든 언론사)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=FEED_CONCURRENCY,
+            help=f'동시에 받을 피드 수 (기본값: {FEED_CONCURRENCY})',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max((os.cpu_count() or 1) - 1, 0),
+            help='피드를 파싱할 프로세스 수, 0이면 받는 프로세스 안에서 바로 파싱 (기본값: CPU 수 - 1)',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=FEED_TIMEOUT,
+            help=f'피드 하나를 받을 때 기다릴 시간(초) (기본값: {FEED_TIMEOUT})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'한 번에 중복을 확인하고 넣을 기사 수 (기본값: {BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        presses = Press.objects.all()
+        if options['press']:
+            presses = presses.filter(slug__in=options['press'])
+            missing = set(options['press']) - set(presses.values_list('slug', flat=True))
+            if missing:
+                raise CommandError(f'없는 언론사입니다: {", ".join(sorted(missing))}')
+
+        stats = ingest_feeds(
+            presses,
+            concurrency=options['concurrency'],
+            workers=options['workers'],
+            timeout=options['timeout'],
+            batch_size=options['batch_size'],
+        )
+
+        for press, error in stats['errors']:
+            self.stderr.write(f'{press.slug} ({press.feed_url}): {error}')
+        seconds = stats['fetch_seconds'] + stats['store_seconds']
+        self.stdout.write(
+            f"피드 {stats['feeds']}개 (받음 {stats['fetched']}, 바뀌지 않음 {stats['not_modified']}, 실패 {stats['failed']}) · "
+            f"기사 {stats['entries']}개 중 새 기사 {stats['inserted']}개, 중복 {stats['duplicates']}개"
+        )
+        self.stdout.write(
+            f"받기 {stats['fetch_seconds']:.2f}초 ({stats['feeds'] / max(stats['fetch_seconds'], 0.001):,.0f}피드/초) · "
+            f"저장 {stats['store_seconds']:.2f}초 · 전체 {seconds:.2f}초 ({stats['entries'] / max(seconds, 0.001):,.0f}기사/초)"
+        )
+        if stats['failed']:
+            self.stdout.write(self.style.WARNING(f"{stats['failed']}개 피드를 가져오지 못했습니다."))
+        else:
+            self.stdout.write(self.style.SUCCESS('완료했습니다.'))
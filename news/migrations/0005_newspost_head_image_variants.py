@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0004_rename_category_press_alter_press_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspost",
+            name="head_image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
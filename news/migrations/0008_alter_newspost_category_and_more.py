@@ -0,0 +1,45 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0007_alter_newspost_file_upload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="newspost",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="news.press",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspost",
+            index=models.Index(
+                fields=["category", "-id"], name="news_post_category_pk_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspost",
+            index=models.Index(
+                condition=models.Q(("category__isnull", True)),
+                fields=["-id"],
+                name="news_post_uncategorized_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="newspost",
+            index=models.Index(fields=["created_at"], name="news_post_created_at_idx"),
+        ),
+    ]
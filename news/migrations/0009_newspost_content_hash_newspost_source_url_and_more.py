@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0008_alter_newspost_category_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspost",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="newspost",
+            name="source_url",
+            field=models.URLField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="press",
+            name="feed_etag",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="press",
+            name="feed_last_modified",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="press",
+            name="feed_url",
+            field=models.URLField(blank=True, max_length=500),
+        ),
+        migrations.AddConstraint(
+            model_name="newspost",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("source_url", ""), _negated=True),
+                fields=("source_url",),
+                name="news_post_source_url_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="newspost",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("content_hash", ""), _negated=True),
+                fields=("content_hash",),
+                name="news_post_content_hash_uniq",
+            ),
+        ),
+    ]
@@ -3,10 +3,18 @@ from django.contrib.auth.models import User
 
 import os
 
+from blog.images import HeadImageVariantsMixin
+from blog.storage import upload_storage
+
 
 class Press(models.Model):
     name = models.CharField(max_length=20, unique=True)
     slug = models.SlugField(max_length=100, unique=True, allow_unicode=True)
+    # 기사를 가져올 RSS/Atom 피드 주소 (비어 있으면 가져오지 않음, news/feeds.py)
+    feed_url = models.URLField(max_length=500, blank=True)
+    # 피드를 마지막으로 받았을 때의 ETag, Last-Modified (다음 요청에 보내서 바뀌지 않았으면 304로 본문 없이 받음)
+    feed_etag = models.CharField(max_length=200, blank=True, editable=False)
+    feed_last_modified = models.CharField(max_length=100, blank=True, editable=False)
 
     def __str__(self):
         return self.name
@@ -19,26 +27,65 @@ class Press(models.Model):
 
 
 # Create your models here.
-class NewsPost(models.Model):
+class NewsPost(HeadImageVariantsMixin, models.Model):
     title = models.CharField(max_length=30)
     hook_text = models.CharField(max_length=100, blank=True)
     content = models.TextField()
 
     head_image = models.ImageField(upload_to='news/images/%Y/%m/%d/', blank=True)
-    file_upload = models.FileField(upload_to='news/files/%Y/%m/%d/', blank=True)
+    # head_image에서 만든 너비별 WebP/JPEG 파생 이미지 목록 (blog/images.py)
+    head_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    file_upload = models.FileField(upload_to='news/files/%Y/%m/%d/', storage=upload_storage, max_length=255, blank=True)
+    # 첨부 파일 다운로드 수 (blog/downloads.py에서 F()로 증가)
+    download_count = models.PositiveIntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     author = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
-    category = models.ForeignKey(Press, blank=True, null=True, on_delete=models.SET_NULL)
+    # 외래키 인덱스 대신 (category, -id) 복합 인덱스를 사용 (Meta.indexes)
+    category = models.ForeignKey(Press, blank=True, null=True, on_delete=models.SET_NULL, db_index=False)
+
+    # 피드에서 가져온 기사의 원문 주소와 내용 해시 (같은 기사를 두 번 넣지 않도록 중복 확인에 사용, news/feeds.py)
+    source_url = models.URLField(max_length=500, blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            # 관리자 화면에서 직접 쓴 뉴스(빈 값)는 제외하고 원문 주소/내용 해시가 겹치지 않게 함
+            # 가져오기는 bulk_create(ignore_conflicts=True)로 동시에 실행된 가져오기와 겹친 기사도 건너뜀
+            models.UniqueConstraint(fields=['source_url'], condition=~models.Q(source_url=''), name='news_post_source_url_uniq'),
+            models.UniqueConstraint(fields=['content_hash'], condition=~models.Q(content_hash=''), name='news_post_content_hash_uniq'),
+        ]
+        # blog.Post와 같은 조회에 맞춘 인덱스 (언론사 페이지, 미분류 페이지/개수, 작성일 기간 조회)
+        indexes = [
+            models.Index(fields=['category', '-id'], name='news_post_category_pk_idx'),
+            models.Index(fields=['-id'], condition=models.Q(category__isnull=True), name='news_post_uncategorized_idx'),
+            models.Index(fields=['created_at'], name='news_post_created_at_idx'),
+        ]
 
     def __str__(self):
         return f'[{self.pk}] {self.title} :: {self.author}'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        DB에서 읽어온 category를 보관해 두고, 저장할 때 바뀌었는지 비교하는 데 사용
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_category_id = dict(zip(field_names, values)).get('category_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_category_id = self.category_id
     
     def get_absolute_url(self):
         return f'/news/{self.pk}'
 
+    def get_download_url(self):
+        return f'/news/{self.pk}/download'
+
     def get_file_name(self):
         return os.path.basename(self.file_upload.name)
 
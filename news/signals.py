@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from blog.tasks import schedule_head_image_variants
+from do_it_django_prj.page_cache import invalidate_cache_tags
+from .models import NewsPost, Press
+
+
+def invalidate_pages(*tags):
+    """
+    태그에 의존하는 캐시된 페이지를 무효화 (커밋 후에도 한 번 더)
+    """
+    invalidate_cache_tags(*tags)
+    transaction.on_commit(lambda: invalidate_cache_tags(*tags))
+
+
+# 뉴스가 저장/삭제되면 그 뉴스의 상세 페이지와 목록 페이지 캐시를 무효화
+# 모든 뉴스 페이지의 사이드바에 미분류 뉴스 수가 표시되므로, 그 수가 바뀔 수 있을 때만 사이드바도 무효화
+@receiver(post_save, sender=NewsPost)
+def invalidate_saved_news_post_pages(sender, instance, created, **kwargs):
+    invalidate_pages(f'news.post:{instance.pk}', 'news.post-list')
+    if created or getattr(instance, '_loaded_category_id', None) != instance.category_id:
+        invalidate_pages('news.sidebar')
+
+
+# head_image가 바뀌었으면 파생 이미지를 백그라운드 작업으로 생성
+@receiver(post_save, sender=NewsPost)
+def schedule_news_post_jobs(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_head_image_variants(instance)
+
+
+@receiver(post_delete, sender=NewsPost)
+def invalidate_deleted_news_post_pages(sender, instance, **kwargs):
+    invalidate_pages(f'news.post:{instance.pk}', 'news.post-list', 'news.sidebar')
+
+
+# 언론사(Press) 목록은 모든 뉴스 페이지의 사이드바에 표시됨
+@receiver(post_save, sender=Press)
+@receiver(post_delete, sender=Press)
+def invalidate_press_pages(sender, **kwargs):
+    invalidate_pages('news.sidebar')
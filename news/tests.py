@@ -1,6 +1,14 @@
 from django.test import TestCase, Client
+from django.core.management import call_command
 from bs4 import BeautifulSoup
-from .models import NewsPost
+from . import feeds
+from .feeds import ingest_feeds
+from .models import NewsPost, Press
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+import threading
 # Create your tests here.
 
 
@@ -77,3 +85,174 @@ from .models import NewsPost
 #         post_area = main_area.select_one('div#post-area')
 #         self.assertIn(post_001.title, post_area.text)
 #         self.assertIn(post_001.content, post_area.text)
+
+
+# 테스트용 피드 서버의 요청 처리기
+# server.feeds({경로: 본문 템플릿})의 '{items}'를 server.rss_items로 채워서 응답하고, ETag가 같으면 304로 응답
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1]))
+        template = self.server.feeds.get(self.path)
+        if template is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = template.replace('{items}', ''.join(self.server.rss_items)).encode()
+        etag = f'"{hash(body)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# 언론사 피드 가져오기(ingest_feeds) 테스트
+class TestFeedIngest(TestCase):
+    def setUp(self):
+        """
+        테스트 프로세스 안에서 피드 서버(FeedHandler)를 띄웁니다.
+        - /rss.xml: RSS 2.0 (rss_items의 기사들)
+        - /atom.xml: Atom (두 번째 항목은 RSS의 첫 번째 기사와 URL만 다르고 내용이 같음)
+        - /broken.xml: XML이 깨진 피드
+        """
+        self.client = Client()
+        self.rss_items = [
+            '<item><title>첫 번째 기사</title><link>/articles/1</link><pubDate>Mon, 05 Oct 2026 09:00:00 +0900</pubDate>'
+            '<description>요약 1</description>'
+            '<content:encoded><![CDATA[<p>첫 번째 <b>본문</b> &amp; 내용</p>]]></content:encoded></item>',
+            '<item><title>두 번째 기사의 제목은 서른 글자보다 길어서 잘려야 합니다</title>'
+            '<guid>http://example.com/articles/2</guid><description>두 번째 본문</description></item>',
+        ]
+        self.feeds = {
+            '/rss.xml': (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>RSS</title>'
+                '{items}</channel></rss>'
+            ),
+            '/atom.xml': (
+                '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>'
+                '<entry><title>아톰 기사</title><link rel="alternate" href="http://example.com/atom/1"/>'
+                '<published>2026-10-06T12:00:00Z</published><content type="html">아톰 본문</content></entry>'
+                '<entry><title>첫 번째  기사</title><link href="http://example.com/atom/copy"/>'
+                '<summary>첫 번째 본문 &amp;amp; 내용</summary></entry></feed>'
+            ),
+            '/broken.xml': '<rss><channel><item>',
+        }
+        self.requests = []
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+        server.feeds, server.rss_items, server.requests = self.feeds, self.rss_items, self.requests
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base = f'http://127.0.0.1:{server.server_port}'
+
+    def test_ingest_feeds(self):
+        """
+        피드에서 새 기사만 언론사 카테고리로 넣고, 원문 주소/내용 해시로 중복을 건너뛰고,
+        바뀌지 않은 피드는 ETag로 304를 받는지 테스트합니다.
+        """
+        base = self.base
+        rss = Press.objects.create(name='RSS 신문', slug='rss', feed_url=f'{base}/rss.xml')
+        atom = Press.objects.create(name='아톰 신문', slug='atom', feed_url=f'{base}/atom.xml')
+        Press.objects.create(name='깨진 피드', slug='broken', feed_url=f'{base}/broken.xml')
+        Press.objects.create(name='없는 피드', slug='missing', feed_url=f'{base}/missing.xml')
+        Press.objects.create(name='피드 없음', slug='none')
+        self.assertEqual(self.client.get('/news/').status_code, 200)
+
+        stats = ingest_feeds(workers=0)
+        self.assertEqual((stats['feeds'], stats['fetched'], stats['failed']), (4, 2, 2))
+        self.assertEqual((stats['entries'], stats['inserted'], stats['duplicates']), (4, 3, 1))
+        self.assertEqual({press.slug for press, _ in stats['errors']}, {'broken', 'missing'})
+
+        first = NewsPost.objects.get(source_url=f'{base}/articles/1')
+        self.assertEqual(first.category, rss)
+        self.assertEqual(first.title, '첫 번째 기사')
+        self.assertEqual(first.content, '첫 번째 본문 & 내용')
+        self.assertEqual(first.hook_text, '요약 1')
+        # 피드의 발행 시각을 작성 시각으로 사용 (TIME_ZONE = Asia/Seoul)
+        self.assertEqual(first.created_at.isoformat(), '2026-10-05T09:00:00')
+        second = NewsPost.objects.get(source_url='http://example.com/articles/2')
+        self.assertEqual(len(second.title), 30)
+        self.assertEqual(NewsPost.objects.get(source_url='http://example.com/atom/1').category, atom)
+        self.assertFalse(NewsPost.objects.filter(source_url='http://example.com/atom/copy').exists())
+        # 기사 목록 페이지 캐시도 무효화됨
+        self.assertIn('아톰 기사', self.client.get('/news/').content.decode())
+
+        # 다시 실행하면 바뀌지 않은 피드는 ETag로 304를 받고, 같은 호스트의 연결을 재사용
+        self.requests.clear()
+        stats = ingest_feeds(workers=0, concurrency=1)
+        self.assertEqual((stats['fetched'], stats['not_modified'], stats['inserted']), (0, 2, 0))
+        self.assertEqual(len({port for _, port in self.requests}), 1)
+
+        # 피드에 새 기사가 생기면 프로세스 풀에서 파싱하고 새 기사만 넣음 (명령으로 실행)
+        self.rss_items.append('<item><title>세 번째 기사</title><link>http://example.com/articles/3</link></item>')
+        out = StringIO()
+        call_command('ingest_feeds', '--press', 'rss', '--workers', '1', stdout=out, stderr=StringIO())
+        self.assertIn('기사 3개 중 새 기사 1개, 중복 2개', out.getvalue())
+        self.assertEqual(NewsPost.objects.get(source_url='http://example.com/articles/3').category, rss)
+        self.assertEqual(NewsPost.objects.filter(category=rss).count(), 3)
+
+    def test_ingest_feeds_malformed_link(self):
+        """
+        잘못된 링크가 있는 항목은 링크 없이(내용 해시로만 중복 확인) 넣고,
+        피드 주소가 잘못된 언론사는 실패로 기록하고 나머지 피드는 그대로 가져오는지 테스트합니다.
+        """
+        self.feeds['/bad-link.xml'] = (
+            '<rss version="2.0"><channel>'
+            '<item><title>링크가 깨진 기사</title><link>http://[::1/x</link><description>깨진 링크 본문</description></item>'
+            '<item><title>멀쩡한 기사</title><link>http://example.com/ok</link><description>멀쩡한 본문</description></item>'
+            '</channel></rss>'
+        )
+        bad_link = Press.objects.create(name='깨진 링크', slug='bad-link', feed_url=f'{self.base}/bad-link.xml')
+        Press.objects.create(name='깨진 주소', slug='bad-url', feed_url='http://[::1/feed.xml')
+
+        stats = ingest_feeds(workers=0)
+        self.assertEqual((stats['feeds'], stats['fetched'], stats['failed']), (2, 1, 1))
+        self.assertEqual([press.slug for press, _ in stats['errors']], ['bad-url'])
+        self.assertEqual((stats['entries'], stats['inserted']), (2, 2))
+        self.assertEqual(NewsPost.objects.get(title='링크가 깨진 기사').source_url, '')
+        self.assertEqual(NewsPost.objects.get(source_url='http://example.com/ok').category, bad_link)
+        # 피드를 받은 언론사는 ETag를 저장함
+        bad_link.refresh_from_db()
+        self.assertTrue(bad_link.feed_etag)
+
+        # 링크가 없는 기사도 내용 해시로 다시 넣지 않음
+        self.feeds['/bad-link.xml'] += ' '
+        stats = ingest_feeds(workers=0)
+        self.assertEqual((stats['inserted'], stats['duplicates']), (0, 2))
+
+    def test_ingest_feeds_concurrent(self):
+        """
+        중복 확인 뒤 다른 가져오기가 같은 기사를 먼저 넣으면 넣은 수가 아니라 중복 수로 세고,
+        실제로 넣은 기사가 없으면 기사 목록 캐시를 무효화하지 않는지 테스트합니다.
+        """
+        self.rss_items[1:] = []
+        Press.objects.create(name='RSS 신문', slug='rss', feed_url=f'{self.base}/rss.xml')
+
+        def build_after_concurrent_ingest(entry, press_id, now):
+            # 다른 가져오기가 같은 기사를 (다른 시각에) 먼저 넣은 것처럼 만듦
+            post = build_news_post(entry, press_id, now)
+            NewsPost.objects.create(title=post.title, content=post.content, category_id=press_id,
+                                    source_url=post.source_url, content_hash=post.content_hash)
+            return post
+
+        build_news_post = feeds.build_news_post
+        with mock.patch.object(feeds, 'build_news_post', build_after_concurrent_ingest), \
+                mock.patch.object(feeds, 'invalidate_cache_tags') as invalidate:
+            stats = ingest_feeds(workers=0)
+        self.assertEqual((stats['entries'], stats['inserted'], stats['duplicates']), (1, 0, 1))
+        self.assertEqual(NewsPost.objects.count(), 1)
+        invalidate.assert_not_called()
@@ -1,9 +1,21 @@
 from django.urls import path, include
 from . import views
 
+# URL 이름 앞에 붙는 네임스페이스 (예: news:post_list), 메트릭의 view 라벨로도 사용
+app_name = "news"
 
-urlpatterns = [
-    path("category/<str:slug>", views.category_page),   # 127.0.0.1/news/category/조선일보
-    path("<int:pk>", views.PostDetail.as_view()),   # 127.0.0.1/news/1
-    path("", views.PostList.as_view())              # 127.0.0.1/news/
-]
+
+def build_urlpatterns(read_views):
+    """
+    URL 패턴 목록 (읽기 경로인 목록/상세/언론사는 read_views 모듈의 뷰를 사용)
+    WSGI에서는 views(동기 뷰), ASGI에서는 async_views(비동기 뷰, news/async_urls.py)
+    """
+    return [
+        path("category/<str:slug>", read_views.category_page, name="category_page"),   # 127.0.0.1/news/category/조선일보
+        path("<int:pk>/download", views.download_file, name="download_file"),          # 127.0.0.1/news/1/download
+        path("<int:pk>", read_views.post_detail, name="post_detail"),                  # 127.0.0.1/news/1
+        path("", read_views.post_list, name="post_list")                               # 127.0.0.1/news/
+    ]
+
+
+urlpatterns = build_urlpatterns(views)
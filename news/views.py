@@ -1,5 +1,11 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
 from django.views.generic import ListView, DetailView
+from blog.pagination import CursorPaginationMixin
+from blog.downloads import serve_download
+from do_it_django_prj.page_cache import add_cache_tags
+from do_it_django_prj.conditional import build_validators, conditional_page
 from .models import NewsPost, Press
 
 # Create your views here.
@@ -27,6 +33,43 @@ from .models import NewsPost, Press
 #     )
 
 
+def news_list_validators(request, post_list):
+    """
+    뉴스 목록 페이지의 ETag/Last-Modified (가장 최근 수정 시각과 뉴스 수를 한 번의 집계 쿼리로 구함)
+    """
+    row = post_list.aggregate(updated_at=Max('updated_at'), post_count=Count('pk'))
+    return build_validators(request, ['news.post-list', 'news.sidebar'], [row['updated_at']], row['post_count'])
+
+
+def category_page_validators(request, slug):
+    if slug == 'no_category':
+        return news_list_validators(request, NewsPost.objects.filter(category=None))
+    return news_list_validators(request, NewsPost.objects.filter(category__slug=slug))
+
+
+def post_list_validators(request):
+    return news_list_validators(request, NewsPost.objects.all())
+
+
+def post_detail_validators(request, pk):
+    """
+    뉴스 상세 페이지의 ETag/Last-Modified (뉴스가 없으면 None)
+    """
+    updated_at = NewsPost.objects.filter(pk=pk).aggregate(updated_at=Max('updated_at'))['updated_at']
+    if updated_at is None:
+        return None
+    return build_validators(request, [f'news.post:{pk}', 'news.sidebar'], [updated_at])
+
+
+def get_press_list():
+    """
+    사이드바에 보여줄 언론사 목록 (언론사별 뉴스 수를 한 번의 쿼리로 함께 구함)
+    """
+    return Press.objects.annotate(post_count=Count('newspost'))
+
+
+# 목록이 바뀌지 않았으면 렌더링하지 않고 304로 응답
+@conditional_page(category_page_validators)
 def category_page(reqeust, slug):
     if slug == 'no_category':
         category = '미분류'
@@ -34,37 +77,62 @@ def category_page(reqeust, slug):
     else:
         category = Press.objects.get(slug=slug)
         post_list = NewsPost.objects.filter(category=category)
+    # 목록에 보여줄 작성자와 언론사를 함께 불러옴
+    post_list = post_list.select_related('author', 'category')
+
+    add_cache_tags(reqeust, 'news.post-list', 'news.sidebar')
 
     return render(
         reqeust,
         "news/post_list.html",
         {
             "post_list": post_list,
-            "categories": Press.objects.all(),
+            "categories": get_press_list(),
             "no_category_post_count": NewsPost.objects.filter(category=None).count(),
             "category": category,
         }
     )
 
 
-class PostList(ListView):
+# 커서(?before=, ?after=) 방식으로 페이지를 나눠 COUNT, OFFSET 쿼리 없이 조회
+@method_decorator(conditional_page(post_list_validators), name='get')
+class PostList(CursorPaginationMixin, ListView):
     model = NewsPost
+    queryset = NewsPost.objects.select_related('author', 'category')  # 작성자와 언론사를 함께 불러옴
+    template_name = "news/post_list.html"
+    context_object_name = "post_list"
     ordering = "-pk"
+    paginate_by = 5
 
     def get_context_data(self, **kwargs):
         context = super(PostList, self).get_context_data()
-        context['categories'] = Press.objects.all()
+        context['categories'] = get_press_list()
         context['no_category_post_count'] = NewsPost.objects.filter(category=None).count()
+        add_cache_tags(self.request, 'news.post-list', 'news.sidebar')
 
         return context
 
 
+@method_decorator(conditional_page(post_detail_validators), name='get')
 class PostDetail(DetailView):
     model = NewsPost
+    template_name = "news/post_detail.html"
+    context_object_name = "post"
 
     def get_context_data(self, **kwargs):
         context = super(PostDetail, self).get_context_data()
-        context['categories'] = Press.objects.all()
+        context['categories'] = get_press_list()
         context['no_category_post_count'] = NewsPost.objects.filter(category=None).count()
+        add_cache_tags(self.request, f'news.post:{self.object.pk}', 'news.sidebar')
 
         return context
+
+
+def download_file(request, pk):
+    post = get_object_or_404(NewsPost.objects.only('pk', 'file_upload'), pk=pk)
+    return serve_download(request, post)
+
+
+# 읽기 경로의 뷰 (news/urls.py에서 async_views의 같은 이름의 비동기 뷰와 바꿔 쓸 수 있도록 같은 이름을 붙임)
+post_list = PostList.as_view()
+post_detail = PostDetail.as_view()
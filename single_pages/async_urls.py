@@ -0,0 +1,6 @@
+# ASGI(uvicorn 워커)로 배포할 때 사용하는 URL 설정 (do_it_django_prj/async_urls.py에서 include)
+# single_pages/urls.py와 같은 패턴이고, 첫 화면만 비동기 뷰(async_views.py)를 사용
+from . import async_views
+from .urls import app_name, build_urlpatterns
+
+urlpatterns = build_urlpatterns(async_views)
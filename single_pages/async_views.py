@@ -0,0 +1,28 @@
+"""
+첫 화면의 비동기 뷰
+
+- ASGI(uvicorn 워커)로 배포할 때 views.landing 대신 사용 (single_pages/async_urls.py)
+- DB 조회는 비동기 ORM으로 하고, 템플릿 렌더링은 스레드에서 실행 (blog/async_views.py와 같은 방식)
+"""
+from asgiref.sync import sync_to_async
+from blog.async_views import arender
+from blog.avatars import prime_avatar_urls
+from blog.models import Post
+from do_it_django_prj.page_cache import add_cache_tags
+
+
+# 최근 3개의 블로그 포스트를 보여주는 첫 화면 (views.landing과 같은 페이지)
+async def landing(request):
+    recent_posts = [post async for post in Post.objects.for_list().order_by('-pk')[:3]]
+    # 작성자들의 아바타 URL을 한 번에 조회
+    await sync_to_async(prime_avatar_urls)(post.author for post in recent_posts)
+    add_cache_tags(request, 'blog.post-list', 'blog.sidebar')
+    add_cache_tags(request, *(f'blog.author:{post.author_id}' for post in recent_posts))
+
+    return await arender(
+        request,
+        "single_pages/landing.html",
+        {
+            'recent_posts': recent_posts
+        }
+    )
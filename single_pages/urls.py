@@ -1,8 +1,19 @@
 from django.urls import path, include
 from . import views
 
+# URL 이름 앞에 붙는 네임스페이스 (예: single_pages:landing), 메트릭의 view 라벨로도 사용
+app_name = "single_pages"
 
-urlpatterns = [
-    path("about_me/", views.about_me),
-    path("", views.landing)
-]
+
+def build_urlpatterns(read_views):
+    """
+    URL 패턴 목록 (첫 화면은 read_views 모듈의 뷰를 사용)
+    WSGI에서는 views(동기 뷰), ASGI에서는 async_views(비동기 뷰, single_pages/async_urls.py)
+    """
+    return [
+        path("about_me/", views.about_me, name="about_me"),
+        path("", read_views.landing, name="landing")
+    ]
+
+
+urlpatterns = build_urlpatterns(views)
@@ -1,11 +1,18 @@
 from django.shortcuts import render
 from blog.models import Post
+from blog.avatars import prime_avatar_urls
+from do_it_django_prj.page_cache import add_cache_tags
 
 # landing 뷰 함수
 # 최근 3개의 블로그 포스트를 가져와 'landing.html' 템플릿에 전달
 def landing(request):
-    # 최근 3개의 포스트를 가져오기
-    recent_posts = Post.objects.order_by('-pk')[:3]
+    # 최근 3개의 포스트를 가져오기 (본문은 불러오지 않음)
+    recent_posts = list(Post.objects.for_list().order_by('-pk')[:3])
+    # 작성자들의 아바타 URL을 한 번에 조회
+    prime_avatar_urls(post.author for post in recent_posts)
+    # 게시물 목록, 카테고리, 작성자의 아바타가 바뀔 때만 페이지 캐시를 무효화
+    add_cache_tags(request, 'blog.post-list', 'blog.sidebar')
+    add_cache_tags(request, *(f'blog.author:{post.author_id}' for post in recent_posts))
 
     # 'landing.html' 템플릿에 recent_posts 데이터를 전달하여 렌더링
     return render(
@@ -19,6 +26,7 @@ def landing(request):
 # about_me 뷰 함수
 # 'about_me.html' 템플릿을 렌더링
 def about_me(request):
+    add_cache_tags(request, 'single_pages.about_me')
     # 'about_me.html' 템플릿을 렌더링
     return render(
         request,